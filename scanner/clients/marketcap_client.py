@@ -13,13 +13,14 @@ import os
 from typing import Dict, List, Optional, Any
 import requests
 from ..utils.logging_utils import get_logger
-from ..utils.io_utils import load_cache, save_cache, cache_exists
+from ..utils.io_utils import load_cache, save_cache
+from ..utils import profiling
 
 # 🔹 Neu: zentralisierte Rohdaten-Speicherung
 try:
-    from scanner.utils.raw_collector import collect_raw_marketcap
+    from scanner.utils.raw_collector import submit_raw_marketcap
 except ImportError:
-    collect_raw_marketcap = None
+    submit_raw_marketcap = None
 
 
 logger = get_logger(__name__)
@@ -35,7 +36,9 @@ class MarketCapClient:
     def __init__(
         self,
         api_key: Optional[str] = None,
-        timeout: int = 30
+        timeout: int = 30,
+        base_url: Optional[str] = None,
+        collect_raw: bool = True
     ):
         """
         Initialize CMC client.
@@ -43,9 +46,13 @@ class MarketCapClient:
         Args:
             api_key: CMC API key (default: from CMC_API_KEY env var)
             timeout: Request timeout in seconds
+            base_url: API root (default: BASE_URL; e.g. a local offline server)
+            collect_raw: Record listings in the raw market-cap history
         """
+        self.base_url = base_url or self.BASE_URL
         self.api_key = api_key or os.getenv("CMC_API_KEY")
         self.timeout = timeout
+        self.collect_raw = collect_raw
         
         if not self.api_key:
             logger.warning("CMC_API_KEY not set - client will fail on API calls")
@@ -74,7 +81,7 @@ class MarketCapClient:
         Raises:
             requests.RequestException: On API failure
         """
-        url = f"{self.BASE_URL}{endpoint}"
+        url = f"{self.base_url}{endpoint}"
         
         try:
             response = self.session.get(
@@ -83,6 +90,9 @@ class MarketCapClient:
                 timeout=self.timeout
             )
             
+            profiling.count('api_calls')
+            profiling.count('bytes_downloaded', len(response.content))
+            
             # Handle rate limit
             if response.status_code == 429:
                 logger.error("CMC rate limit hit - check your plan limits")
@@ -115,7 +125,7 @@ class MarketCapClient:
         Args:
             start: Start rank (1-based)
             limit: Number of results (max 5000)
-            use_cache: Use cached data if available (today)
+            use_cache: Use cached data if available (not expired)
             
         Returns:
             List of cryptocurrency dicts with keys:
@@ -132,15 +142,15 @@ class MarketCapClient:
         """
         cache_key = f"cmc_listings_start{start}_limit{limit}"
         
-        if use_cache and cache_exists(cache_key):
+        cached = load_cache(cache_key) if use_cache else None
+        if cached is not None:
             logger.info("Loading CMC listings from cache")
-            cached = load_cache(cache_key)
             data = cached.get("data", []) if isinstance(cached, dict) else []
 
             # 🔹 Rohdaten-Snapshot auch bei Cache-Hit speichern
-            if collect_raw_marketcap and data:
+            if self.collect_raw and submit_raw_marketcap and data:
                 try:
-                    collect_raw_marketcap(data)
+                    submit_raw_marketcap(data)
                 except Exception as e:
                     logger.warning(f"Could not collect MarketCap snapshot: {e}")
 
@@ -163,12 +173,12 @@ class MarketCapClient:
             logger.info(f"Fetched {len(data)} listings from CMC")
             
             # Cache the full response
-            save_cache(response, cache_key)
+            save_cache(response, cache_key, resource="listings")
 
-            # 🔹 Rohdaten-Snapshot über zentralen Collector speichern
-            if collect_raw_marketcap and data:
+            # 🔹 Rohdaten-Snapshot über zentralen Collector speichern (im Hintergrund)
+            if self.collect_raw and submit_raw_marketcap and data:
                 try:
-                    collect_raw_marketcap(data)
+                    submit_raw_marketcap(data)
                 except Exception as e:
                     logger.warning(f"Could not collect MarketCap snapshot: {e}")
             
@@ -0,0 +1,304 @@
+"""
+Asyncio MEXC API Client for Spot market data.
+
+Async sibling of MEXCClient with the same public surface:
+- get_exchange_info / get_spot_usdt_symbols
+- get_24h_tickers
+- get_klines / get_multiple_klines
+
+Uses one pooled keep-alive aiohttp session, the same weighted token bucket
+as the blocking client, async retries that honour Retry-After (waiting
+outside the in-flight slot), and a semaphore that bounds the number of
+requests in flight. Cache reads and writes run in worker threads so disk
+I/O and JSON parsing stay off the event loop.
+
+Requires the optional `aiohttp` package.
+"""
+
+import asyncio
+from typing import Dict, List, Optional, Any
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from ..utils.logging_utils import get_logger
+from ..utils.io_utils import load_cache, save_cache
+from ..utils.rate_limiter import TokenBucket
+from ..utils import profiling
+from .mexc_client import MEXCClient, retry_after_seconds, select_spot_usdt_symbols
+
+
+logger = get_logger(__name__)
+
+
+class AsyncMEXCClient:
+    """
+    Asyncio MEXC Spot API client with connection pooling, rate limiting and caching.
+
+    Usage:
+        async with AsyncMEXCClient() as mexc:
+            symbols = await mexc.get_spot_usdt_symbols()
+            klines = await mexc.get_multiple_klines(symbols, "1d")
+    """
+
+    BASE_URL = MEXCClient.BASE_URL
+    ENDPOINT_WEIGHTS = MEXCClient.ENDPOINT_WEIGHTS
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        retry_backoff: float = 3.0,
+        timeout: int = 30,
+        rate_limit_per_sec: float = 20.0,
+        rate_limit_burst: Optional[float] = None,
+        max_concurrency: int = 16
+    ):
+        """
+        Initialize async MEXC client.
+
+        Args:
+            max_retries: Maximum retry attempts on failure
+            retry_backoff: Seconds to wait between retries
+            timeout: Request timeout in seconds
+            rate_limit_per_sec: Request weight allowed per second
+            rate_limit_burst: Maximum burst weight (default: heaviest endpoint weight)
+            max_concurrency: Max requests in flight (also the connection pool size)
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncMEXCClient requires 'aiohttp' (pip install aiohttp)")
+
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+
+        burst = rate_limit_burst or max(rate_limit_per_sec, *self.ENDPOINT_WEIGHTS.values())
+        self.rate_limiter = TokenBucket(rate_limit_per_sec, burst)
+
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncMEXCClient":
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        """Create the pooled session lazily (must run inside the event loop)."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency,
+                keepalive_timeout=30
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def close(self) -> None:
+        """Close the pooled session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _rate_limit(self, weight: float = 1.0) -> None:
+        """Wait until the shared limiter grants `weight` tokens."""
+        wait = self.rate_limiter.reserve(weight)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """
+        Make HTTP request with retry logic.
+
+        Args:
+            method: HTTP method (GET, POST)
+            endpoint: API endpoint (e.g., '/api/v3/exchangeInfo')
+            params: Query parameters
+
+        Returns:
+            JSON response
+
+        Raises:
+            aiohttp.ClientError: On persistent failure
+        """
+        session = await self._get_session()
+        url = f"{self.BASE_URL}{endpoint}"
+        weight = self.ENDPOINT_WEIGHTS.get(endpoint, 1)
+
+        for attempt in range(self.max_retries):
+            retry_after = None
+            try:
+                await self._rate_limit(weight)
+
+                async with self._semaphore:
+                    async with session.request(method, url, params=params) as response:
+                        body = await response.read()
+                        profiling.count('api_calls')
+                        profiling.count('bytes_downloaded', len(body))
+
+                        # Handle rate limit (429); wait after releasing the slot and connection
+                        if response.status == 429 and attempt < self.max_retries - 1:
+                            retry_after = retry_after_seconds(response.headers, self.retry_backoff)
+                        else:
+                            # Out of attempts: the 429 itself is raised
+                            response.raise_for_status()
+                            return await response.json(content_type=None)
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Request failed (attempt {attempt + 1}/{self.max_retries}): {e}")
+
+                if attempt < self.max_retries - 1:
+                    await asyncio.sleep(self.retry_backoff * (attempt + 1))
+                else:
+                    logger.error(f"Request failed after {self.max_retries} attempts")
+                    raise
+
+            if retry_after is not None:
+                logger.warning(f"Rate limited. Waiting {retry_after}s...")
+                await asyncio.sleep(retry_after)
+
+        raise aiohttp.ClientError("Unexpected error in retry loop")
+
+    async def get_exchange_info(self, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Get exchange info (symbols, trading rules).
+
+        Args:
+            use_cache: Use cached data if available (not expired)
+
+        Returns:
+            Exchange info dict with 'symbols' list
+        """
+        cache_key = "mexc_exchange_info"
+
+        cached = await asyncio.to_thread(load_cache, cache_key) if use_cache else None
+        if cached is not None:
+            logger.info("Loading exchange info from cache")
+            return cached
+
+        logger.info("Fetching exchange info from MEXC API")
+        data = await self._request("GET", "/api/v3/exchangeInfo")
+
+        await asyncio.to_thread(save_cache, data, cache_key, resource="exchange_info")
+        return data
+
+    async def get_spot_usdt_symbols(self, use_cache: bool = True) -> List[str]:
+        """
+        Get all Spot USDT trading pairs.
+
+        Returns:
+            List of symbols (e.g., ['BTCUSDT', 'ETHUSDT', ...])
+        """
+        exchange_info = await self.get_exchange_info(use_cache=use_cache)
+
+        symbols = select_spot_usdt_symbols(exchange_info)
+
+        logger.info(f"Found {len(symbols)} USDT Spot pairs")
+        return symbols
+
+    async def get_24h_tickers(self, use_cache: bool = True) -> List[Dict[str, Any]]:
+        """
+        Get 24h ticker statistics for all symbols (bulk).
+
+        Returns:
+            List of ticker dicts (same format as MEXCClient.get_24h_tickers)
+        """
+        cache_key = "mexc_24h_tickers"
+
+        cached = await asyncio.to_thread(load_cache, cache_key) if use_cache else None
+        if cached is not None:
+            logger.info("Loading 24h tickers from cache")
+            return cached
+
+        logger.info("Fetching 24h tickers from MEXC API")
+        data = await self._request("GET", "/api/v3/ticker/24hr")
+
+        await asyncio.to_thread(save_cache, data, cache_key, resource="tickers")
+        logger.info(f"Fetched {len(data)} ticker entries")
+        return data
+
+    async def get_klines(
+        self,
+        symbol: str,
+        interval: str = "1d",
+        limit: int = 120,
+        use_cache: bool = True
+    ) -> List[List]:
+        """
+        Get candlestick/kline data for a symbol.
+
+        Args:
+            symbol: Trading pair (e.g., 'BTCUSDT')
+            interval: Timeframe (1m, 5m, 15m, 1h, 4h, 1d, 1w)
+            limit: Number of candles (max 1000)
+            use_cache: Use cached data if available
+
+        Returns:
+            List of klines (same format as MEXCClient.get_klines)
+        """
+        cache_key = f"mexc_klines_{symbol}_{interval}"
+
+        cached = await asyncio.to_thread(load_cache, cache_key) if use_cache else None
+        if cached is not None:
+            logger.debug(f"Loading klines from cache: {symbol} {interval}")
+            return cached
+
+        logger.debug(f"Fetching klines: {symbol} {interval} (limit={limit})")
+
+        params = {
+            "symbol": symbol,
+            "interval": interval,
+            "limit": min(limit, 1000)  # API max is 1000
+        }
+
+        data = await self._request("GET", "/api/v3/klines", params=params)
+
+        await asyncio.to_thread(save_cache, data, cache_key, resource="klines", interval=interval)
+        return data
+
+    async def get_multiple_klines(
+        self,
+        symbols: List[str],
+        interval: str = "1d",
+        limit: int = 120,
+        use_cache: bool = True
+    ) -> Dict[str, List[List]]:
+        """
+        Get klines for multiple symbols concurrently (bounded, rate-limited).
+
+        Args:
+            symbols: List of trading pairs
+            interval: Timeframe
+            limit: Candles per symbol
+            use_cache: Use cached data
+
+        Returns:
+            Dict mapping symbol -> klines (empty list on failure), in input order
+        """
+        total = len(symbols)
+        logger.info(f"Fetching klines for {total} symbols ({interval})")
+
+        async def _fetch(symbol: str) -> List[List]:
+            try:
+                return await self.get_klines(symbol, interval, limit, use_cache)
+            except Exception as e:
+                logger.error(f"Failed to fetch klines for {symbol}: {e}")
+                return []
+
+        fetched = await asyncio.gather(*(_fetch(symbol) for symbol in symbols))
+        results = dict(zip(symbols, fetched))
+
+        logger.info(f"Successfully fetched klines for {len(results)} symbols")
+        return results
@@ -10,15 +10,64 @@ API Docs: https://mexcdevelop.github.io/apidocs/spot_v3_en/
 """
 
 import time
-from typing import Dict, List, Optional, Any
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Any, Mapping
 import requests
+from requests.adapters import HTTPAdapter
 from ..utils.logging_utils import get_logger
-from ..utils.io_utils import load_cache, save_cache, cache_exists
+from ..utils.io_utils import load_cache, save_cache
+from ..utils.rate_limiter import TokenBucket
+from ..utils import profiling
+from ..utils.candle_store import CandleStore, CandleArrays
+from ..utils.time_utils import utc_now, timestamp_to_ms, interval_to_ms
 
 
 logger = get_logger(__name__)
 
 
+def retry_after_seconds(headers: Mapping[str, str], default: float) -> float:
+    """
+    Wait requested by a Retry-After header (delay in seconds or HTTP-date).
+    
+    Returns:
+        Seconds to wait (>= 0); `default` if the header is missing or invalid
+    """
+    value = headers.get('Retry-After')
+    if value is None:
+        return float(default)
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return float(default)
+    if retry_at.tzinfo is None:  # HTTP-dates are GMT
+        return float(default)
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def select_spot_usdt_symbols(exchange_info: Dict[str, Any]) -> List[str]:
+    """
+    Extract tradable Spot USDT pairs from an exchangeInfo payload.
+    
+    Returns:
+        List of symbols (e.g., ['BTCUSDT', 'ETHUSDT', ...])
+    """
+    symbols = []
+    for symbol_info in exchange_info.get("symbols", []):
+        # Filter: USDT quote, Spot, Trading status
+        # Note: MEXC uses status="1" for enabled (not "ENABLED")
+        if (
+            symbol_info.get("quoteAsset") == "USDT" and
+            symbol_info.get("isSpotTradingAllowed", False) and
+            symbol_info.get("status") == "1"
+        ):
+            symbols.append(symbol_info["symbol"])
+    return symbols
+
+
 class MEXCClient:
     """
     MEXC Spot API client with rate-limit handling and caching.
@@ -26,11 +75,23 @@ class MEXCClient:
     
     BASE_URL = "https://api.mexc.com"
     
+    # Request weights as counted by MEXC (unlisted endpoints weigh 1)
+    ENDPOINT_WEIGHTS = {
+        "/api/v3/exchangeInfo": 10,
+        "/api/v3/ticker/24hr": 40,
+        "/api/v3/klines": 1,
+    }
+    
     def __init__(
         self,
         max_retries: int = 3,
         retry_backoff: float = 3.0,
-        timeout: int = 30
+        timeout: int = 30,
+        rate_limit_per_sec: float = 20.0,
+        rate_limit_burst: Optional[float] = None,
+        pool_size: int = 16,
+        candle_store: Optional[CandleStore] = None,
+        base_url: Optional[str] = None
     ):
         """
         Initialize MEXC client.
@@ -39,22 +100,30 @@ class MEXCClient:
             max_retries: Maximum retry attempts on failure
             retry_backoff: Seconds to wait between retries
             timeout: Request timeout in seconds
+            rate_limit_per_sec: Request weight allowed per second (shared by all threads)
+            rate_limit_burst: Maximum burst weight (default: heaviest endpoint weight)
+            pool_size: Max keep-alive connections (should cover concurrent workers)
+            candle_store: Persistent kline history; enables incremental kline fetching
+            base_url: API root (default: BASE_URL; e.g. a local offline server)
         """
+        self.base_url = base_url or self.BASE_URL
         self.max_retries = max_retries
         self.retry_backoff = retry_backoff
         self.timeout = timeout
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         
-        # Rate limiting (conservative)
-        self.last_request_time = 0
-        self.min_request_interval = 0.1  # 100ms between requests
+        # Rate limiting: one token bucket shared by all concurrent callers
+        burst = rate_limit_burst or max(rate_limit_per_sec, *self.ENDPOINT_WEIGHTS.values())
+        self.rate_limiter = TokenBucket(rate_limit_per_sec, burst)
+        
+        self.candle_store = candle_store
     
-    def _rate_limit(self) -> None:
-        """Apply rate limiting between requests."""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_request_interval:
-            time.sleep(self.min_request_interval - elapsed)
-        self.last_request_time = time.time()
+    def _rate_limit(self, weight: float = 1.0) -> None:
+        """Block until the shared limiter grants `weight` tokens."""
+        self.rate_limiter.acquire(weight)
     
     def _request(
         self,
@@ -76,11 +145,12 @@ class MEXCClient:
         Raises:
             requests.RequestException: On persistent failure
         """
-        url = f"{self.BASE_URL}{endpoint}"
+        url = f"{self.base_url}{endpoint}"
+        weight = self.ENDPOINT_WEIGHTS.get(endpoint, 1)
         
         for attempt in range(self.max_retries):
             try:
-                self._rate_limit()
+                self._rate_limit(weight)
                 
                 response = self.session.request(
                     method=method,
@@ -89,9 +159,12 @@ class MEXCClient:
                     timeout=self.timeout
                 )
                 
+                profiling.count('api_calls')
+                profiling.count('bytes_downloaded', len(response.content))
+                
                 # Handle rate limit (429)
                 if response.status_code == 429:
-                    retry_after = int(response.headers.get('Retry-After', self.retry_backoff))
+                    retry_after = retry_after_seconds(response.headers, self.retry_backoff)
                     logger.warning(f"Rate limited. Waiting {retry_after}s...")
                     time.sleep(retry_after)
                     continue
@@ -115,21 +188,22 @@ class MEXCClient:
         Get exchange info (symbols, trading rules).
         
         Args:
-            use_cache: Use cached data if available (today)
+            use_cache: Use cached data if available (not expired)
             
         Returns:
             Exchange info dict with 'symbols' list
         """
         cache_key = "mexc_exchange_info"
         
-        if use_cache and cache_exists(cache_key):
+        cached = load_cache(cache_key) if use_cache else None
+        if cached is not None:
             logger.info("Loading exchange info from cache")
-            return load_cache(cache_key)
+            return cached
         
         logger.info("Fetching exchange info from MEXC API")
         data = self._request("GET", "/api/v3/exchangeInfo")
         
-        save_cache(data, cache_key)
+        save_cache(data, cache_key, resource="exchange_info")
         return data
     
     def get_spot_usdt_symbols(self, use_cache: bool = True) -> List[str]:
@@ -141,16 +215,7 @@ class MEXCClient:
         """
         exchange_info = self.get_exchange_info(use_cache=use_cache)
         
-        symbols = []
-        for symbol_info in exchange_info.get("symbols", []):
-            # Filter: USDT quote, Spot, Trading status
-            # Note: MEXC uses status="1" for enabled (not "ENABLED")
-            if (
-                symbol_info.get("quoteAsset") == "USDT" and
-                symbol_info.get("isSpotTradingAllowed", False) and
-                symbol_info.get("status") == "1"
-            ):
-                symbols.append(symbol_info["symbol"])
+        symbols = select_spot_usdt_symbols(exchange_info)
         
         logger.info(f"Found {len(symbols)} USDT Spot pairs")
         return symbols
@@ -170,14 +235,15 @@ class MEXCClient:
         """
         cache_key = "mexc_24h_tickers"
         
-        if use_cache and cache_exists(cache_key):
+        cached = load_cache(cache_key) if use_cache else None
+        if cached is not None:
             logger.info("Loading 24h tickers from cache")
-            return load_cache(cache_key)
+            return cached
         
         logger.info("Fetching 24h tickers from MEXC API")
         data = self._request("GET", "/api/v3/ticker/24hr")
         
-        save_cache(data, cache_key)
+        save_cache(data, cache_key, resource="tickers")
         logger.info(f"Fetched {len(data)} ticker entries")
         return data
     
@@ -201,11 +267,15 @@ class MEXCClient:
             List of klines, each kline is a list:
             [openTime, open, high, low, close, volume, closeTime, quoteVolume, ...]
         """
+        if self.candle_store is not None:
+            return self._get_candles_incremental(symbol, interval, limit).to_klines()
+        
         cache_key = f"mexc_klines_{symbol}_{interval}"
         
-        if use_cache and cache_exists(cache_key):
+        cached = load_cache(cache_key) if use_cache else None
+        if cached is not None:
             logger.debug(f"Loading klines from cache: {symbol} {interval}")
-            return load_cache(cache_key)
+            return cached
         
         logger.debug(f"Fetching klines: {symbol} {interval} (limit={limit})")
         
@@ -217,9 +287,87 @@ class MEXCClient:
         
         data = self._request("GET", "/api/v3/klines", params=params)
         
-        save_cache(data, cache_key)
+        save_cache(data, cache_key, resource="klines", interval=interval)
         return data
     
+    def get_candles(
+        self,
+        symbol: str,
+        interval: str = "1d",
+        limit: int = 120,
+        use_cache: bool = True
+    ) -> CandleArrays:
+        """
+        Get klines as column arrays (float64 OHLCV + int64 times).
+        
+        With a candle store the arrays are memory-mapped from disk, so no
+        JSON parsing or string conversion happens on the way to features.
+        
+        Returns:
+            CandleArrays with the newest `limit` candles
+        """
+        if self.candle_store is not None:
+            return self._get_candles_incremental(symbol, interval, limit)
+        return CandleArrays.from_klines(self.get_klines(symbol, interval, limit, use_cache))
+    
+    def _get_candles_incremental(
+        self,
+        symbol: str,
+        interval: str,
+        limit: int
+    ) -> CandleArrays:
+        """
+        Get klines via the candle store, downloading only the missing tail.
+        
+        The newest stored candle is re-requested (it may still have been open
+        at the previous run); everything after it comes from `startTime`.
+        Falls back to a full download if the store is empty, too short, or
+        too far behind to catch up within one request.
+        
+        Returns:
+            The newest `limit` candles (oldest first)
+        """
+        limit = min(limit, 1000)  # API max is 1000
+        stored = self.candle_store.load(symbol, interval)
+        interval_ms = interval_to_ms(interval)
+        
+        if stored is not None and interval_ms and len(stored) >= limit:
+            last_open = int(stored.open_time[-1])
+            now_ms = timestamp_to_ms(utc_now())
+            missing = (now_ms - last_open) // interval_ms + 1
+            
+            if missing < limit:
+                profiling.count('candle_store_hits')
+                logger.debug(f"Fetching kline tail: {symbol} {interval} "
+                           f"(from {last_open}, ~{missing} candles)")
+                params = {
+                    "symbol": symbol,
+                    "interval": interval,
+                    "startTime": last_open,
+                    "limit": int(missing) + 1
+                }
+                tail = self._request("GET", "/api/v3/klines", params=params)
+                return self.candle_store.merge(symbol, interval, tail).tail(limit)
+        
+        profiling.count('candle_store_misses')
+        logger.debug(f"Fetching klines: {symbol} {interval} (limit={limit}, full window)")
+        params = {
+            "symbol": symbol,
+            "interval": interval,
+            "limit": limit
+        }
+        data = CandleArrays.from_klines(self._request("GET", "/api/v3/klines", params=params))
+        
+        # Replace the history when the new window does not overlap it (gap)
+        if (
+            stored is not None and len(stored) and len(data) and
+            int(data.open_time[0]) > int(stored.open_time[-1]) + (interval_ms or 0)
+        ):
+            self.candle_store.save(symbol, interval, data)
+            return data
+        
+        return self.candle_store.merge(symbol, interval, data).tail(limit)
+    
     def get_multiple_klines(
         self,
         symbols: List[str],
@@ -0,0 +1,393 @@
+"""
+Offline Market Stand-in
+=======================
+
+Serves the MEXC and CMC endpoints the pipeline uses from recorded raw
+snapshots (the raw OHLCV dataset and the market-cap history in `<raw_dir>/marketcap`),
+so `run_mode: offline` runs the complete pipeline - rate limiter, worker
+pool, retries - without network access.
+
+Endpoints:
+- GET /api/v3/exchangeInfo            (recorded symbols, Spot USDT, enabled)
+- GET /api/v3/ticker/24hr             (last close, last daily quote volume)
+- GET /api/v3/klines                  (symbol, interval, limit, startTime, endTime)
+- GET /v1/cryptocurrency/listings/latest  (start, limit)
+
+Two transports share one OfflineMarket:
+- OfflineAdapter: requests transport adapter mounted on the client
+  sessions (in-process, no sockets)
+- OfflineServer: local ThreadingHTTPServer (real connections and
+  keep-alive pools; point the clients' base_url at it)
+
+Faults are injected per request from a seeded RNG: latency (+ jitter),
+429 answers with Retry-After, and 500 errors (MEXC endpoints only).
+"""
+
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qsl
+
+import numpy as np
+import pandas as pd
+from requests import Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from ..utils import json_codec
+from ..utils.candle_store import CandleArrays
+from ..utils.logging_utils import get_logger
+from ..utils.marketcap_store import KEY
+from ..utils.raw_collector import load_candle_history, marketcap_store
+
+logger = get_logger(__name__)
+
+MEXC_URL = "https://api.mexc.com"
+CMC_URL = "https://pro-api.coinmarketcap.com"
+
+INTERVALS = ("1d", "4h")
+
+
+def _listing_record(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Rebuild one CMC listing from a flattened marketcap snapshot row.
+
+    json_normalize emits both `platform` (null rows) and `platform__id`
+    (dict rows); a nested dict whose values are all null is null again.
+    """
+    record: Dict[str, Any] = {}
+    for column, value in row.items():
+        if isinstance(value, float) and np.isnan(value):
+            value = None
+        elif isinstance(value, str) and value[:1] in "[{":
+            try:
+                value = json.loads(value)
+            except ValueError:
+                pass
+        *parents, leaf = column.split("__")
+        node = record
+        for key in parents:
+            if not isinstance(node.get(key), dict):
+                node[key] = {}
+            node = node[key]
+        if not isinstance(node.get(leaf), dict):
+            node[leaf] = value
+
+    def collapse(node):
+        if not isinstance(node, dict):
+            return node
+        node = {key: collapse(value) for key, value in node.items()}
+        return None if node and all(value is None for value in node.values()) else node
+
+    return {key: collapse(value) for key, value in record.items()}
+
+
+def _fmt(value: float) -> str:
+    """Number as MEXC sends it (string)."""
+    return repr(float(value))
+
+
+class OfflineMarket:
+    """Recorded market data plus fault injection, independent of transport."""
+
+    def __init__(
+        self,
+        candles: Dict[str, Dict[str, CandleArrays]],
+        listings: List[Dict[str, Any]],
+        latency_ms: float = 0.0,
+        latency_jitter_ms: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        error_rate: float = 0.0,
+        retry_after_s: int = 0,
+        seed: int = 42
+    ):
+        """
+        Initialize offline market.
+
+        Args:
+            candles: interval -> symbol -> CandleArrays
+            listings: CMC listing dicts (listings/latest 'data' entries)
+            latency_ms: Added delay per request
+            latency_jitter_ms: Uniform +/- jitter on the delay
+            rate_limit_rate: Share of requests answered with 429
+            error_rate: Share of requests answered with 500
+            retry_after_s: Retry-After header on 429 answers
+            seed: RNG seed (fault pattern is reproducible for a request order)
+        """
+        self.candles = candles
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.rate_limit_rate = rate_limit_rate
+        self.error_rate = error_rate
+        self.retry_after_s = retry_after_s
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats: Counter = Counter()
+
+        symbols = sorted(candles.get("1d", {}))
+        self.listings = listings
+        self._exchange_info = json_codec.dumps({
+            "timezone": "CST",
+            "serverTime": 0,
+            "symbols": [
+                {
+                    "symbol": symbol,
+                    "status": "1",
+                    "baseAsset": symbol[:-4],
+                    "quoteAsset": "USDT",
+                    "isSpotTradingAllowed": True,
+                }
+                for symbol in symbols
+            ],
+        })
+        self._tickers = json_codec.dumps([self._ticker(symbol) for symbol in symbols])
+
+        logger.info(f"Offline market: {len(symbols)} symbols, {len(listings)} listings")
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "OfflineMarket":
+        """
+        Build from the 'offline' config section.
+
+        Candles are merged from all runs in raw_dir (newest run wins);
+        listings are the newest state of the market-cap history (or, for
+        older recordings, the newest run's marketcap_snapshot.parquet).
+        """
+        # Handle both dict and ScannerConfig object
+        if hasattr(config, 'raw'):
+            offline_config = config.raw.get('offline', {})
+        else:
+            offline_config = config.get('offline', {})
+
+        raw_dir = offline_config.get('raw_dir', 'snapshots/raw')
+        candles = {interval: load_candle_history(raw_dir, interval) for interval in INTERVALS}
+
+        listings: List[Dict[str, Any]] = []
+        df = marketcap_store(raw_dir).load_asof().reset_index().rename(columns={KEY: "id"})
+        if not df.empty and "cmc_rank" in df:
+            df = df.sort_values("cmc_rank", kind="stable")
+        if df.empty:
+            recorded = sorted(Path(raw_dir).glob("*/marketcap_snapshot.parquet"))
+            if recorded:
+                df = pd.read_parquet(recorded[-1])
+        listings = [_listing_record(row) for row in df.to_dict("records")]
+
+        return cls(
+            candles,
+            listings,
+            latency_ms=offline_config.get('latency_ms', 0.0),
+            latency_jitter_ms=offline_config.get('latency_jitter_ms', 0.0),
+            rate_limit_rate=offline_config.get('rate_limit_rate', 0.0),
+            error_rate=offline_config.get('error_rate', 0.0),
+            retry_after_s=offline_config.get('retry_after_s', 0),
+            seed=offline_config.get('seed', 42),
+        )
+
+    # -------------------------------------------------------------------------
+    # Payloads
+    # -------------------------------------------------------------------------
+    def _ticker(self, symbol: str) -> Dict[str, Any]:
+        daily = self.candles["1d"][symbol]
+        intraday = self.candles.get("4h", {}).get(symbol)
+        last = intraday if intraday is not None and len(intraday) else daily
+        return {
+            "symbol": symbol,
+            "lastPrice": _fmt(last.close[-1]),
+            "volume": _fmt(daily.volume[-1]),
+            "quoteVolume": _fmt(daily.quote_volume[-1]),
+            "openTime": int(daily.open_time[-1]),
+            "closeTime": int(daily.close_time[-1]),
+        }
+
+    def _klines(self, params: Dict[str, str]) -> Tuple[int, Any]:
+        candles = self.candles.get(params.get("interval", ""), {}).get(params.get("symbol", ""))
+        if candles is None:
+            return 400, {"code": -1121, "msg": "Invalid symbol."}
+
+        limit = min(int(params.get("limit", 500)), 1000)
+        start, stop = 0, len(candles)
+        if "endTime" in params:
+            stop = int(np.searchsorted(candles.open_time, int(params["endTime"]), side="right"))
+        if "startTime" in params:
+            start = int(np.searchsorted(candles.open_time, int(params["startTime"]), side="left"))
+            stop = min(stop, start + limit)
+        else:
+            start = max(stop - limit, 0)
+
+        return 200, [
+            [
+                int(candles.open_time[i]), _fmt(candles.open[i]), _fmt(candles.high[i]),
+                _fmt(candles.low[i]), _fmt(candles.close[i]), _fmt(candles.volume[i]),
+                int(candles.close_time[i]), _fmt(candles.quote_volume[i]),
+            ]
+            for i in range(start, stop)
+        ]
+
+    def _listings(self, params: Dict[str, str]) -> Tuple[int, Any]:
+        start = int(params.get("start", 1))
+        limit = int(params.get("limit", 100))
+        data = self.listings[start - 1:start - 1 + limit]
+        return 200, {"status": {"error_code": 0, "credit_count": 0}, "data": data}
+
+    # -------------------------------------------------------------------------
+    # Request handling
+    # -------------------------------------------------------------------------
+    def _draw_fault(self, inject: bool = True) -> Tuple[float, Optional[int]]:
+        """Delay in seconds and injected status (None: answer normally)."""
+        with self._lock:
+            delay = self.latency_ms + self._rng.uniform(-1, 1) * self.latency_jitter_ms
+            roll = self._rng.random() if inject else 1.0
+        if roll < self.rate_limit_rate:
+            return max(delay, 0.0) / 1000, 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return max(delay, 0.0) / 1000, 500
+        return max(delay, 0.0) / 1000, None
+
+    def handle(self, path: str, params: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Answer one GET request.
+
+        Args:
+            path: URL path (e.g. '/api/v3/klines')
+            params: Query parameters
+
+        Returns:
+            (status, headers, body)
+        """
+        # Errors only on MEXC endpoints: the CMC client makes one unretried call per run
+        delay, fault = self._draw_fault(inject=path.startswith("/api/"))
+        if delay:
+            time.sleep(delay)
+
+        headers = {"Content-Type": "application/json"}
+        with self._lock:
+            self.stats[path] += 1
+            if fault:
+                self.stats[f"fault_{fault}"] += 1
+
+        if fault == 429:
+            headers["Retry-After"] = str(self.retry_after_s)
+            return 429, headers, b'{"code":429,"msg":"Too many requests (injected)"}'
+        if fault == 500:
+            return 500, headers, b'{"code":500,"msg":"Internal error (injected)"}'
+
+        if path == "/api/v3/exchangeInfo":
+            return 200, headers, self._exchange_info
+        if path == "/api/v3/ticker/24hr":
+            return 200, headers, self._tickers
+        if path == "/api/v3/klines":
+            status, payload = self._klines(params)
+        elif path == "/v1/cryptocurrency/listings/latest":
+            status, payload = self._listings(params)
+        else:
+            status, payload = 404, {"code": 404, "msg": f"Unknown endpoint {path}"}
+
+        return status, headers, json_codec.dumps(payload)
+
+    def attach(self, mexc, cmc, transport: str = "adapter") -> Optional["OfflineServer"]:
+        """
+        Route the clients' requests to this market.
+
+        Args:
+            mexc: MEXCClient
+            cmc: MarketCapClient
+            transport: 'adapter' (in-process) or 'http' (local server)
+
+        Returns:
+            The running OfflineServer for 'http' (caller shuts it down), else None
+        """
+        if transport == "adapter":
+            adapter = OfflineAdapter(self)
+            mexc.session.mount(mexc.base_url, adapter)
+            cmc.session.mount(cmc.base_url, adapter)
+            return None
+        if transport == "http":
+            server = OfflineServer(self).start()
+            mexc.base_url = server.url
+            cmc.base_url = server.url
+            return server
+        raise ValueError(f"Unknown offline transport: {transport}")
+
+
+class OfflineAdapter(BaseAdapter):
+    """requests transport adapter answering from an OfflineMarket."""
+
+    def __init__(self, market: OfflineMarket):
+        super().__init__()
+        self.market = market
+
+    def send(self, request, **kwargs) -> Response:
+        url = urlsplit(request.url)
+        status, headers, body = self.market.handle(url.path, dict(parse_qsl(url.query)))
+
+        response = Response()
+        response.status_code = status
+        response.reason = HTTPStatus(status).phrase
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = body
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+class OfflineServer:
+    """Local HTTP server (threaded, keep-alive) answering from an OfflineMarket."""
+
+    def __init__(self, market: OfflineMarket, host: str = "127.0.0.1", port: int = 0):
+        market_ref = market
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                status, headers, body = market_ref.handle(url.path, dict(parse_qsl(url.query)))
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(f"offline server: {format % args}")
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "OfflineServer":
+        if self._thread is not None:
+            return self  # already serving (attach() starts, `with` enters)
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Offline server listening on {self.url}")
+        return self
+
+    def shutdown(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "OfflineServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
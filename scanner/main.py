@@ -16,6 +16,16 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         choices=["standard", "fast", "offline", "backtest"],
         help="Override run_mode from config.yml",
     )
+    parser.add_argument(
+        "--from",
+        dest="date_from",
+        help="backtest mode: first replay date (YYYY-MM-DD)",
+    )
+    parser.add_argument(
+        "--to",
+        dest="date_to",
+        help="backtest mode: last replay date (YYYY-MM-DD)",
+    )
     return parser.parse_args(argv)
 
 
@@ -25,6 +35,10 @@ def main(argv: list[str] | None = None) -> int:
 
     if args.mode:
         cfg.raw.setdefault("general", {})["run_mode"] = args.mode
+    if args.date_from:
+        cfg.raw.setdefault("replay", {})["start"] = args.date_from
+    if args.date_to:
+        cfg.raw.setdefault("replay", {})["end"] = args.date_to
 
     run_pipeline(cfg)
     return 0
@@ -7,29 +7,58 @@ Orchestrates the full daily scanning pipeline.
 
 from __future__ import annotations
 import logging
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Dict, Optional
 from ..utils.time_utils import utc_now, timestamp_to_ms
 
 from ..config import ScannerConfig
 from ..clients.mexc_client import MEXCClient
 from ..clients.marketcap_client import MarketCapClient
 from ..clients.mapping import SymbolMapper
+from ..clients.offline_market import OfflineMarket
+from ..utils.candle_store import CandleStore
+from ..utils.profiling import RunProfiler
+from ..utils.artifact_writer import ArtifactWriter
+from ..utils.cache import ResponseCache
 from .filters import UniverseFilters
 from .shortlist import ShortlistSelector
+from .universe import build_universe_table, enrich_features
 from .ohlcv import OHLCVFetcher
 from .features import FeatureEngine
-from .scoring.reversal import score_reversals
-from .scoring.breakout import score_breakouts
-from .scoring.pullback import score_pullbacks
+from .scoring.reversal import score_reversals, attach_reversal_reasons
+from .scoring.breakout import score_breakouts, attach_breakout_reasons
+from .scoring.pullback import score_pullbacks, attach_pullback_reasons
 from .output import ReportGenerator
 from .snapshot import SnapshotManager
+from .dag import Stage, DagExecutor
+from .replay import run_replay
 
 logger = logging.getLogger(__name__)
 
 
-def run_pipeline(config: ScannerConfig) -> None:
+def offline_outputs(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Config for run_mode 'offline': reports, profile, snapshot, response
+    cache and candle store go to `offline.output_dir` (default:
+    reports/offline) instead of the live locations, so offline load tests
+    never overwrite a real run's outputs or feed recorded/synthetic data
+    into the live cache.
+    """
+    output_dir = Path(raw.get('offline', {}).get('output_dir', 'reports/offline'))
+    return {
+        **raw,
+        'output': {**raw.get('output', {}), 'reports_dir': str(output_dir)},
+        'snapshots': {**raw.get('snapshots', {}), 'runtime_dir': str(output_dir / 'snapshots')},
+        'cache': {**raw.get('cache', {}), 'dir': str(output_dir / 'cache')},
+        'ohlcv': {**raw.get('ohlcv', {}), 'candle_store_dir': str(output_dir / 'candles')},
+    }
+
+
+def run_pipeline(config: ScannerConfig, offline_market: Optional[OfflineMarket] = None) -> None:
     """
     Orchestrates the full daily pipeline:
-    1. Fetch universe (MEXC Spot USDT)
+    1. Fetch universe (MEXC Spot USDT) and 24h tickers
     2. Fetch market cap listings
     3. Run mapping layer
     4. Apply hard filters (market cap, liquidity, exclusions)
@@ -40,9 +69,34 @@ def run_pipeline(config: ScannerConfig) -> None:
     9. Compute scores (breakout / pullback / reversal)
     10. Write reports (Markdown + JSON + Excel)
     11. Write snapshot for backtests
+    
+    The steps run as a stage DAG (see dag.py): steps 1 and 2 overlap, steps
+    6 and 7 stream (features are computed while klines still download), and
+    the reports and the snapshot are written concurrently.
+    
+    run_mode 'backtest' instead replays steps 5-11 day by day from the
+    stored raw OHLCV history (see replay.py). run_mode 'offline' writes its
+    reports, snapshot and cache to `offline.output_dir` and records no raw data.
+    
+    Args:
+        config: Scanner config
+        offline_market: Stand-in served in run_mode 'offline'
+            (default: built from the recorded raw snapshots)
     """
     run_mode = config.run_mode
-
+    
+    if run_mode == 'backtest':
+        logger.info("=" * 80)
+        logger.info("REPLAY (backtest mode) STARTING")
+        logger.info("=" * 80)
+        snapshot_paths = run_replay(config)
+        logger.info(f"✓ Replay: {len(snapshot_paths)} snapshots written")
+        return
+    
+    if run_mode == 'offline':
+        # Own output locations; recorded data is read, never appended to
+        config = ScannerConfig(raw=offline_outputs(config.raw))
+    
     # As-Of Timestamp (einmal pro Run)
     asof_dt = utc_now()
     asof_ts_ms = timestamp_to_ms(asof_dt)
@@ -53,180 +107,265 @@ def run_pipeline(config: ScannerConfig) -> None:
     
     use_cache = run_mode in ['fast', 'standard']
     
-    logger.info("=" * 80)
-    logger.info(f"PIPELINE STARTING - {run_date}")
-    logger.info(f"Mode: {run_mode}")
-    logger.info("=" * 80)
-    
-    # Initialize clients
-    logger.info("\n[INIT] Initializing clients...")
-    mexc = MEXCClient()
-    cmc = MarketCapClient(api_key=config.cmc_api_key)
-    logger.info("✓ Clients initialized")
-    
-    # Step 1: Fetch universe (MEXC Spot USDT)
-    logger.info("\n[1/11] Fetching MEXC universe...")
-    universe = mexc.get_spot_usdt_symbols(use_cache=use_cache)
-    logger.info(f"✓ Universe: {len(universe)} USDT pairs")
-    
-    # Get 24h tickers
-    logger.info("  Fetching 24h tickers...")
-    tickers = mexc.get_24h_tickers(use_cache=use_cache)
-    ticker_map = {t['symbol']: t for t in tickers}
-    logger.info(f"  ✓ Tickers: {len(ticker_map)} symbols")
-    
-    # Step 2 & 3: Fetch market cap + Run mapping layer
-    logger.info("\n[2-3/11] Fetching market cap & mapping...")
-    cmc_listings = cmc.get_listings(use_cache=use_cache)
-    cmc_symbol_map = cmc.build_symbol_map(cmc_listings)
-    logger.info(f"  ✓ CMC: {len(cmc_symbol_map)} symbols")
-    
-    mapper = SymbolMapper()
-    mapping_results = mapper.map_universe(universe, cmc_symbol_map)
-    logger.info(f"✓ Mapped: {mapper.stats['mapped']}/{mapper.stats['total']} "
-               f"({mapper.stats['mapped']/mapper.stats['total']*100:.1f}%)")
-    
-    # Prepare data for filters
-    symbols_with_data = []
-    for symbol in universe:
-        result = mapping_results.get(symbol)
-        if not result or not result.mapped:
-            continue
-        
-        ticker = ticker_map.get(symbol, {})
-        
-        symbols_with_data.append({
-            'symbol': symbol,
-            'base': symbol.replace('USDT', ''),
-            'quote_volume_24h': float(ticker.get('quoteVolume', 0)),
-            'market_cap': result._get_market_cap()
-        })
-    
-    # Step 4: Apply hard filters
-    logger.info("\n[4/11] Applying universe filters...")
-    filters = UniverseFilters(config.raw)
-    filtered = filters.apply_all(symbols_with_data)
-    logger.info(f"✓ Filtered: {len(filtered)} symbols")
-    
-    # Step 5: Run cheap pass (shortlist)
-    logger.info("\n[5/11] Creating shortlist...")
-    selector = ShortlistSelector(config.raw)
-    shortlist = selector.select(filtered)
-    logger.info(f"✓ Shortlist: {len(shortlist)} symbols")
-    
-    # Step 6: Fetch OHLCV for shortlist
-    logger.info("\n[6/11] Fetching OHLCV data...")
-    ohlcv_fetcher = OHLCVFetcher(mexc, config.raw)
-    ohlcv_data = ohlcv_fetcher.fetch_all(shortlist)
-    logger.info(f"✓ OHLCV: {len(ohlcv_data)} symbols with complete data")
-    
-    # Step 7: Compute features (1d + 4h)
-    logger.info("\n[7/11] Computing features...")
-    feature_engine = FeatureEngine(config.raw)
-    features = feature_engine.compute_all(ohlcv_data, asof_ts_ms=asof_ts_ms)
-    logger.info(f"✓ Features: {len(features)} symbols")
-
-    # Step 8: Enrich features with price, coin name, market cap, and volume
-    logger.info("\n[8/11] Enriching features with price, name, market cap, and volume...")
-    for symbol in features.keys():
-        # Add current price from tickers
-        ticker = ticker_map.get(symbol)
-        if ticker:
-            features[symbol]['price_usdt'] = float(ticker.get('lastPrice', 0))
-        else:
-            features[symbol]['price_usdt'] = None
-    
-        # Add coin name from CMC
-        mapping = mapper.map_symbol(symbol, cmc_symbol_map)
-        if mapping.mapped and mapping.cmc_data:
-            features[symbol]['coin_name'] = mapping.cmc_data.get('name', 'Unknown')
-        else:
-            features[symbol]['coin_name'] = 'Unknown'
-        
-        # Add market cap and volume from shortlist data
-        shortlist_entry = next((s for s in shortlist if s['symbol'] == symbol), None)
-        if shortlist_entry:
-            features[symbol]['market_cap'] = shortlist_entry.get('market_cap')
-            features[symbol]['quote_volume_24h'] = shortlist_entry.get('quote_volume_24h')
-        else:
-            features[symbol]['market_cap'] = None
-            features[symbol]['quote_volume_24h'] = None
-
-    logger.info(f"✓ Enriched {len(features)} symbols with price, name, market cap, and volume")
-    
-    # Prepare volume map for scoring (backwards compatibility)
-    volume_map = {s['symbol']: s['quote_volume_24h'] for s in shortlist}
-    
-    # Step 9: Compute scores (breakout / pullback / reversal)
-    logger.info("\n[9/11] Scoring setups...")
-    
-    logger.info("  Scoring Reversals...")
-    reversal_results = score_reversals(features, volume_map, config.raw)
-    logger.info(f"  ✓ Reversals: {len(reversal_results)} scored")
-    
-    logger.info("  Scoring Breakouts...")
-    breakout_results = score_breakouts(features, volume_map, config.raw)
-    logger.info(f"  ✓ Breakouts: {len(breakout_results)} scored")
-    
-    logger.info("  Scoring Pullbacks...")
-    pullback_results = score_pullbacks(features, volume_map, config.raw)
-    logger.info(f"  ✓ Pullbacks: {len(pullback_results)} scored")
-    
-    # Step 10: Write reports (Markdown + JSON + Excel)
-    logger.info("\n[10/11] Generating reports...")
-    report_gen = ReportGenerator(config.raw)
-    report_paths = report_gen.save_reports(
-        reversal_results,
-        breakout_results,
-        pullback_results,
-        run_date,
-        metadata={
+    # Run-scoped singletons are released on every exit path (also when a stage fails)
+    with ExitStack() as resources:
+        # Per-stage timings, resources and API/cache counters
+        profiler = RunProfiler().activate()
+        resources.callback(profiler.deactivate)
+        # Raw snapshots, reports and the snapshot are written in the background
+        artifact_writer = ArtifactWriter(
+            max_pending=config.raw.get('general', {}).get('artifact_queue_size', 16)
+        ).activate()
+        # Also joined when a stage fails (close() is idempotent)
+        resources.callback(artifact_writer.close)
+        # API response cache (per-resource TTLs, LRU disk budget, memory tier)
+        response_cache = ResponseCache.from_config(config).activate()
+        resources.callback(response_cache.deactivate)
+        
+        logger.info("=" * 80)
+        logger.info(f"PIPELINE STARTING - {run_date}")
+        logger.info(f"Mode: {run_mode}")
+        logger.info("=" * 80)
+        
+        # Initialize clients
+        logger.info("\n[INIT] Initializing clients...")
+        with profiler.stage('init'):
+            mexc_config = config.raw.get('data_sources', {}).get('mexc', {})
+            ohlcv_config = config.raw.get('ohlcv', {})
+            offline_config = config.raw.get('offline', {})
+            candle_store = None
+            # Offline runs stay reproducible: no persisted kline history
+            if ohlcv_config.get('incremental_cache', True) and run_mode != 'offline':
+                candle_store = CandleStore(ohlcv_config.get('candle_store_dir', 'data/candles'))
+            mexc = MEXCClient(
+                max_retries=mexc_config.get('max_retries', 3),
+                retry_backoff=mexc_config.get('retry_backoff_seconds', 3.0),
+                rate_limit_per_sec=mexc_config.get('rate_limit_per_sec', 20.0),
+                pool_size=max(16, ohlcv_config.get('max_workers', 8)),
+                candle_store=candle_store,
+            )
+            cmc = MarketCapClient(api_key=config.cmc_api_key, collect_raw=run_mode != 'offline')
+            
+            # Offline: serve MEXC/CMC from recorded raw snapshots (optionally with faults)
+            offline_server = None
+            if run_mode == 'offline':
+                if offline_market is None:
+                    offline_market = OfflineMarket.from_config(config.raw)
+                offline_server = offline_market.attach(mexc, cmc, offline_config.get('transport', 'adapter'))
+                if offline_server is not None:
+                    resources.callback(offline_server.shutdown)
+        logger.info("✓ Clients initialized")
+        
+        top_n = config.raw.get('output', {}).get('top_n_per_setup', 10)
+        # Full ranking is only needed when snapshots keep every scored symbol
+        full_ranking = config.raw.get('snapshots', {}).get('full_ranking', True)
+        rank_limit = None if full_ranking else top_n
+        report_gen = ReportGenerator(config.raw)
+        profile_path = report_gen.reports_dir / f"{run_date}.profile.json"
+        report_meta = {
             'mode': run_mode,
             'asof_ts_ms': asof_ts_ms,
             'asof_iso': asof_iso,
         }
-    )
-    logger.info(f"✓ Markdown: {report_paths['markdown']}")
-    logger.info(f"✓ JSON: {report_paths['json']}")
-    if 'excel' in report_paths:
-        logger.info(f"✓ Excel: {report_paths['excel']}")
+        
+        # Step 1: Fetch universe (MEXC Spot USDT) and 24h tickers
+        def fetch_universe():
+            logger.info("\n[1/11] Fetching MEXC universe...")
+            universe = mexc.get_spot_usdt_symbols(use_cache=use_cache)
+            logger.info(f"✓ Universe: {len(universe)} USDT pairs")
+            return universe
+        
+        def fetch_tickers():
+            logger.info("  Fetching 24h tickers...")
+            tickers = mexc.get_24h_tickers(use_cache=use_cache)
+            logger.info(f"  ✓ Tickers: {len(tickers)} symbols")
+            return tickers
+        
+        # Step 2: Fetch market cap
+        def fetch_listings():
+            logger.info("\n[2/11] Fetching market cap...")
+            cmc_listings = cmc.get_listings(use_cache=use_cache)
+            cmc_symbol_map = cmc.build_symbol_map(cmc_listings)
+            logger.info(f"  ✓ CMC: {len(cmc_symbol_map)} symbols")
+            return cmc_symbol_map
+        
+        # Step 3: Run mapping layer
+        def map_universe(universe, tickers, cmc_symbol_map):
+            logger.info("\n[3/11] Mapping...")
+            mapper = SymbolMapper()
+            mapping_results = mapper.map_universe(universe, cmc_symbol_map)
+            logger.info(f"✓ Mapped: {mapper.stats['mapped']}/{mapper.stats['total']} "
+                       f"({mapper.stats['mapped']/mapper.stats['total']*100:.1f}%)")
+            
+            # Join universe, tickers and mapping once (symbol-keyed)
+            return build_universe_table(universe, tickers, mapping_results)
+        
+        # Step 4: Apply hard filters
+        def apply_filters(universe_table):
+            logger.info("\n[4/11] Applying universe filters...")
+            filters = UniverseFilters(config.raw)
+            filtered = filters.apply_all(universe_table.filter_input())
+            logger.info(f"✓ Filtered: {len(filtered)} symbols")
+            return filtered
+        
+        # Step 5: Run cheap pass (shortlist)
+        def select_shortlist(universe_table, filtered):
+            logger.info("\n[5/11] Creating shortlist...")
+            selector = ShortlistSelector(config.raw)
+            shortlist = selector.select(filtered)
+            universe_table.set_shortlist(shortlist)
+            logger.info(f"✓ Shortlist: {len(shortlist)} symbols")
+            return shortlist
+        
+        # Steps 6+7: Fetch OHLCV for shortlist and compute features (1d + 4h), streamed:
+        # features are computed per micro-batch while the remaining klines download
+        def fetch_ohlcv_features(shortlist):
+            logger.info("\n[6/11] Fetching OHLCV data...")
+            logger.info("[7/11] Computing features (streamed)...")
+            ohlcv_config = config.raw.get('ohlcv', {})
+            # Offline: every run goes through the stand-in (no per-day kline cache, no raw snapshot)
+            ohlcv_fetcher = OHLCVFetcher(mexc, config.raw, use_cache=run_mode != 'offline',
+                                         raw_snapshot=run_mode != 'offline')
+            feature_engine = FeatureEngine(config.raw)
+            streamed = feature_engine.compute_stream(
+                ohlcv_fetcher.stream(shortlist),
+                asof_ts_ms=asof_ts_ms,
+                batch_size=ohlcv_config.get('feature_batch_size', 256),
+            )
+            # Shortlist order, independent of completion order
+            features = {entry['symbol']: streamed[entry['symbol']] for entry in shortlist if entry['symbol'] in streamed}
+            logger.info(f"✓ Features: {len(features)}/{len(shortlist)} symbols")
+            return features
+        
+        # Step 8: Enrich features with price, coin name, market cap, and volume (in place)
+        def enrich(features, universe_table):
+            logger.info("\n[8/11] Enriching features with price, name, market cap, and volume...")
+            enrich_features(features, universe_table)
+            logger.info(f"✓ Enriched {len(features)} symbols with price, name, market cap, and volume")
+            # Volume map for scoring
+            return features, universe_table.volume_map()
+        
+        # Step 9: Compute scores (breakout / pullback / reversal)
+        # Numeric results only; reasons are generated for the published top-N
+        def score_setups(enriched_features, volume_map):
+            logger.info("\n[9/11] Scoring setups...")
+            features = enriched_features
+            
+            logger.info("  Scoring Reversals...")
+            reversal_results = score_reversals(
+                features, volume_map, config.raw, with_reasons=False, top_n=rank_limit
+            )
+            attach_reversal_reasons(reversal_results, features, config.raw, limit=top_n)
+            logger.info(f"  ✓ Reversals: {len(reversal_results)} scored")
+            
+            logger.info("  Scoring Breakouts...")
+            breakout_results = score_breakouts(
+                features, volume_map, config.raw, with_reasons=False, top_n=rank_limit
+            )
+            attach_breakout_reasons(breakout_results, features, config.raw, limit=top_n)
+            logger.info(f"  ✓ Breakouts: {len(breakout_results)} scored")
+            
+            logger.info("  Scoring Pullbacks...")
+            pullback_results = score_pullbacks(
+                features, volume_map, config.raw, with_reasons=False, top_n=rank_limit
+            )
+            attach_pullback_reasons(pullback_results, features, config.raw, limit=top_n)
+            logger.info(f"  ✓ Pullbacks: {len(pullback_results)} scored")
+            
+            return reversal_results, breakout_results, pullback_results
+        
+        # Step 10: Write reports (Markdown + JSON + Excel, independent of each other)
+        def write_markdown(reversal_results, breakout_results, pullback_results):
+            logger.info("\n[10/11] Generating reports...")
+            return report_gen.save_markdown(reversal_results, breakout_results, pullback_results, run_date)
+        
+        def write_json(reversal_results, breakout_results, pullback_results):
+            return report_gen.save_json(
+                reversal_results, breakout_results, pullback_results, run_date, metadata=report_meta
+            )
+        
+        def write_excel(reversal_results, breakout_results, pullback_results):
+            return report_gen.save_excel(
+                reversal_results, breakout_results, pullback_results, run_date, metadata=report_meta
+            )
+        
+        # Step 11: Write snapshot for backtests
+        def write_snapshot(universe_table, filtered, shortlist, enriched_features,
+                           reversal_results, breakout_results, pullback_results):
+            logger.info("\n[11/11] Creating snapshot...")
+            snapshot_mgr = SnapshotManager(config.raw)
+            return snapshot_mgr.create_snapshot(
+                run_date=run_date,
+                universe=universe_table.snapshot_rows(),
+                filtered=filtered,
+                shortlist=shortlist,
+                features=enriched_features,
+                reversal_scores=reversal_results,
+                breakout_scores=breakout_results,
+                pullback_scores=pullback_results,
+                metadata={
+                    **report_meta,
+                    # Written once all stages are done (a profile taken here would be partial)
+                    'profile_path': str(profile_path),
+                }
+            )
+        
+        results = ('reversal_results', 'breakout_results', 'pullback_results')
+        stages = [
+            Stage('universe', fetch_universe, outputs=('universe',)),
+            Stage('tickers', fetch_tickers, outputs=('tickers',)),
+            Stage('listings', fetch_listings, outputs=('cmc_symbol_map',)),
+            Stage('mapping', map_universe, ('universe', 'tickers', 'cmc_symbol_map'), ('universe_table',)),
+            Stage('filters', apply_filters, ('universe_table',), ('filtered',)),
+            Stage('shortlist', select_shortlist, ('universe_table', 'filtered'), ('shortlist',)),
+            Stage('ohlcv_features', fetch_ohlcv_features, ('shortlist',), ('features',)),
+            Stage('enrich', enrich, ('features', 'universe_table'), ('enriched_features', 'volume_map')),
+            Stage('scoring', score_setups, ('enriched_features', 'volume_map'), results),
+            Stage('report_markdown', write_markdown, results, ('markdown_path',)),
+            Stage('report_json', write_json, results, ('json_path',)),
+            Stage('report_excel', write_excel, results, ('excel_path',)),
+            Stage('snapshot', write_snapshot,
+                  ('universe_table', 'filtered', 'shortlist', 'enriched_features') + results, ('snapshot_path',)),
+        ]
+        executor = DagExecutor(stages, max_workers=config.raw.get('general', {}).get('stage_workers', 4),
+                               profiler=profiler)
+        values = executor.run()
+        # Join the artifact writer once (files appear complete or not at all)
+        artifact_errors = artifact_writer.close()
+    if artifact_errors:
+        name, error = artifact_errors[0]
+        raise RuntimeError(f"Writing {name} failed: {error}") from error
     
-    # Step 11: Write snapshot for backtests
-    logger.info("\n[11/11] Creating snapshot...")
-    snapshot_mgr = SnapshotManager(config.raw)
-    snapshot_path = snapshot_mgr.create_snapshot(
-        run_date=run_date,
-        universe=[{'symbol': s} for s in universe],
-        filtered=filtered,
-        shortlist=shortlist,
-        features=features,
-        reversal_scores=reversal_results,
-        breakout_scores=breakout_results,
-        pullback_scores=pullback_results,
-        metadata={
-            'mode': run_mode,
-            'asof_ts_ms': asof_ts_ms,
-            'asof_iso': asof_iso,
-        }
-    )
-    logger.info(f"✓ Snapshot: {snapshot_path}")
+    logger.info(f"✓ Markdown: {values['markdown_path']}")
+    logger.info(f"✓ JSON: {values['json_path']}")
+    if values['excel_path']:
+        logger.info(f"✓ Excel: {values['excel_path']}")
+    logger.info(f"✓ Snapshot: {values['snapshot_path']}")
+    
+    profiler.save(profile_path)
+    durations = {name: stage['wall_s'] for name, stage in profiler.stages.items()}
     
     # Summary
     logger.info("\n" + "=" * 80)
     logger.info("PIPELINE COMPLETE")
     logger.info("=" * 80)
     logger.info(f"Date: {run_date}")
-    logger.info(f"Universe: {len(universe)} symbols")
-    logger.info(f"Filtered: {len(filtered)} symbols")
-    logger.info(f"Shortlist: {len(shortlist)} symbols")
-    logger.info(f"Features: {len(features)} symbols")
+    logger.info(f"Universe: {len(values['universe'])} symbols")
+    logger.info(f"Filtered: {len(values['filtered'])} symbols")
+    logger.info(f"Shortlist: {len(values['shortlist'])} symbols")
+    logger.info(f"Features: {len(values['enriched_features'])} symbols")
     logger.info(f"\nScored:")
-    logger.info(f"  Reversals: {len(reversal_results)}")
-    logger.info(f"  Breakouts: {len(breakout_results)}")
-    logger.info(f"  Pullbacks: {len(pullback_results)}")
+    logger.info(f"  Reversals: {len(values['reversal_results'])}")
+    logger.info(f"  Breakouts: {len(values['breakout_results'])}")
+    logger.info(f"  Pullbacks: {len(values['pullback_results'])}")
     logger.info(f"\nOutputs:")
-    logger.info(f"  Report: {report_paths['markdown']}")
-    if 'excel' in report_paths:
-        logger.info(f"  Excel: {report_paths['excel']}")
-    logger.info(f"  Snapshot: {snapshot_path}")
+    logger.info(f"  Report: {values['markdown_path']}")
+    if values['excel_path']:
+        logger.info(f"  Excel: {values['excel_path']}")
+    logger.info(f"  Snapshot: {values['snapshot_path']}")
+    logger.info(f"  Profile: {profile_path}")
+    logger.info("\nStage timings: " + ", ".join(f"{name} {wall:.2f}s" for name, wall in durations.items()))
+    logger.info("Critical path: " + " -> ".join(executor.critical_path(durations)))
+    if run_mode == 'offline':
+        logger.info(f"\nOffline requests: {dict(offline_market.stats)}")
     logger.info("=" * 80)
@@ -15,5 +15,491 @@ Responsibilities:
 - Output backtest summaries (e.g. JSON / Markdown).
 
 Backtests must be deterministic and snapshot-driven.
+
+Prices come from the raw OHLCV snapshots (raw_collector.load_raw_ohlcv), pivoted
+once into a day x symbol close matrix. Every ranked setup row of every
+snapshot becomes one signal; its entry is the last daily candle closed at
+the snapshot's as-of time and its exits are plain row offsets into the
+matrix, so forward returns for all signals and horizons are a few array
+gathers. Missing prices stay NaN (no forward fill).
+
+Snapshot days are independent, so with `backtest.workers` > 1 the dates
+are sharded across a process pool. The close matrix is written once to a
+temporary .npy file and each worker opens it with `np.load(mmap_mode='r')`
+(shared page cache, nothing pickled per task); only the small per-shard
+trade tables travel back.
 """
 
+import argparse
+import logging
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence
+from datetime import datetime, timezone
+import json
+
+import numpy as np
+import pandas as pd
+
+from .snapshot import SnapshotManager, SCORING_SECTIONS
+from ..utils.raw_collector import load_raw_ohlcv
+from ..utils.time_utils import utc_now
+
+logger = logging.getLogger(__name__)
+
+DAY_MS = 86_400_000
+
+# Snapshot section -> setup name
+SETUPS = {
+    'breakouts': 'breakout',
+    'pullbacks': 'pullback',
+    'reversals': 'reversal',
+}
+
+
+def date_to_ms(run_date: str) -> int:
+    return int(datetime.strptime(run_date, '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def _native(value: Any) -> Any:
+    """NaN -> None and numpy scalars -> Python (JSON output)."""
+    if isinstance(value, dict):
+        return {key: _native(v) for key, v in value.items()}
+    if isinstance(value, (float, np.floating)):
+        return None if np.isnan(value) else float(value)
+    if isinstance(value, np.integer):
+        return int(value)
+    return value
+
+
+def return_metrics(returns: np.ndarray, threshold_pct: float) -> Dict[str, Any]:
+    """
+    Distribution metrics of one return sample (NaNs dropped).
+
+    Args:
+        returns: Forward returns (fractions)
+        threshold_pct: Hit threshold in percent
+
+    Returns:
+        Dict with count, hit_rate, mean, median, pct_positive and p10/p25/p75/p90
+    """
+    returns = returns[~np.isnan(returns)]
+    if len(returns) == 0:
+        return {'count': 0}
+
+    p10, p25, p75, p90 = np.percentile(returns, [10, 25, 75, 90])
+    return {
+        'count': len(returns),
+        'hit_rate': float(np.mean(returns > threshold_pct / 100)),
+        'mean': float(np.mean(returns)),
+        'median': float(np.median(returns)),
+        'pct_positive': float(np.mean(returns > 0)),
+        'p10': p10,
+        'p25': p25,
+        'p75': p75,
+        'p90': p90,
+    }
+
+
+class PriceMatrix:
+    """Daily closes as a (day x symbol) matrix over a gap-free day range."""
+
+    def __init__(self, first_day: int, symbols: List[str], closes: np.ndarray):
+        """
+        Initialize price matrix.
+
+        Args:
+            first_day: Day number (open_time // DAY_MS) of row 0
+            symbols: Column symbols
+            closes: float64 array (n_days, n_symbols), NaN where no candle
+        """
+        self.first_day = first_day
+        self.symbols = symbols
+        self.closes = closes
+        self.symbol_index = {symbol: i for i, symbol in enumerate(symbols)}
+
+    @classmethod
+    def from_ohlcv(cls, df: pd.DataFrame) -> "PriceMatrix":
+        """
+        Build from a long OHLCV table (symbol, open_time, close).
+
+        Args:
+            df: Daily candles (see raw_collector.load_raw_ohlcv)
+
+        Returns:
+            PriceMatrix
+        """
+        if df.empty:
+            return cls(0, [], np.empty((0, 0)))
+
+        days = df['open_time'].to_numpy(dtype=np.int64) // DAY_MS
+        codes, symbols = pd.factorize(df['symbol'], sort=True)
+        first_day = int(days.min())
+
+        closes = np.full((int(days.max()) - first_day + 1, len(symbols)), np.nan)
+        closes[days - first_day, codes] = df['close'].to_numpy(dtype=float)
+
+        return cls(first_day, list(symbols), closes)
+
+    def save(self, directory: Path) -> None:
+        """Write the closes as closes.npy plus a small JSON header."""
+        directory = Path(directory)
+        np.save(directory / 'closes.npy', np.ascontiguousarray(self.closes))
+        with open(directory / 'prices.json', 'w', encoding='utf-8') as f:
+            json.dump({'first_day': self.first_day, 'symbols': self.symbols}, f)
+
+    @classmethod
+    def load(cls, directory: Path, mmap_mode: Optional[str] = 'r') -> "PriceMatrix":
+        """Open a saved matrix (memory-mapped read-only by default)."""
+        directory = Path(directory)
+        with open(directory / 'prices.json', 'r', encoding='utf-8') as f:
+            header = json.load(f)
+        closes = np.load(directory / 'closes.npy', mmap_mode=mmap_mode)
+        return cls(header['first_day'], header['symbols'], closes)
+
+    def entry_rows(self, asof_ts_ms: np.ndarray) -> np.ndarray:
+        """Row of the last daily candle closed at each as-of time (may be out of range)."""
+        asof_ts_ms = np.asarray(asof_ts_ms, dtype=np.int64)
+        return (asof_ts_ms + 1) // DAY_MS - 1 - self.first_day
+
+    def columns(self, symbols: Sequence[str]) -> np.ndarray:
+        """Column per symbol (-1 if not in the matrix)."""
+        return np.array([self.symbol_index.get(symbol, -1) for symbol in symbols], dtype=np.int64)
+
+    def prices(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """Close at (row, col) pairs, NaN outside the matrix."""
+        n_days = self.closes.shape[0]
+        valid = (rows >= 0) & (rows < n_days) & (cols >= 0)
+        out = np.full(len(rows), np.nan)
+        out[valid] = self.closes[rows[valid], cols[valid]]
+        return out
+
+    def forward_returns(
+        self,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        horizons: Sequence[int],
+        slippage_bps: float = 0.0
+    ) -> Dict[int, np.ndarray]:
+        """
+        Forward returns close[t] -> close[t + k] for every (row, col) pair.
+
+        Slippage is charged on both legs (buy above, sell below the close).
+
+        Args:
+            rows: Entry rows
+            cols: Symbol columns
+            horizons: Forward windows in days
+            slippage_bps: Slippage per leg in basis points
+
+        Returns:
+            Dict horizon -> returns (NaN where entry or exit price is missing)
+        """
+        slip = slippage_bps / 10_000
+        entry = self.prices(rows, cols) * (1 + slip)
+
+        return {
+            k: self.prices(rows + k, cols) * (1 - slip) / entry - 1
+            for k in horizons
+        }
+
+
+class BacktestRunner:
+    """Evaluates the ranked setups of all runtime snapshots against later prices."""
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize backtest runner.
+
+        Args:
+            config: Config dict with 'backtest' and 'snapshots' sections
+        """
+        # Handle both dict and ScannerConfig object
+        if hasattr(config, 'raw'):
+            raw = config.raw
+        else:
+            raw = config
+        backtest_config = raw.get('backtest', {})
+
+        max_holding = backtest_config.get('max_holding_days')
+        self.horizons = [
+            int(k) for k in backtest_config.get('forward_return_days', [7, 14, 30])
+            if max_holding is None or k <= max_holding
+        ]
+        self.slippage_bps = float(backtest_config.get('slippage_bps', 0))
+        self.hit_threshold_pct = backtest_config.get('hit_threshold_pct', 0)
+        self.rank_buckets = backtest_config.get('rank_buckets', [1, 3, 5, 10])
+        self.top_n = backtest_config.get('top_n')
+        self.raw_dir = backtest_config.get('raw_dir')
+        self.output_dir = Path(backtest_config.get('output_dir', 'reports/backtest'))
+        self.workers = backtest_config.get('workers', 1) or os.cpu_count() or 1
+        self.versions = {
+            'spec_version': str(raw.get('version', {}).get('spec', '')),
+            'config_version': str(raw.get('version', {}).get('config', '')),
+        }
+
+        if backtest_config.get('entry_price', 'close') != 'close':
+            raise ValueError(f"Unsupported entry_price: {backtest_config['entry_price']}")
+        if backtest_config.get('exit_price', 'close_forward') != 'close_forward':
+            raise ValueError(f"Unsupported exit_price: {backtest_config['exit_price']}")
+
+        self.raw = raw
+        self.snapshots = SnapshotManager(raw)
+
+        logger.info(f"Backtest Runner initialized: horizons={self.horizons}, slippage={self.slippage_bps}bps")
+
+    def hit_threshold(self, setup: str) -> float:
+        """Hit threshold in percent for a setup (number or per-setup mapping)."""
+        if isinstance(self.hit_threshold_pct, dict):
+            return float(self.hit_threshold_pct.get(setup, 0))
+        return float(self.hit_threshold_pct)
+
+    def load_signals(self, dates: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Ranked setup rows of all snapshots as one table.
+
+        Args:
+            dates: Snapshot dates (None: all)
+
+        Returns:
+            DataFrame [date, setup, rank, symbol, score, asof_ts_ms]
+        """
+        if dates is None:
+            dates = self.snapshots.list_snapshots()
+
+        asof = {}
+        for run_date in dates:
+            meta = self.snapshots.load_meta(run_date)
+            # Older snapshots have no as-of time: the start of the day never leaks
+            asof[run_date] = meta.get('asof_ts_ms') or date_to_ms(run_date)
+
+        frames = []
+        for section in SCORING_SECTIONS:
+            df = self.snapshots.load_sections(section, columns=['symbol', 'score'], dates=dates)
+            df['setup'] = SETUPS[section]
+            # Snapshot lists are stored ranked
+            df['rank'] = df.groupby('date').cumcount() + 1
+            frames.append(df)
+
+        signals = pd.concat(frames, ignore_index=True)
+        if self.top_n is not None:
+            signals = signals[signals['rank'] <= self.top_n]
+        signals['asof_ts_ms'] = signals['date'].map(asof).astype(np.int64)
+
+        return signals[['date', 'setup', 'rank', 'symbol', 'score', 'asof_ts_ms']].reset_index(drop=True)
+
+    def compute_returns(self, signals: pd.DataFrame, prices: PriceMatrix) -> pd.DataFrame:
+        """
+        Add entry price and forward return columns (`fwd_<k>d`) to the signals.
+
+        Args:
+            signals: Output of load_signals
+            prices: Daily close matrix
+
+        Returns:
+            New DataFrame with entry_price and one return column per horizon
+        """
+        rows = prices.entry_rows(signals['asof_ts_ms'].to_numpy())
+        cols = prices.columns(signals['symbol'])
+
+        trades = signals.copy()
+        trades['entry_price'] = prices.prices(rows, cols)
+        for k, returns in prices.forward_returns(rows, cols, self.horizons, self.slippage_bps).items():
+            trades[f'fwd_{k}d'] = returns
+
+        return trades
+
+    def _run_parallel(self, dates: Sequence[str], prices: PriceMatrix) -> pd.DataFrame:
+        """
+        Load and join snapshot shards in a process pool.
+
+        Shards are contiguous date ranges (a few per worker for balance);
+        results are concatenated in date order, so the output equals the
+        single-process run.
+        """
+        shards = [list(chunk) for chunk in np.array_split(np.array(dates), min(len(dates), self.workers * 4))]
+        logger.info(f"Backtest: {len(dates)} snapshots in {len(shards)} shards on {self.workers} workers")
+
+        with tempfile.TemporaryDirectory(prefix='backtest_prices_') as tmp_dir:
+            prices.save(tmp_dir)
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                frames = list(executor.map(
+                    _run_shard,
+                    [self.raw] * len(shards),
+                    shards,
+                    [tmp_dir] * len(shards),
+                ))
+
+        return pd.concat(frames, ignore_index=True)
+
+    def summarize(self, trades: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Aggregate metrics per setup and horizon, overall and per top-N bucket.
+
+        Args:
+            trades: Output of compute_returns
+
+        Returns:
+            Dict setup -> {'signals', 'horizons': {'<k>d': {... 'by_rank', 'rank_corr'}}}
+        """
+        summary = {}
+
+        for setup, group in trades.groupby('setup', sort=True):
+            threshold = self.hit_threshold(setup)
+            ranks = group['rank'].to_numpy()
+            horizons = {}
+
+            for k in self.horizons:
+                returns = group[f'fwd_{k}d'].to_numpy()
+                metrics = return_metrics(returns, threshold)
+                metrics['by_rank'] = {
+                    f'top_{n}': return_metrics(returns[ranks <= n], threshold)
+                    for n in self.rank_buckets
+                }
+                # Spearman correlation of rank (1 = best) and return
+                valid = ~np.isnan(returns)
+                if valid.sum() > 1:
+                    metrics['rank_corr'] = pd.Series(ranks[valid]).rank().corr(
+                        pd.Series(returns[valid]).rank()
+                    )
+                else:
+                    metrics['rank_corr'] = None
+                horizons[f'{k}d'] = metrics
+
+            summary[setup] = {'signals': len(group), 'horizons': horizons}
+
+        return _native(summary)
+
+    def run(self, dates: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Full backtest over the snapshot history.
+
+        Args:
+            dates: Snapshot dates (None: all)
+
+        Returns:
+            Result dict (meta + per-setup summary)
+        """
+        if dates is None:
+            dates = self.snapshots.list_snapshots()
+        prices = PriceMatrix.from_ohlcv(load_raw_ohlcv(self.raw_dir, timeframe='1d'))
+
+        if self.workers > 1 and len(dates) > 1:
+            trades = self._run_parallel(dates, prices)
+        else:
+            trades = self.compute_returns(self.load_signals(dates), prices)
+
+        snapshot_dates = sorted(trades['date'].unique())
+        logger.info(
+            f"Backtest: {len(trades)} signals from {len(snapshot_dates)} snapshots, "
+            f"prices {prices.closes.shape[0]} days x {len(prices.symbols)} symbols"
+        )
+
+        return {
+            'meta': {
+                'created_at': utc_now().isoformat().replace('+00:00', 'Z'),
+                **self.versions,
+                'snapshot_dates': [snapshot_dates[0], snapshot_dates[-1]] if snapshot_dates else [],
+                'snapshot_count': len(snapshot_dates),
+                'horizons': self.horizons,
+                'slippage_bps': self.slippage_bps,
+                'hit_threshold_pct': self.hit_threshold_pct,
+                'top_n': self.top_n,
+            },
+            'setups': self.summarize(trades),
+        }
+
+    def generate_markdown(self, result: Dict[str, Any]) -> str:
+        """Markdown summary table per setup."""
+        meta = result['meta']
+        lines = [
+            "# Backtest Summary",
+            "",
+            f"**Snapshots:** {meta['snapshot_count']} ({' → '.join(meta['snapshot_dates'])})  ",
+            f"**Slippage:** {meta['slippage_bps']} bps per leg  ",
+            f"**Spec/Config:** {meta['spec_version']} / {meta['config_version']}",
+            "",
+        ]
+
+        def pct(value):
+            return "-" if value is None else f"{value * 100:.2f}%"
+
+        for setup, data in result['setups'].items():
+            lines.append(f"## {setup.title()} ({data['signals']} signals)")
+            lines.append("")
+            lines.append("| Horizon | N | Hit rate | Mean | Median | P10 | P90 | Rank corr |")
+            lines.append("|---|---|---|---|---|---|---|---|")
+            for horizon, m in data['horizons'].items():
+                if m['count'] == 0:
+                    lines.append(f"| {horizon} | 0 | - | - | - | - | - | - |")
+                    continue
+                corr = "-" if m['rank_corr'] is None else f"{m['rank_corr']:.2f}"
+                lines.append(
+                    f"| {horizon} | {m['count']} | {pct(m['hit_rate'])} | {pct(m['mean'])} | "
+                    f"{pct(m['median'])} | {pct(m['p10'])} | {pct(m['p90'])} | {corr} |"
+                )
+            lines.append("")
+
+        return "\n".join(lines)
+
+    def save(self, result: Dict[str, Any]) -> Dict[str, Path]:
+        """
+        Write JSON + Markdown summaries to the output dir.
+
+        Returns:
+            Dict with 'json' and 'markdown' paths
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        dates = result['meta']['snapshot_dates']
+        stem = f"backtest_{dates[0]}_{dates[-1]}" if dates else "backtest_empty"
+
+        json_path = self.output_dir / f"{stem}.json"
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+
+        md_path = self.output_dir / f"{stem}.md"
+        with open(md_path, 'w', encoding='utf-8') as f:
+            f.write(self.generate_markdown(result))
+
+        logger.info(f"Backtest summary saved: {json_path}")
+        return {'json': json_path, 'markdown': md_path}
+
+
+def _run_shard(config: Dict[str, Any], dates: List[str], prices_dir: str) -> pd.DataFrame:
+    """Process-pool task: signals + forward returns for one date shard."""
+    runner = BacktestRunner(config)
+    return runner.compute_returns(runner.load_signals(dates), PriceMatrix.load(prices_dir))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from ..config import load_config
+
+    parser = argparse.ArgumentParser(description="Snapshot-driven backtest of the scanner setups")
+    parser.add_argument("--from", dest="date_from", help="First snapshot date (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", help="Last snapshot date (YYYY-MM-DD)")
+    parser.add_argument("--top-n", type=int, help="Only evaluate the top N per setup and day")
+    parser.add_argument("--workers", type=int, help="Worker processes (0: one per CPU)")
+    args = parser.parse_args(argv)
+
+    cfg = load_config()
+    if args.top_n is not None:
+        cfg.raw.setdefault('backtest', {})['top_n'] = args.top_n
+    if args.workers is not None:
+        cfg.raw.setdefault('backtest', {})['workers'] = args.workers
+
+    runner = BacktestRunner(cfg)
+    dates = [
+        d for d in runner.snapshots.list_snapshots()
+        if (args.date_from is None or d >= args.date_from) and (args.date_to is None or d <= args.date_to)
+    ]
+    result = runner.run(dates)
+    paths = runner.save(result)
+    print(runner.generate_markdown(result))
+    print(f"\nSaved: {paths['json']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,172 @@
+"""
+Stage DAG Executor
+==================
+
+Runs pipeline stages as a small dependency graph.
+
+Each Stage declares the named values it consumes (`inputs`) and produces
+(`outputs`). The executor starts every stage whose inputs are available on
+a thread pool, so independent stages overlap - e.g. the MEXC universe and
+ticker requests run alongside the CMC listings download, and the Markdown,
+JSON and Excel reports are written alongside the snapshot. Wall time drops
+to the critical path of the graph.
+
+Stage functions are called with their inputs as keyword arguments and
+return nothing (no outputs), the value (one output) or a tuple (several).
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One pipeline step with declared inputs and outputs."""
+
+    name: str
+    func: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+
+
+class DagExecutor:
+    """Runs stages concurrently as soon as their inputs are ready."""
+
+    def __init__(self, stages: Sequence[Stage], max_workers: int = 4, profiler=None):
+        """
+        Initialize DAG executor.
+
+        Args:
+            stages: Pipeline stages (any order)
+            max_workers: Stages running at the same time (1: serial, in declaration order)
+            profiler: Optional RunProfiler; each stage is recorded under its name
+
+        Raises:
+            ValueError: Duplicate stage or output names, or a dependency cycle
+        """
+        self.stages = list(stages)
+        self.max_workers = max(1, int(max_workers or 1))
+        self.profiler = profiler
+
+        names = [stage.name for stage in self.stages]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate stage names: {names}")
+
+        self.producers: Dict[str, str] = {}
+        for stage in self.stages:
+            for output in stage.outputs:
+                if output in self.producers:
+                    raise ValueError(f"Output '{output}' produced by both "
+                                     f"'{self.producers[output]}' and '{stage.name}'")
+                self.producers[output] = stage.name
+
+        self._check_acyclic()
+
+    def _check_acyclic(self) -> None:
+        produced = set()
+        remaining = list(self.stages)
+        while remaining:
+            ready = [s for s in remaining if all(i in produced or i not in self.producers for i in s.inputs)]
+            if not ready:
+                raise ValueError(f"Dependency cycle between stages: {[s.name for s in remaining]}")
+            for stage in ready:
+                produced.update(stage.outputs)
+                remaining.remove(stage)
+
+    def critical_path(self, durations: Dict[str, float]) -> List[str]:
+        """
+        Longest chain of dependent stages for measured stage durations.
+
+        Args:
+            durations: Stage name -> seconds
+
+        Returns:
+            Stage names along the critical path, first stage first
+        """
+        finish: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        pending = list(self.stages)
+        while pending:
+            for stage in list(pending):
+                parents = [self.producers[i] for i in stage.inputs if i in self.producers]
+                if any(parent not in finish for parent in parents):
+                    continue
+                parent = max(parents, key=lambda p: finish[p], default=None)
+                finish[stage.name] = (finish[parent] if parent else 0.0) + durations.get(stage.name, 0.0)
+                previous[stage.name] = parent
+                pending.remove(stage)
+
+        path = []
+        name = max(finish, key=finish.get) if finish else None
+        while name is not None:
+            path.append(name)
+            name = previous[name]
+        return path[::-1]
+
+    def _call(self, stage: Stage, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        scope = self.profiler.stage(stage.name) if self.profiler is not None else nullcontext()
+        with scope:
+            result = stage.func(**kwargs)
+
+        if not stage.outputs:
+            return {}
+        if len(stage.outputs) == 1:
+            return {stage.outputs[0]: result}
+        if not isinstance(result, tuple) or len(result) != len(stage.outputs):
+            raise ValueError(f"Stage '{stage.name}' must return {len(stage.outputs)} values")
+        return dict(zip(stage.outputs, result))
+
+    def run(self, initial: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Run all stages.
+
+        Args:
+            initial: Values available before any stage runs
+
+        Returns:
+            All values (initial plus every stage output)
+
+        Raises:
+            ValueError: A stage input that is neither initial nor produced
+            Exception: The first stage failure (no further stages are started)
+        """
+        values = dict(initial or {})
+        for stage in self.stages:
+            missing = [i for i in stage.inputs if i not in values and i not in self.producers]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' needs unknown inputs: {missing}")
+
+        pending = list(self.stages)
+        running = {}
+        error: Optional[BaseException] = None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stage") as pool:
+            while pending or running:
+                if error is None:
+                    for stage in [s for s in pending if all(i in values for i in s.inputs)]:
+                        if len(running) >= self.max_workers:
+                            break
+                        pending.remove(stage)
+                        kwargs = {name: values[name] for name in stage.inputs}
+                        running[pool.submit(self._call, stage, kwargs)] = stage
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    try:
+                        values.update(future.result())
+                    except Exception as e:
+                        logger.error(f"Stage '{stage.name}' failed: {e}")
+                        error = error or e
+
+        if error is not None:
+            raise error
+        return values
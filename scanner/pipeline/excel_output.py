@@ -13,6 +13,8 @@ from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.utils import get_column_letter
 
+from ..utils.artifact_writer import submit, atomic_path
+
 logger = logging.getLogger(__name__)
 
 
@@ -97,13 +99,23 @@ class ExcelReportGenerator:
             ['Trend', 'Pullback', 'Rebound', 'Volume']
         )
         
-        # Save
+        # Save (zip compression + I/O on the artifact writer; wb is not touched again)
         excel_path = self.reports_dir / f"{run_date}.xlsx"
-        wb.save(excel_path)
-        logger.info(f"Excel report saved: {excel_path}")
+        submit(excel_path.name, self._save_workbook, wb, excel_path)
         
         return excel_path
     
+    @staticmethod
+    def _save_workbook(wb: Workbook, excel_path: Path) -> None:
+        # Non-fatal like the rest of the Excel export: log, don't fail the run
+        try:
+            with atomic_path(excel_path) as tmp_path:
+                wb.save(tmp_path)
+        except Exception as e:
+            logger.error(f"Excel generation failed: {e}")
+            return
+        logger.info(f"Excel report saved: {excel_path}")
+    
     def _create_summary_sheet(
         self,
         wb: Workbook,
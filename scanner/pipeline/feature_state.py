@@ -0,0 +1,202 @@
+"""
+Streaming Feature State
+=======================
+
+Incremental twin of FeatureEngine._compute_timeframe_features for one
+symbol/timeframe. Holds EMA accumulators, fixed-size rolling windows and
+the running ATH, so a newly closed candle is absorbed in O(1) instead of
+re-running the full-window computation.
+
+Semantics:
+- Fed the same candles as a FeatureEngine window, features() returns the
+  identical dict (EMAs seeded at the first candle, ATH = max close seen).
+- Fed a longer history (e.g. the whole candle store), EMAs and the ATH
+  cover everything seen; returns, ATR, SMA and rolling highs/lows only
+  ever look at their fixed windows and are unaffected.
+
+Only closed candles may be applied: state cannot be rolled back.
+
+Used by the walk-forward replay (replay.py), which advances one state per
+symbol/timeframe through the stored history. Live runs keep computing
+features from the fetched window with FeatureEngine.
+"""
+
+import logging
+import math
+from collections import deque
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from ..utils.candle_store import CandleArrays
+from .features import FeatureEngine
+
+logger = logging.getLogger(__name__)
+
+
+class FeatureState:
+    """Incremental feature accumulator for one symbol/timeframe."""
+
+    MIN_CANDLES = 50      # same threshold as FeatureEngine
+    EMA_PERIODS = (20, 50)
+    WINDOW = 30           # longest rolling window (breakout_dist_30, base detection)
+    ATR_PERIOD = 14
+    VOLUME_SMA_PERIOD = 14
+
+    def __init__(self, timeframe: str):
+        self.timeframe = timeframe
+        self.count = 0
+        self.last_open_time: Optional[int] = None
+        self.ema: Dict[int, Optional[float]] = {p: None for p in self.EMA_PERIODS}
+        self.ath = math.nan
+        self.prev_close: Optional[float] = None
+
+        self.closes: deque = deque(maxlen=self.WINDOW)
+        self.highs: deque = deque(maxlen=self.WINDOW)
+        self.lows: deque = deque(maxlen=self.WINDOW)
+        self.volumes: deque = deque(maxlen=self.VOLUME_SMA_PERIOD)
+        self.true_ranges: deque = deque(maxlen=self.ATR_PERIOD)
+
+    # -------------------------------------------------------------------------
+    # Updates
+    # -------------------------------------------------------------------------
+    def update(self, open_time: int, high: float, low: float, close: float, volume: float) -> bool:
+        """
+        Apply one closed candle.
+
+        Returns:
+            False if the candle is not newer than the last applied one (ignored)
+        """
+        if self.last_open_time is not None and open_time <= self.last_open_time:
+            return False
+
+        high, low, close, volume = float(high), float(low), float(close), float(volume)
+
+        if self.prev_close is not None:
+            self.true_ranges.append(max(high - low, abs(high - self.prev_close), abs(low - self.prev_close)))
+
+        for period in self.EMA_PERIODS:
+            alpha = 2 / (period + 1)
+            prev = self.ema[period]
+            self.ema[period] = close if prev is None else alpha * close + (1 - alpha) * prev
+
+        if not math.isnan(close) and not (close <= self.ath):
+            self.ath = close
+
+        self.closes.append(close)
+        self.highs.append(high)
+        self.lows.append(low)
+        self.volumes.append(volume)
+
+        self.prev_close = close
+        self.last_open_time = int(open_time)
+        self.count += 1
+        return True
+
+    def advance(self, candles: CandleArrays, asof_ts_ms: Optional[int] = None) -> int:
+        """
+        Apply every candle newer than the state and closed as of `asof_ts_ms`.
+
+        Returns:
+            Number of candles applied
+        """
+        start = 0
+        if self.last_open_time is not None:
+            start = int(np.searchsorted(candles.open_time, self.last_open_time, side='right'))
+
+        stop = len(candles)
+        if asof_ts_ms is not None:
+            closed = np.flatnonzero(candles.close_time[start:] > asof_ts_ms)
+            if len(closed):
+                stop = start + int(closed[0])
+
+        return self.advance_to(candles, stop)
+
+    def advance_to(self, candles: CandleArrays, stop: int) -> int:
+        """
+        Apply candles[:stop] not yet seen (caller guarantees they are closed).
+
+        Lets a replay precompute the closed-candle boundary for many as-of
+        times at once (one searchsorted) instead of scanning per step.
+
+        Returns:
+            Number of candles applied
+        """
+        start = 0
+        if self.last_open_time is not None:
+            start = int(np.searchsorted(candles.open_time, self.last_open_time, side='right'))
+
+        applied = 0
+        for i in range(start, stop):
+            applied += self.update(
+                int(candles.open_time[i]), candles.high[i], candles.low[i],
+                candles.close[i], candles.volume[i]
+            )
+        return applied
+
+    @classmethod
+    def from_candles(
+        cls,
+        candles: CandleArrays,
+        timeframe: str,
+        asof_ts_ms: Optional[int] = None
+    ) -> "FeatureState":
+        """Bootstrap a state by replaying a candle history."""
+        state = cls(timeframe)
+        state.advance(candles, asof_ts_ms)
+        return state
+
+    # -------------------------------------------------------------------------
+    # Features
+    # -------------------------------------------------------------------------
+    def features(self) -> Dict[str, Any]:
+        """Current features (same keys and formulas as FeatureEngine)."""
+        if self.count < self.MIN_CANDLES:
+            return {}
+
+        closes = np.array(self.closes, dtype=float)
+        highs = np.array(self.highs, dtype=float)
+        lows = np.array(self.lows, dtype=float)
+        volumes = np.array(self.volumes, dtype=float)
+        last_close = closes[-1]
+
+        f = {}
+        f["close"], f["high"], f["low"], f["volume"] = map(float, (closes[-1], highs[-1], lows[-1], volumes[-1]))
+
+        # Returns & EMAs
+        for periods in (1, 3, 7):
+            f[f"r_{periods}"] = float(((last_close / closes[-periods-1]) - 1) * 100)
+        f["ema_20"] = self.ema[20]
+        f["ema_50"] = self.ema[50]
+
+        f["dist_ema20_pct"] = ((last_close / f["ema_20"]) - 1) * 100 if f.get("ema_20") else np.nan
+        f["dist_ema50_pct"] = ((last_close / f["ema_50"]) - 1) * 100 if f.get("ema_50") else np.nan
+
+        atr = np.mean(np.array(self.true_ranges))
+        f["atr_pct"] = float((atr / last_close) * 100) if last_close > 0 else np.nan
+        f["volume_sma_14"] = float(np.nanmean(volumes))
+        sma = f["volume_sma_14"]
+        f["volume_spike"] = np.nan if np.isnan(sma) or sma == 0 else float(volumes[-1] / sma)
+
+        # Trend structure
+        f["hh_20"] = bool(np.nanmax(highs[-5:]) > np.nanmax(highs[-20:-5]))
+        f["hl_20"] = bool(np.nanmin(lows[-5:]) > np.nanmin(lows[-20:-5]))
+
+        # Structural metrics
+        for lookback in (20, 30):
+            recent_high = np.nanmax(highs[-lookback:])
+            f[f"breakout_dist_{lookback}"] = float(((last_close / recent_high) - 1) * 100)
+        f["drawdown_from_ath"] = float(((last_close / self.ath) - 1) * 100)
+
+        # Base detection
+        if self.timeframe == "1d":
+            lookback = self.WINDOW
+            recent_low = np.nanmin(lows[-lookback//3:])
+            prior_low = np.nanmin(lows[-lookback:-lookback//3])
+            price_range = (np.nanmax(closes) - np.nanmin(closes)) / np.nanmean(closes) * 100
+            stability_score = max(0.0, 100.0 - price_range)
+            f["base_score"] = float(stability_score if recent_low >= prior_low else stability_score / 2)
+        else:
+            f["base_score"] = np.nan
+
+        return FeatureEngine._convert_to_native_types(f)
@@ -13,14 +13,18 @@ Features computed:
 """
 
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 import numpy as np
 
+from ..utils.candle_store import CandleArrays
+
 logger = logging.getLogger(__name__)
 
 class FeatureEngine:
     """Computes technical features from OHLCV data (v1.1 – integrity upgrade)."""
 
+    TIMEFRAMES = ("1d", "4h")
+
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         logger.info("Feature Engine v1.1 initialized")
@@ -30,65 +34,174 @@ class FeatureEngine:
     # -------------------------------------------------------------------------
     def compute_all(
         self,
-        ohlcv_data: Dict[str, Dict[str, List[List]]],
+        ohlcv_data: Dict[str, Dict[str, List[List] | CandleArrays]],
         asof_ts_ms: Optional[int] = None
     ) -> Dict[str, Dict[str, Any]]:
-        results = {}
+        """
+        Batch entry point: closed-only windows of equal length are stacked
+        into (n_symbols, n_candles) arrays and computed in one vectorized
+        pass per timeframe/length group. Output is identical to calling
+        compute_symbol() for every symbol.
+        """
         total = len(ohlcv_data)
         logger.info(f"Computing features for {total} symbols")
 
-        for i, (symbol, tf_data) in enumerate(ohlcv_data.items(), 1):
-            try:
-                logger.debug(f"[{i}/{total}] Computing features for {symbol}")
-                symbol_features = {}
+        # Pass 1: closed-only columns per symbol/timeframe, grouped by length
+        prepared: Dict[str, Dict[str, Any]] = {}
+        groups: Dict[tuple, List[tuple]] = {}
+        tf_features: Dict[tuple, Dict[str, Any]] = {}
 
+        for symbol, tf_data in ohlcv_data.items():
+            try:
                 last_closed_idx_map: Dict[str, Optional[int]] = {}
-
-                if "1d" in tf_data:
-                    idx_1d = self._get_last_closed_idx(tf_data["1d"], asof_ts_ms)
-                    last_closed_idx_map["1d"] = idx_1d
-                    symbol_features["1d"] = self._compute_timeframe_features(
-                        tf_data["1d"], "1d", symbol, last_closed_idx=idx_1d
-                    )
-
-                if "4h" in tf_data:
-                    idx_4h = self._get_last_closed_idx(tf_data["4h"], asof_ts_ms)
-                    last_closed_idx_map["4h"] = idx_4h
-                    symbol_features["4h"] = self._compute_timeframe_features(
-                        tf_data["4h"], "4h", symbol, last_closed_idx=idx_4h
-                    )
+                columns = {}
+                for tf in self.TIMEFRAMES:
+                    if tf not in tf_data:
+                        continue
+                    idx = self._get_last_closed_idx(tf_data[tf], asof_ts_ms)
+                    last_closed_idx_map[tf] = idx
+                    if not len(tf_data[tf]):
+                        tf_features[(symbol, tf)] = {}
+                    elif idx < 0:
+                        logger.warning(f"[{symbol}] no closed candles found for timeframe={tf}")
+                        tf_features[(symbol, tf)] = {}
+                    else:
+                        columns[tf] = self._closed_columns(tf_data[tf], idx)
 
                 last_update = None
-                if "1d" in tf_data:
-                    idx = last_closed_idx_map.get("1d")
-                    if isinstance(idx, int) and idx >= 0:
-                        last_update = int(tf_data["1d"][idx][0])
+                idx = last_closed_idx_map.get("1d")
+                if isinstance(idx, int) and idx >= 0:
+                    last_update = self._open_time_at(tf_data["1d"], idx)
+            except Exception as e:
+                logger.error(f"Failed to compute features for {symbol}: {e}")
+                continue
 
-                symbol_features["meta"] = {
+            for tf, cols in columns.items():
+                groups.setdefault((tf, len(cols[0])), []).append((symbol, cols))
+            prepared[symbol] = {
+                "timeframes": list(last_closed_idx_map),
+                "meta": {
                     "symbol": symbol,
                     "asof_ts_ms": asof_ts_ms,
                     "last_closed_idx": last_closed_idx_map,
                     "last_update": last_update,
-                }
-                results[symbol] = symbol_features
+                },
+            }
+
+        # Pass 2: one vectorized pass per (timeframe, window length) group
+        for (tf, n_candles), members in groups.items():
+            symbols = [symbol for symbol, _ in members]
+            if n_candles < 50:
+                for symbol in symbols:
+                    logger.warning(f"[{symbol}] insufficient candles ({n_candles}) for timeframe {tf}")
+                    tf_features[(symbol, tf)] = {}
+                continue
+
+            try:
+                stacked = [np.vstack([cols[k] for _, cols in members]) for k in range(4)]
+                rows = self._compute_batch_features(symbols, *stacked, timeframe=tf)
             except Exception as e:
-                logger.error(f"Failed to compute features for {symbol}: {e}")
+                logger.warning(f"Vectorized features failed for {tf}/{n_candles} group ({e}); "
+                               f"falling back to per-symbol computation")
+                rows = []
+                for symbol, cols in members:
+                    try:
+                        rows.append(self._features_from_columns(*cols, timeframe=tf, symbol=symbol))
+                    except Exception as sym_e:
+                        logger.error(f"Failed to compute features for {symbol}: {sym_e}")
+                        prepared.pop(symbol, None)
+                        rows.append({})
+
+            for symbol, row in zip(symbols, rows):
+                tf_features[(symbol, tf)] = row
+
+        # Pass 3: assemble in input order
+        results = {}
+        for symbol, info in prepared.items():
+            symbol_features = {tf: tf_features[(symbol, tf)] for tf in info["timeframes"]}
+            symbol_features["meta"] = info["meta"]
+            results[symbol] = symbol_features
+
         logger.info(f"Features computed for {len(results)}/{total} symbols")
         return results
+
+    def compute_stream(
+        self,
+        items: Iterable[Tuple[str, Dict[str, List[List] | CandleArrays]]],
+        asof_ts_ms: Optional[int] = None,
+        batch_size: int = 256
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Streaming entry point: consumes (symbol, tf_data) pairs as they
+        arrive and runs compute_all() per micro-batch of `batch_size`
+        symbols, so the vectorized path is kept while raw candles are
+        released after each batch. Output equals compute_all() on the
+        collected input (in arrival order).
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        batch: Dict[str, Dict[str, List[List] | CandleArrays]] = {}
+        batch_size = max(1, int(batch_size or 1))
+
+        for symbol, tf_data in items:
+            batch[symbol] = tf_data
+            if len(batch) >= batch_size:
+                results.update(self.compute_all(batch, asof_ts_ms=asof_ts_ms))
+                batch = {}
+        if batch:
+            results.update(self.compute_all(batch, asof_ts_ms=asof_ts_ms))
+
+        return results
+
+    def compute_symbol(
+        self,
+        symbol: str,
+        tf_data: Dict[str, List[List] | CandleArrays],
+        asof_ts_ms: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Scalar path: features for a single symbol (same output as compute_all)."""
+        symbol_features = {}
+
+        last_closed_idx_map: Dict[str, Optional[int]] = {}
+
+        for tf in self.TIMEFRAMES:
+            if tf in tf_data:
+                idx = self._get_last_closed_idx(tf_data[tf], asof_ts_ms)
+                last_closed_idx_map[tf] = idx
+                symbol_features[tf] = self._compute_timeframe_features(
+                    tf_data[tf], tf, symbol, last_closed_idx=idx
+                )
+
+        last_update = None
+        if "1d" in tf_data:
+            idx = last_closed_idx_map.get("1d")
+            if isinstance(idx, int) and idx >= 0:
+                last_update = self._open_time_at(tf_data["1d"], idx)
+
+        symbol_features["meta"] = {
+            "symbol": symbol,
+            "asof_ts_ms": asof_ts_ms,
+            "last_closed_idx": last_closed_idx_map,
+            "last_update": last_update,
+        }
+        return symbol_features
         
     # -------------------------------------------------------------------------
     # Helper Funktion
     # -------------------------------------------------------------------------    
-    def _get_last_closed_idx(self, klines: List[List], asof_ts_ms: Optional[int]) -> int:
+    def _get_last_closed_idx(self, klines: List[List] | CandleArrays, asof_ts_ms: Optional[int]) -> int:
         """
         Returns index of the last candle with closeTime <= asof_ts_ms.
         Expected kline format includes closeTime at index 6.
         """
-        if not klines:
+        if not len(klines):
             return -1
         if asof_ts_ms is None:
             return len(klines) - 1
 
+        if isinstance(klines, CandleArrays):
+            closed = np.flatnonzero(klines.close_time <= asof_ts_ms)
+            return int(closed[-1]) if len(closed) else -1
+
         for i in range(len(klines) - 1, -1, -1):
             k = klines[i]
             if len(k) < 7:
@@ -101,18 +214,48 @@ class FeatureEngine:
                 return i
 
         return -1
+
+    def _open_time_at(self, klines: List[List] | CandleArrays, idx: int) -> int:
+        if isinstance(klines, CandleArrays):
+            return int(klines.open_time[idx])
+        return int(klines[idx][0])
+
+    def _closed_columns(
+        self,
+        klines: List[List] | CandleArrays,
+        last_closed_idx: int
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns (closes, highs, lows, volumes) for the closed-only slice.
+        CandleArrays are sliced directly; kline lists are parsed.
+        """
+        if isinstance(klines, CandleArrays):
+            n = last_closed_idx + 1
+            return (
+                np.asarray(klines.close[:n], dtype=float),
+                np.asarray(klines.high[:n], dtype=float),
+                np.asarray(klines.low[:n], dtype=float),
+                np.asarray(klines.volume[:n], dtype=float),
+            )
+
+        klines = klines[: last_closed_idx + 1]
+        closes = np.array([k[4] for k in klines], dtype=float)
+        highs = np.array([k[2] for k in klines], dtype=float)
+        lows = np.array([k[3] for k in klines], dtype=float)
+        volumes = np.array([k[5] for k in klines], dtype=float)
+        return closes, highs, lows, volumes
         
     # -------------------------------------------------------------------------
     # Timeframe feature computation
     # -------------------------------------------------------------------------
     def _compute_timeframe_features(
         self,
-        klines: List[List],
+        klines: List[List] | CandleArrays,
         timeframe: str,
         symbol: str,
         last_closed_idx: Optional[int] = None
     ) -> Dict[str, Any]:
-        if not klines:
+        if not len(klines):
             return {}
 
         if last_closed_idx is None:
@@ -123,12 +266,18 @@ class FeatureEngine:
             return {}
 
         # closed-only slice
-        klines = klines[: last_closed_idx + 1]    
-        closes = np.array([k[4] for k in klines], dtype=float)
-        highs = np.array([k[2] for k in klines], dtype=float)
-        lows = np.array([k[3] for k in klines], dtype=float)
-        volumes = np.array([k[5] for k in klines], dtype=float)
+        closes, highs, lows, volumes = self._closed_columns(klines, last_closed_idx)
+        return self._features_from_columns(closes, highs, lows, volumes, timeframe, symbol)
 
+    def _features_from_columns(
+        self,
+        closes: np.ndarray,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        volumes: np.ndarray,
+        timeframe: str,
+        symbol: str
+    ) -> Dict[str, Any]:
         if len(closes) < 50:
             logger.warning(f"[{symbol}] insufficient candles ({len(closes)}) for timeframe {timeframe}")
             return {}
@@ -164,6 +313,88 @@ class FeatureEngine:
 
         return self._convert_to_native_types(f)
 
+    # -------------------------------------------------------------------------
+    # Vectorized (batch) computation
+    # -------------------------------------------------------------------------
+    def _compute_batch_features(
+        self,
+        symbols: List[str],
+        closes: np.ndarray,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        volumes: np.ndarray,
+        timeframe: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Vectorized twin of _features_from_columns for (n_symbols, n_candles)
+        arrays with n_candles >= 50. Every expression mirrors the scalar
+        calculation (same operations, same order) so results are identical.
+        """
+        with np.errstate(all="ignore"):
+            last_close = closes[:, -1]
+            f: Dict[str, np.ndarray] = {}
+            f["close"], f["high"], f["low"], f["volume"] = last_close, highs[:, -1], lows[:, -1], volumes[:, -1]
+
+            # Returns & EMAs
+            for periods in (1, 3, 7):
+                f[f"r_{periods}"] = ((last_close / closes[:, -periods-1]) - 1) * 100
+            for period in (20, 50):
+                alpha = 2 / (period + 1)
+                ema = closes[:, 0].copy()
+                for j in range(1, closes.shape[1]):
+                    ema = alpha * closes[:, j] + (1 - alpha) * ema
+                f[f"ema_{period}"] = ema
+
+            f["dist_ema20_pct"] = np.where(f["ema_20"] != 0, ((last_close / f["ema_20"]) - 1) * 100, np.nan)
+            f["dist_ema50_pct"] = np.where(f["ema_50"] != 0, ((last_close / f["ema_50"]) - 1) * 100, np.nan)
+
+            # ATR% (true range over the last 14 candles)
+            prev_close = closes[:, :-1]
+            tr = np.maximum(
+                np.maximum(highs[:, 1:] - lows[:, 1:], np.abs(highs[:, 1:] - prev_close)),
+                np.abs(lows[:, 1:] - prev_close)
+            )
+            atr = np.mean(tr[:, -14:], axis=1)
+            f["atr_pct"] = np.where(last_close > 0, (atr / last_close) * 100, np.nan)
+
+            sma = np.nanmean(volumes[:, -14:], axis=1)
+            f["volume_sma_14"] = sma
+            sma_valid = ~np.isnan(sma) & (sma != 0)
+            f["volume_spike"] = np.where(sma_valid, volumes[:, -1] / sma, np.nan)
+            for symbol in np.asarray(symbols, dtype=object)[~sma_valid]:
+                logger.warning(f"[{symbol}] volume_spike skipped (SMA invalid)")
+
+            # Trend structure
+            f["hh_20"] = np.nanmax(highs[:, -5:], axis=1) > np.nanmax(highs[:, -20:-5], axis=1)
+            f["hl_20"] = np.nanmin(lows[:, -5:], axis=1) > np.nanmin(lows[:, -20:-5], axis=1)
+
+            # Structural metrics
+            for lookback in (20, 30):
+                recent_high = np.nanmax(highs[:, -lookback:], axis=1)
+                f[f"breakout_dist_{lookback}"] = ((last_close / recent_high) - 1) * 100
+            f["drawdown_from_ath"] = ((last_close / np.nanmax(closes, axis=1)) - 1) * 100
+
+            # Base detection (1d only)
+            if timeframe == "1d":
+                lookback = 30
+                recent_low = np.nanmin(lows[:, -lookback//3:], axis=1)
+                prior_low = np.nanmin(lows[:, -lookback:-lookback//3], axis=1)
+                window = closes[:, -lookback:]
+                price_range = (np.nanmax(window, axis=1) - np.nanmin(window, axis=1)) / np.nanmean(window, axis=1) * 100
+                stability = 100.0 - price_range
+                stability = np.where(stability > 0.0, stability, 0.0)  # == max(0.0, x), NaN -> 0.0
+                f["base_score"] = np.where(recent_low >= prior_low, stability, stability / 2)
+            else:
+                f["base_score"] = np.full(len(symbols), np.nan)
+
+        rows = []
+        for i in range(len(symbols)):
+            row = {k: v[i] for k, v in f.items()}
+            row["hh_20"] = bool(row["hh_20"])
+            row["hl_20"] = bool(row["hl_20"])
+            rows.append(self._convert_to_native_types(row))
+        return rows
+
     # -------------------------------------------------------------------------
     # Calculation methods
     # -------------------------------------------------------------------------
@@ -249,7 +480,8 @@ class FeatureEngine:
     # -------------------------------------------------------------------------
     # Utility
     # -------------------------------------------------------------------------
-    def _convert_to_native_types(self, features: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def _convert_to_native_types(features: Dict[str, Any]) -> Dict[str, Any]:
         converted = {}
         for k, v in features.items():
             if v is None or (isinstance(v, float) and np.isnan(v)):
@@ -45,7 +45,8 @@ class UniverseFilters:
     
     def apply_all(
         self,
-        symbols_with_data: List[Dict[str, Any]]
+        symbols_with_data: List[Dict[str, Any]],
+        skip_mcap: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Apply all filters in sequence.
@@ -56,17 +57,23 @@ class UniverseFilters:
                 - base: str (e.g. "BTC")
                 - quote_volume_24h: float
                 - market_cap: float (from CMC mapping)
+            skip_mcap: Skip the market cap filter (market cap unknown, e.g. replay)
         
         Returns:
             Filtered list
         """
         original_count = len(symbols_with_data)
         logger.info(f"Starting filters with {original_count} symbols")
+        if not original_count:
+            return []
         
         # Step 1: Market Cap filter
-        filtered = self._filter_mcap(symbols_with_data)
-        logger.info(f"After MCAP filter: {len(filtered)} symbols "
-                   f"({len(filtered)/original_count*100:.1f}%)")
+        if skip_mcap:
+            filtered = list(symbols_with_data)
+        else:
+            filtered = self._filter_mcap(symbols_with_data)
+            logger.info(f"After MCAP filter: {len(filtered)} symbols "
+                       f"({len(filtered)/original_count*100:.1f}%)")
         
         # Step 2: Liquidity filter
         filtered = self._filter_liquidity(filtered)
@@ -7,15 +7,19 @@ Supports multiple timeframes with caching.
 """
 
 import logging
-from typing import List, Dict, Any, Optional
+import queue
+import threading
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from datetime import datetime
 import pandas as pd
 
+from scanner.utils.candle_store import CandleArrays
+
 # 🔹 Neu: zentralisierte Rohdaten-Speicherung
 try:
-    from scanner.utils.raw_collector import collect_raw_ohlcv
+    from scanner.utils.raw_collector import OHLCVSnapshotWriter
 except ImportError:
-    collect_raw_ohlcv = None
+    OHLCVSnapshotWriter = None
 
 logger = logging.getLogger(__name__)
 
@@ -23,15 +27,19 @@ logger = logging.getLogger(__name__)
 class OHLCVFetcher:
     """Fetches and caches OHLCV data for symbols."""
     
-    def __init__(self, mexc_client, config: Dict[str, Any]):
+    def __init__(self, mexc_client, config: Dict[str, Any], use_cache: bool = True, raw_snapshot: bool = True):
         """
         Initialize OHLCV fetcher.
         
         Args:
             mexc_client: Instance of MEXCClient
             config: Config dict with 'ohlcv' section OR ScannerConfig object
+            use_cache: Use today's cached klines (MEXCClient.get_candles)
+            raw_snapshot: Write fetched candles to the raw OHLCV dataset
         """
         self.mexc = mexc_client
+        self.use_cache = use_cache
+        self.raw_snapshot = raw_snapshot
         
         # Handle both dict and ScannerConfig object
         if hasattr(config, 'raw'):
@@ -39,14 +47,22 @@ class OHLCVFetcher:
             self.timeframes = config.raw.get('ohlcv', {}).get('timeframes', ['1d', '4h'])
             self.lookback = config.raw.get('ohlcv', {}).get('lookback', {'1d': 120, '4h': 180})
             self.min_candles = config.raw.get('ohlcv', {}).get('min_candles', {'1d': 60, '4h': 90})
+            self.max_workers = config.raw.get('ohlcv', {}).get('max_workers', 8)
+            self.stream_queue_size = config.raw.get('ohlcv', {}).get('stream_queue_size', 32)
         else:
             # It's a dict
             ohlcv_config = config.get('ohlcv', {})
             self.timeframes = ohlcv_config.get('timeframes', ['1d', '4h'])
             self.lookback = ohlcv_config.get('lookback', {'1d': 120, '4h': 180})
             self.min_candles = ohlcv_config.get('min_candles', {'1d': 60, '4h': 90})
+            self.max_workers = ohlcv_config.get('max_workers', 8)
+            self.stream_queue_size = ohlcv_config.get('stream_queue_size', 32)
+        
+        # Concurrency is bounded by the client's shared rate limiter, not here
+        self.max_workers = max(1, int(self.max_workers or 1))
         
-        logger.info(f"OHLCV Fetcher initialized: timeframes={self.timeframes}")
+        logger.info(f"OHLCV Fetcher initialized: timeframes={self.timeframes}, "
+                   f"max_workers={self.max_workers}")
     
     def fetch_all(
         self,
@@ -60,6 +76,7 @@ class OHLCVFetcher:
         
         Returns:
             Dict mapping symbol -> timeframe -> OHLCV data
+            (CandleArrays if the client provides get_candles, else kline lists)
             {
                 'BTCUSDT': {
                     '1d': [...],
@@ -68,63 +85,153 @@ class OHLCVFetcher:
                 ...
             }
         """
-        results = {}
+        fetched = dict(self.stream(shortlist))
+        # Shortlist order, independent of completion order
+        return {entry['symbol']: fetched[entry['symbol']] for entry in shortlist if entry['symbol'] in fetched}
+    
+    def stream(
+        self,
+        shortlist: List[Dict[str, Any]],
+        queue_size: Optional[int] = None
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Fetch OHLCV for all symbols, yielding each symbol as soon as all
+        its timeframes have arrived (completion order).
+        
+        Workers hand results over through a bounded queue: when the consumer
+        falls behind, workers block instead of piling up candles, so memory
+        stays flat however long the shortlist is. The raw OHLCV snapshot is
+        written incrementally on the way through.
+        
+        Args:
+            shortlist: List of symbol dicts with 'symbol' key
+            queue_size: Completed symbols buffered for the consumer
+                (default: ohlcv.stream_queue_size)
+        
+        Yields:
+            (symbol, timeframe -> OHLCV data) for symbols with complete data
+        """
         total = len(shortlist)
+        symbols = [sym_data['symbol'] for sym_data in shortlist]
         
-        logger.info(f"Fetching OHLCV for {total} symbols across {len(self.timeframes)} timeframes")
+        logger.info(f"Fetching OHLCV for {total} symbols across {len(self.timeframes)} timeframes "
+                   f"({self.max_workers} workers)")
         
-        for i, sym_data in enumerate(shortlist, 1):
-            symbol = sym_data['symbol']
-            
-            logger.info(f"[{i}/{total}] Fetching {symbol}...")
-            
-            symbol_ohlcv = {}
-            failed = False
-            
-            # Fetch each timeframe
-            for tf in self.timeframes:
-                limit = self.lookback.get(tf, 120)
-                
+        # 🔹 Rohdaten-Snapshot über zentralen Collector speichern (inkrementell)
+        writer = OHLCVSnapshotWriter() if OHLCVSnapshotWriter and self.raw_snapshot else None
+        
+        done: queue.Queue = queue.Queue(maxsize=queue_size or self.stream_queue_size)
+        tasks = iter(enumerate(symbols, 1))
+        tasks_lock = threading.Lock()
+        stop = threading.Event()
+        
+        # Threads only overlap network round-trips; the MEXC client's
+        # token bucket still paces the actual request rate.
+        def worker() -> None:
+            while not stop.is_set():
+                with tasks_lock:
+                    task = next(tasks, None)
+                if task is None:
+                    return
+                index, symbol = task
                 try:
-                    klines = self.mexc.get_klines(symbol, tf, limit=limit)
-                    
-                    if not klines:
-                        logger.warning(f"  {symbol} {tf}: No data returned")
-                        failed = True
-                        break
-                    
-                    # Check minimum candles
-                    min_required = self.min_candles.get(tf, 60)
-                    if len(klines) < min_required:
-                        logger.warning(f"  {symbol} {tf}: Insufficient data "
-                                     f"({len(klines)} < {min_required} candles)")
-                        failed = True
-                        break
-                    
-                    symbol_ohlcv[tf] = klines
-                    logger.info(f"  ✓ {symbol} {tf}: {len(klines)} candles")
-                    
+                    item = (symbol, self._fetch_symbol(symbol, index, total))
                 except Exception as e:
-                    logger.error(f"  ✗ {symbol} {tf}: {e}")
-                    failed = True
-                    break
-            
-            # Only include if all timeframes succeeded
-            if not failed:
-                results[symbol] = symbol_ohlcv
-            else:
-                logger.warning(f"  Skipping {symbol} (incomplete data)")
+                    logger.error(f"  ✗ {symbol}: {e}")
+                    item = (symbol, None)
+                while not stop.is_set():
+                    try:
+                        done.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+        
+        workers = [
+            threading.Thread(target=worker, name=f"ohlcv-{i}", daemon=True)
+            for i in range(min(self.max_workers, total))
+        ]
+        for thread in workers:
+            thread.start()
+        
+        complete = 0
+        try:
+            # Exactly one item per symbol (None: incomplete data)
+            for _ in range(total):
+                symbol, symbol_ohlcv = done.get()
+                if symbol_ohlcv is None:
+                    continue
+                complete += 1
+                if writer is not None:
+                    try:
+                        writer.add(symbol, symbol_ohlcv)
+                    except Exception as e:
+                        logger.warning(f"Could not collect raw OHLCV snapshot: {e}")
+                        writer = None
+                yield symbol, symbol_ohlcv
+        finally:
+            stop.set()
+            for thread in workers:
+                thread.join()
+            if writer is not None:
+                writer.close()
+        
+        logger.info(f"OHLCV fetch complete: {complete}/{total} symbols with complete data")
+    
+    def _fetch_symbol(
+        self,
+        symbol: str,
+        index: int,
+        total: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fetch all timeframes for one symbol.
+        
+        Returns:
+            Dict timeframe -> klines, or None if any timeframe is incomplete
+        """
+        logger.info(f"[{index}/{total}] Fetching {symbol}...")
         
-        logger.info(f"OHLCV fetch complete: {len(results)}/{total} symbols with complete data")
+        symbol_ohlcv = {}
+        failed = False
         
-        # 🔹 Rohdaten-Snapshot über zentralen Collector speichern
-        if collect_raw_ohlcv and results:
+        # Fetch each timeframe
+        for tf in self.timeframes:
+            limit = self.lookback.get(tf, 120)
+            
             try:
-                collect_raw_ohlcv(results)
+                if hasattr(self.mexc, 'get_candles'):
+                    # Column arrays: features slice them without re-parsing
+                    klines = self.mexc.get_candles(symbol, tf, limit=limit, use_cache=self.use_cache)
+                else:
+                    klines = self.mexc.get_klines(symbol, tf, limit=limit)
+                
+                if not klines:
+                    logger.warning(f"  {symbol} {tf}: No data returned")
+                    failed = True
+                    break
+                
+                # Check minimum candles
+                min_required = self.min_candles.get(tf, 60)
+                if len(klines) < min_required:
+                    logger.warning(f"  {symbol} {tf}: Insufficient data "
+                                 f"({len(klines)} < {min_required} candles)")
+                    failed = True
+                    break
+                
+                symbol_ohlcv[tf] = klines
+                logger.info(f"  ✓ {symbol} {tf}: {len(klines)} candles")
+                
             except Exception as e:
-                logger.warning(f"Could not collect raw OHLCV snapshot: {e}")
-
-        return results
+                logger.error(f"  ✗ {symbol} {tf}: {e}")
+                failed = True
+                break
+        
+        # Only include if all timeframes succeeded
+        if failed:
+            logger.warning(f"  Skipping {symbol} (incomplete data)")
+            return None
+        
+        return symbol_ohlcv
     
     def get_fetch_stats(
         self,
@@ -158,9 +265,13 @@ class OHLCVFetcher:
             first_symbol = list(ohlcv_data.keys())[0]
             if '1d' in ohlcv_data[first_symbol]:
                 candles = ohlcv_data[first_symbol]['1d']
-                if candles:
-                    oldest = datetime.fromtimestamp(candles[0][0] / 1000).strftime('%Y-%m-%d')
-                    newest = datetime.fromtimestamp(candles[-1][0] / 1000).strftime('%Y-%m-%d')
+                if len(candles):
+                    if isinstance(candles, CandleArrays):
+                        first_ts, last_ts = candles.open_time[0], candles.open_time[-1]
+                    else:
+                        first_ts, last_ts = candles[0][0], candles[-1][0]
+                    oldest = datetime.fromtimestamp(first_ts / 1000).strftime('%Y-%m-%d')
+                    newest = datetime.fromtimestamp(last_ts / 1000).strftime('%Y-%m-%d')
                     date_range = f"{oldest} to {newest}"
         
         return {
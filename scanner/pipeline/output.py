@@ -7,11 +7,13 @@ from scored results.
 """
 
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from datetime import datetime
 from pathlib import Path
 import json
 
+from ..utils.artifact_writer import submit, write_text
+
 logger = logging.getLogger(__name__)
 
 
@@ -244,52 +246,62 @@ class ReportGenerator:
         
         return report
     
-    def save_reports(
+    def save_markdown(
         self,
         reversal_results: List[Dict[str, Any]],
         breakout_results: List[Dict[str, Any]],
         pullback_results: List[Dict[str, Any]],
-        run_date: str,
-        metadata: Dict[str, Any] = None
-    ) -> Dict[str, Path]:
-        """
-        Generate and save Markdown, JSON, and Excel reports.
-        
-        Args:
-            reversal_results: Scored reversal setups
-            breakout_results: Scored breakout setups
-            pullback_results: Scored pullback setups
-            run_date: Date string (YYYY-MM-DD)
-            metadata: Optional metadata
-        
-        Returns:
-            Dict with paths: {'markdown': Path, 'json': Path, 'excel': Path}
-        """
-        logger.info(f"Generating reports for {run_date}")
-        
-        # Generate Markdown
+        run_date: str
+    ) -> Path:
+        """Generate and save the Markdown report."""
         md_content = self.generate_markdown_report(
             reversal_results, breakout_results, pullback_results, run_date
         )
         
-        # Generate JSON
+        md_path = self.reports_dir / f"{run_date}.md"
+        submit(md_path.name, self._write_report, md_path, md_content, "Markdown")
+        return md_path
+    
+    def save_json(
+        self,
+        reversal_results: List[Dict[str, Any]],
+        breakout_results: List[Dict[str, Any]],
+        pullback_results: List[Dict[str, Any]],
+        run_date: str,
+        metadata: Dict[str, Any] = None
+    ) -> Path:
+        """Generate and save the JSON report."""
         json_content = self.generate_json_report(
             reversal_results, breakout_results, pullback_results, run_date, metadata
         )
         
-        # Save Markdown
-        md_path = self.reports_dir / f"{run_date}.md"
-        with open(md_path, 'w', encoding='utf-8') as f:
-            f.write(md_content)
-        logger.info(f"Markdown report saved: {md_path}")
-        
-        # Save JSON
         json_path = self.reports_dir / f"{run_date}.json"
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(json_content, f, indent=2, ensure_ascii=False)
-        logger.info(f"JSON report saved: {json_path}")
+        # Serialized here: the writer gets an immutable string
+        text = json.dumps(json_content, indent=2, ensure_ascii=False)
+        submit(json_path.name, self._write_report, json_path, text, "JSON")
+        return json_path
+    
+    @staticmethod
+    def _write_report(path: Path, text: str, kind: str) -> None:
+        write_text(path, text)
+        logger.info(f"{kind} report saved: {path}")
+    
+    def save_excel(
+        self,
+        reversal_results: List[Dict[str, Any]],
+        breakout_results: List[Dict[str, Any]],
+        pullback_results: List[Dict[str, Any]],
+        run_date: str,
+        metadata: Dict[str, Any] = None
+    ) -> Optional[Path]:
+        """
+        Generate and save the Excel report.
         
-        # Generate Excel
+        Returns:
+            Path, or None if openpyxl is missing or generation failed
+            (the file itself may still be queued on the artifact writer;
+            a failed save is logged, not raised)
+        """
         try:
             from .excel_output import ExcelReportGenerator
             # Reconstruct config dict for Excel generator
@@ -300,22 +312,45 @@ class ReportGenerator:
                 }
             }
             excel_gen = ExcelReportGenerator(excel_config)
-            excel_path = excel_gen.generate_excel_report(
+            return excel_gen.generate_excel_report(
                 reversal_results, breakout_results, pullback_results, run_date, metadata
             )
-            logger.info(f"Excel report saved: {excel_path}")
         except ImportError:
             logger.warning("openpyxl not installed - Excel export skipped")
-            excel_path = None
         except Exception as e:
             logger.error(f"Excel generation failed: {e}")
-            excel_path = None
+        return None
+    
+    def save_reports(
+        self,
+        reversal_results: List[Dict[str, Any]],
+        breakout_results: List[Dict[str, Any]],
+        pullback_results: List[Dict[str, Any]],
+        run_date: str,
+        metadata: Dict[str, Any] = None
+    ) -> Dict[str, Path]:
+        """
+        Generate and save Markdown, JSON, and Excel reports.
+        
+        Args:
+            reversal_results: Scored reversal setups
+            breakout_results: Scored breakout setups
+            pullback_results: Scored pullback setups
+            run_date: Date string (YYYY-MM-DD)
+            metadata: Optional metadata
+        
+        Returns:
+            Dict with paths: {'markdown': Path, 'json': Path, 'excel': Path}
+        """
+        logger.info(f"Generating reports for {run_date}")
+        results = (reversal_results, breakout_results, pullback_results, run_date)
         
         result = {
-            'markdown': md_path,
-            'json': json_path
+            'markdown': self.save_markdown(*results),
+            'json': self.save_json(*results, metadata)
         }
         
+        excel_path = self.save_excel(*results, metadata)
         if excel_path:
             result['excel'] = excel_path
         
@@ -0,0 +1,246 @@
+"""
+Walk-Forward Replay
+===================
+
+Point-in-time pipeline replay for `run_mode: backtest`.
+
+Candle history comes from the raw OHLCV snapshots. For every replay day
+(as-of = date + `replay.asof_hour_utc`) each symbol/timeframe FeatureState
+is advanced by just the candles that closed since the previous as-of time,
+so features are never recomputed from full windows and no candle closed
+after the as-of time is ever seen. Shortlist, scoring and reasons then run
+exactly as in the live pipeline and one snapshot per day is written to
+`replay.snapshots_dir`, ready for the backtest runner.
+
+Differences to the live run (no historical API data available):
+- universe = every symbol in the raw snapshots, market cap unknown
+  (only the market cap filter is skipped; liquidity and exclusion filters
+  apply as in the live run), coin name 'Unknown'
+- 24h volume = quote volume of the last closed 1d candle
+  (close * volume for old snapshots without quote_volume)
+- price = last closed 4h close (1d close if no 4h history)
+- symbols whose last closed 1d candle is more than a day old at the
+  as-of time (delisted, or no longer recorded in the raw snapshots) are
+  left out instead of carrying their frozen state forward
+- EMAs and the ATH cover the whole replayed history, not a fetch window
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from ..utils.candle_store import CandleArrays
+from ..utils.raw_collector import load_candle_history
+from ..utils.time_utils import INTERVAL_MS
+from .feature_state import FeatureState
+from .filters import UniverseFilters
+from .shortlist import ShortlistSelector
+from .universe import UniverseTable, enrich_features
+from .scoring.reversal import score_reversals, attach_reversal_reasons
+from .scoring.breakout import score_breakouts, attach_breakout_reasons
+from .scoring.pullback import score_pullbacks, attach_pullback_reasons
+from .snapshot import SnapshotManager
+
+logger = logging.getLogger(__name__)
+
+TIMEFRAMES = ("1d", "4h")
+
+# Age of the last closed 1d candle beyond which a symbol counts as no longer traded/recorded
+STALE_AFTER_MS = INTERVAL_MS["1d"]
+
+
+class ReplayRunner:
+    """Replays the pipeline day by day from stored candle history."""
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize replay runner.
+
+        Args:
+            config: Config dict with optional 'replay' section
+        """
+        # Handle both dict and ScannerConfig object
+        if hasattr(config, 'raw'):
+            raw = config.raw
+        else:
+            raw = config
+        replay_config = raw.get('replay', {})
+
+        self.raw = raw
+        self.raw_dir = replay_config.get('raw_dir') or raw.get('backtest', {}).get('raw_dir')
+        self.asof_hour = replay_config.get('asof_hour_utc', 4)
+        self.start = replay_config.get('start')
+        self.end = replay_config.get('end')
+        self.min_history = raw.get('universe_filters', {}).get('history', {}).get('min_history_days_1d', 60)
+        self.top_n = raw.get('output', {}).get('top_n_per_setup', 10)
+        self.full_ranking = raw.get('snapshots', {}).get('full_ranking', True)
+
+        self.snapshots = SnapshotManager({
+            'snapshots': {
+                **raw.get('snapshots', {}),
+                'runtime_dir': replay_config.get('snapshots_dir', 'snapshots/replay'),
+                'format': 'parquet',
+            }
+        })
+        self.filters = UniverseFilters(raw)
+        self.selector = ShortlistSelector(raw)
+
+        logger.info(f"Replay Runner initialized: as-of {self.asof_hour:02d}:00 UTC, "
+                    f"snapshots -> {self.snapshots.snapshots_dir}")
+
+    def asof_times(self, history: Dict[str, CandleArrays]) -> List[Tuple[str, int]]:
+        """
+        Replay days and their as-of timestamps.
+
+        Defaults to the first day with `min_history_days_1d` closed daily
+        candles for any symbol through the day after the last stored candle.
+
+        Returns:
+            List of (run_date, asof_ts_ms), oldest first
+        """
+        if not history:
+            return []
+
+        ready = [int(c.close_time[self.min_history - 1]) for c in history.values() if len(c) >= self.min_history]
+        if not ready and self.start is None:
+            return []
+
+        first = datetime.fromtimestamp((min(ready) + 1) / 1000, tz=timezone.utc).date() if ready else None
+        last = datetime.fromtimestamp((max(int(c.close_time[-1]) for c in history.values()) + 1) / 1000,
+                                      tz=timezone.utc).date()
+        start = datetime.strptime(self.start, '%Y-%m-%d').date() if self.start else first
+        end = datetime.strptime(self.end, '%Y-%m-%d').date() if self.end else last
+
+        times = []
+        day = start
+        while day <= end:
+            asof = datetime(day.year, day.month, day.day, self.asof_hour, tzinfo=timezone.utc)
+            times.append((day.isoformat(), int(asof.timestamp() * 1000)))
+            day += timedelta(days=1)
+
+        logger.info(f"Replay: {len(times)} days ({start} -> {end})")
+        return times
+
+    def run(self) -> List[Path]:
+        """
+        Replay all days and write one snapshot per day.
+
+        Returns:
+            Snapshot paths, oldest first
+        """
+        history = {tf: load_candle_history(self.raw_dir, tf) for tf in TIMEFRAMES}
+        times = self.asof_times(history['1d'])
+        if not times:
+            logger.warning("Replay: no candle history with enough closed daily candles")
+            return []
+
+        asofs = np.array([asof for _, asof in times], dtype=np.int64)
+        symbols = sorted(history['1d'])
+        states = {(symbol, tf): FeatureState(tf) for symbol in symbols for tf in TIMEFRAMES}
+        # Closed-candle count per symbol/timeframe for every as-of time, in one pass
+        stops = {
+            (symbol, tf): np.searchsorted(history[tf][symbol].close_time, asofs, side='right')
+            for symbol in symbols for tf in TIMEFRAMES if symbol in history[tf]
+        }
+
+        paths = []
+        for i, (run_date, asof_ts_ms) in enumerate(times):
+            for key, stop in stops.items():
+                states[key].advance_to(history[key[1]][key[0]], int(stop[i]))
+
+            path = self._replay_day(run_date, asof_ts_ms, symbols, history, states, stops, i)
+            if path is not None:
+                paths.append(path)
+
+        logger.info(f"Replay complete: {len(paths)} snapshots in {self.snapshots.snapshots_dir}")
+        return paths
+
+    def _replay_day(
+        self,
+        run_date: str,
+        asof_ts_ms: int,
+        symbols: List[str],
+        history: Dict[str, Dict[str, CandleArrays]],
+        states: Dict[Tuple[str, str], FeatureState],
+        stops: Dict[Tuple[str, str], np.ndarray],
+        i: int
+    ) -> Optional[Path]:
+        """Shortlist, features, scoring and snapshot for one as-of time."""
+        rows = {}
+        for symbol in symbols:
+            daily = states[(symbol, '1d')]
+            if daily.count < self.min_history:
+                continue
+
+            last_1d = int(stops[(symbol, '1d')][i]) - 1
+            if asof_ts_ms - int(history['1d'][symbol].close_time[last_1d]) > STALE_AFTER_MS:
+                continue
+            price = daily.prev_close
+            if (symbol, '4h') in stops and states[(symbol, '4h')].count:
+                price = states[(symbol, '4h')].prev_close
+
+            rows[symbol] = {
+                'symbol': symbol,
+                'base': symbol.replace('USDT', ''),
+                'price_usdt': price,
+                'quote_volume_24h': float(history['1d'][symbol].quote_volume[last_1d]),
+                'market_cap': None,
+                'coin_name': 'Unknown',
+                'mapped': True,
+            }
+
+        if not rows:
+            return None
+
+        table = UniverseTable(rows)
+        filtered = self.filters.apply_all(table.filter_input(), skip_mcap=True)
+        shortlist = self.selector.select(filtered)
+        table.set_shortlist(shortlist)
+
+        features = {}
+        for entry in shortlist:
+            symbol = entry['symbol']
+            symbol_features = {tf: states[(symbol, tf)].features() for tf in TIMEFRAMES if (symbol, tf) in stops}
+            symbol_features['meta'] = {
+                'symbol': symbol,
+                'asof_ts_ms': asof_ts_ms,
+                'last_closed_idx': {tf: states[(symbol, tf)].count - 1 for tf in TIMEFRAMES if (symbol, tf) in stops},
+                'last_update': states[(symbol, '1d')].last_open_time,
+            }
+            features[symbol] = symbol_features
+        enrich_features(features, table)
+
+        volume_map = table.volume_map()
+        rank_limit = None if self.full_ranking else self.top_n
+
+        reversal_results = score_reversals(features, volume_map, self.raw, with_reasons=False, top_n=rank_limit)
+        attach_reversal_reasons(reversal_results, features, self.raw, limit=self.top_n)
+        breakout_results = score_breakouts(features, volume_map, self.raw, with_reasons=False, top_n=rank_limit)
+        attach_breakout_reasons(breakout_results, features, self.raw, limit=self.top_n)
+        pullback_results = score_pullbacks(features, volume_map, self.raw, with_reasons=False, top_n=rank_limit)
+        attach_pullback_reasons(pullback_results, features, self.raw, limit=self.top_n)
+
+        return self.snapshots.create_snapshot(
+            run_date=run_date,
+            universe=table.snapshot_rows(),
+            filtered=filtered,
+            shortlist=shortlist,
+            features=features,
+            reversal_scores=reversal_results,
+            breakout_scores=breakout_results,
+            pullback_scores=pullback_results,
+            metadata={
+                'mode': 'backtest',
+                'source': 'replay',
+                'asof_ts_ms': asof_ts_ms,
+                'asof_iso': datetime.fromtimestamp(asof_ts_ms / 1000, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            }
+        )
+
+
+def run_replay(config: Dict[str, Any]) -> List[Path]:
+    """Entry point for run_mode 'backtest'."""
+    return ReplayRunner(config).run()
@@ -18,6 +18,10 @@ Penalties:
 import logging
 from typing import Dict, Any, Optional, List
 
+import numpy as np
+
+from .table import FeatureTable, ScoreTable, truthy, build_results, attach_reasons
+
 logger = logging.getLogger(__name__)
 
 
@@ -53,6 +57,13 @@ class BreakoutScorer:
             'momentum': 0.15
         }
         
+        # Optional overrides, e.g. {'volume': 0.4} (used by parameter sweeps)
+        overrides = scoring_config.get('component_weights', {})
+        unknown = set(overrides) - set(self.weights)
+        if unknown:
+            raise ValueError(f"Unknown breakout component weights: {sorted(unknown)}")
+        self.weights.update(overrides)
+        
         logger.info("Breakout Scorer initialized")
     
     def score(
@@ -128,6 +139,92 @@ class BreakoutScorer:
             'reasons': reasons
         }
     
+    def score_table(self, table: FeatureTable) -> ScoreTable:
+        """
+        Score all symbols of a feature table at once.
+
+        Every expression mirrors the scalar component methods (same
+        operations, same order), so results are identical to score().
+        Rows the scalar path would reject (None where a number is
+        compared) are marked invalid.
+        """
+        dist, dist_none = table.column('1d', 'breakout_dist_20', np.nan)
+        vol_1d, vol_1d_none = table.column('1d', 'volume_spike', 1.0)
+        vol_4h, vol_4h_none = table.column('4h', 'volume_spike', 1.0)
+        dist_ema20, dist_ema20_none = table.column('1d', 'dist_ema20_pct', None)
+        dist_ema50, dist_ema50_none = table.column('1d', 'dist_ema50_pct', None)
+        r7, r7_none = table.column('1d', 'r_7', 0)
+        penalty_dist, penalty_dist_none = table.column('1d', 'breakout_dist_20', 0)
+
+        invalid = table.invalid | dist_none | vol_1d_none | vol_4h_none | r7_none | penalty_dist_none
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # _score_breakout
+            decay = 90 - (dist - 1) * 10
+            breakout = np.select(
+                [
+                    np.isnan(dist),
+                    dist <= -5,
+                    (-5 < dist) & (dist < 0),
+                    (0 <= dist) & (dist <= 1),
+                    (1 < dist) & (dist <= 3),
+                ],
+                [
+                    np.nan,
+                    0.0,
+                    70 * (1 + (dist / 5)),
+                    70 + (30 * (dist / 1)),
+                    np.where(70 > decay, 70.0, decay),  # == max(decay, 70)
+                ],
+                default=60.0
+            )
+
+            # _score_volume
+            max_spike = np.where(vol_4h > vol_1d, vol_4h, vol_1d)  # == max(vol_1d, vol_4h)
+            ratio = (max_spike - self.min_volume_spike) / (self.ideal_volume_spike - self.min_volume_spike)
+            volume = np.select(
+                [max_spike < self.min_volume_spike, max_spike >= self.ideal_volume_spike],
+                [0.0, 100.0],
+                default=ratio * 100.0
+            )
+
+            # _score_trend
+            above_ema20 = truthy(dist_ema20, dist_ema20_none) & (dist_ema20 > 0)
+            above_ema50 = truthy(dist_ema50, dist_ema50_none) & (dist_ema50 > 0)
+            trend = (
+                0.0
+                + np.where(above_ema20, 40.0, 0.0) + np.where(above_ema20 & (dist_ema20 > 5), 10.0, 0.0)
+                + np.where(above_ema50, 40.0, 0.0) + np.where(above_ema50 & (dist_ema50 > 5), 10.0, 0.0)
+            )
+            trend = np.where(100.0 < trend, 100.0, trend)
+
+            # _score_momentum
+            momentum = np.select([r7 <= 0, r7 >= 20], [0.0, 100.0], default=(r7 / 20) * 100.0)
+
+            raw_score = (
+                breakout * self.weights['breakout'] +
+                volume * self.weights['volume'] +
+                trend * self.weights['trend'] +
+                momentum * self.weights['momentum']
+            )
+
+            # Penalties (multiplicative, in scalar order)
+            overextended = penalty_dist > self.max_breakout_pct
+            low_liquidity = table.quote_volume < 500_000
+            final_score = raw_score * np.where(overextended, 0.6, 1.0)
+            final_score = final_score * np.where(low_liquidity, 0.8, 1.0)
+
+        return ScoreTable(
+            symbols=table.symbols,
+            score=final_score,
+            components={'breakout': breakout, 'volume': volume, 'trend': trend, 'momentum': momentum},
+            penalties=[
+                ('overextension', 0.6, 'overextended', overextended),
+                ('low_liquidity', 0.8, 'low_liquidity', low_liquidity),
+            ],
+            valid=~invalid
+        )
+
     def _score_breakout(self, f1d: Dict[str, Any]) -> float:
         """
         Scales breakout distance (-5% … +3%) into a 0–100 score.
@@ -137,7 +234,6 @@ class BreakoutScorer:
         - 0 … +1%: breakout confirmation
         - > +2%: overextended (score decays)
         """
-        import numpy as np
         dist = f1d.get('breakout_dist_20', np.nan)
         if np.isnan(dist):
             return np.nan
@@ -223,6 +319,21 @@ class BreakoutScorer:
         # Linear scale 0-20%
         return (r7 / 20) * 100.0
     
+    def reasons(self, features: Dict[str, Any], flags: List[str]) -> List[str]:
+        """
+        Generate reasons for an already scored symbol.
+
+        Components are recomputed from the features (cheap for a handful of
+        published rows) so thresholds see the unrounded values, as in score().
+        """
+        f1d = features.get('1d', {})
+        f4h = features.get('4h', {})
+        return self._generate_reasons(
+            self._score_breakout(f1d), self._score_volume(f1d, f4h),
+            self._score_trend(f1d), self._score_momentum(f1d),
+            f1d, f4h, flags
+        )
+    
     def _generate_reasons(
         self,
         breakout_score: float,
@@ -277,7 +388,9 @@ class BreakoutScorer:
 def score_breakouts(
     features_data: Dict[str, Dict[str, Any]],
     volumes: Dict[str, float],
-    config: Dict[str, Any]
+    config: Dict[str, Any],
+    with_reasons: bool = True,
+    top_n: Optional[int] = None
 ) -> List[Dict[str, Any]]:
     """
     Score all symbols for breakout setups and return ranked list.
@@ -286,41 +399,42 @@ def score_breakouts(
         features_data: Dict mapping symbol -> features
         volumes: Dict mapping symbol -> 24h volume
         config: Config dict
+        with_reasons: Generate 'reasons' for every row (False: numeric results
+            only; use attach_breakout_reasons for the rows that get published)
+        top_n: Return only the best `top_n` symbols (None: full ranking)
     
     Returns:
-        List of scored symbols, sorted by score (descending)
+        List of scored symbols, sorted by score (descending, ties by symbol)
     """
     scorer = BreakoutScorer(config)
-    results = []
     
     logger.info(f"Scoring {len(features_data)} symbols for breakout setups")
     
-    for symbol, features in features_data.items():
-        volume = volumes.get(symbol, 0)
-        
-        try:
-            score_result = scorer.score(symbol, features, volume)
-            
-            results.append({
-                'symbol': symbol,
-                'price_usdt': features.get('price_usdt'),
-                'coin_name': features.get('coin_name'),
-                'market_cap': features.get('market_cap'),
-                'quote_volume_24h': features.get('quote_volume_24h'),
-                'score': score_result['score'],
-                'components': score_result['components'],
-                'penalties': score_result['penalties'],
-                'flags': score_result['flags'],
-                'reasons': score_result['reasons']
-            })
-            
-        except Exception as e:
-            logger.error(f"Failed to score {symbol}: {e}")
-            continue
-    
-    # Sort by score (descending)
-    results.sort(key=lambda x: x['score'], reverse=True)
+    table = FeatureTable.from_features(features_data, volumes)
+    generate_reasons = scorer._generate_reasons if with_reasons else None
+    results = build_results(scorer.score_table(table), features_data, generate_reasons, top_n)
     
     logger.info(f"Breakout scoring complete: {len(results)} symbols scored")
     
     return results
+
+
+def attach_breakout_reasons(
+    results: List[Dict[str, Any]],
+    features_data: Dict[str, Dict[str, Any]],
+    config: Dict[str, Any],
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Materialize 'reasons' for the top `limit` rows of score_breakouts(with_reasons=False).
+    
+    Args:
+        results: Ranked breakout results
+        features_data: Dict mapping symbol -> features
+        config: Config dict
+        limit: Rows to complete (None: all)
+    
+    Returns:
+        The same list, updated in place
+    """
+    return attach_reasons(results, features_data, BreakoutScorer(config).reasons, limit)
@@ -18,6 +18,10 @@ Penalties:
 import logging
 from typing import Dict, Any, Optional, List
 
+import numpy as np
+
+from .table import FeatureTable, ScoreTable, truthy, build_results, attach_reasons
+
 logger = logging.getLogger(__name__)
 
 
@@ -53,6 +57,13 @@ class PullbackScorer:
             'volume': 0.20
         }
         
+        # Optional overrides, e.g. {'volume': 0.4} (used by parameter sweeps)
+        overrides = scoring_config.get('component_weights', {})
+        unknown = set(overrides) - set(self.weights)
+        if unknown:
+            raise ValueError(f"Unknown pullback component weights: {sorted(unknown)}")
+        self.weights.update(overrides)
+        
         logger.info("Pullback Scorer initialized")
     
     def score(
@@ -128,6 +139,97 @@ class PullbackScorer:
             'reasons': reasons
         }
     
+    def score_table(self, table: FeatureTable) -> ScoreTable:
+        """
+        Score all symbols of a feature table at once.
+
+        Every expression mirrors the scalar component methods (same
+        operations, same order), so results are identical to score().
+        Rows the scalar path would reject (None where a number is
+        compared) are marked invalid.
+        """
+        dist_ema50, dist_ema50_none = table.column('1d', 'dist_ema50_pct', None)
+        hh_20, hh_20_none = table.column('1d', 'hh_20', None)
+        depth_ema20, depth_ema20_none = table.column('1d', 'dist_ema20_pct', 100)
+        depth_ema50, depth_ema50_none = table.column('1d', 'dist_ema50_pct', 100)
+        r3, r3_none = table.column('1d', 'r_3', 0)
+        r3_4h, r3_4h_none = table.column('4h', 'r_3', 0)
+        vol_1d, vol_1d_none = table.column('1d', 'volume_spike', 1.0)
+        vol_4h, vol_4h_none = table.column('4h', 'volume_spike', 1.0)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # _score_trend
+            no_trend = dist_ema50_none | (dist_ema50 == 0) | (dist_ema50 < 0)
+            trend = 0.0 + np.select(
+                [dist_ema50 >= 15, dist_ema50 >= 10, dist_ema50 >= self.min_trend_strength],
+                [60.0, 50.0, 40.0],
+                default=20.0
+            )
+            trend = trend + np.where(truthy(hh_20, hh_20_none), 40.0, 0.0)
+            trend = np.where(no_trend, 0.0, np.where(100.0 < trend, 100.0, trend))
+
+            # _score_pullback (checks run in order; a None compared first raises)
+            near_ema20 = (-2 <= depth_ema20) & (depth_ema20 <= 2)
+            near_ema50 = (-2 <= depth_ema50) & (depth_ema50 <= 2)
+            pullback = np.select(
+                [
+                    near_ema20,
+                    near_ema50,
+                    (depth_ema20 < 0) & (depth_ema50 > 0),
+                    depth_ema20 > 5,
+                    depth_ema50 < -5,
+                ],
+                [100.0, 80.0, 60.0, 20.0, 10.0],
+                default=40.0
+            )
+
+            # _score_rebound
+            rebound = (
+                0.0
+                + np.select([r3 >= 10, r3 >= self.min_rebound, r3 > 0], [50.0, 30.0, 10.0], default=0.0)
+                + np.select([r3_4h >= 5, r3_4h >= 2, r3_4h > 0], [50.0, 30.0, 10.0], default=0.0)
+            )
+            rebound = np.where(100.0 < rebound, 100.0, rebound)
+
+            # _score_volume
+            max_spike = np.where(vol_4h > vol_1d, vol_4h, vol_1d)  # == max(vol_1d, vol_4h)
+            ratio = (max_spike - self.min_volume_spike) / (2.0 - self.min_volume_spike)
+            volume = np.select(
+                [max_spike < self.min_volume_spike, max_spike >= 2.5, max_spike >= 2.0],
+                [0.0, 100.0, 80.0],
+                default=ratio * 70.0
+            )
+
+            raw_score = (
+                trend * self.weights['trend'] +
+                pullback * self.weights['pullback'] +
+                rebound * self.weights['rebound'] +
+                volume * self.weights['volume']
+            )
+
+            # Penalties (multiplicative, in scalar order)
+            broken_trend = truthy(dist_ema50, dist_ema50_none) & (dist_ema50 < 0)
+            low_liquidity = table.quote_volume < 500_000
+            final_score = raw_score * np.where(broken_trend, 0.5, 1.0)
+            final_score = final_score * np.where(low_liquidity, 0.8, 1.0)
+
+        invalid = (
+            table.invalid
+            | depth_ema20_none | (~near_ema20 & depth_ema50_none)
+            | r3_none | r3_4h_none | vol_1d_none | vol_4h_none
+        )
+
+        return ScoreTable(
+            symbols=table.symbols,
+            score=final_score,
+            components={'trend': trend, 'pullback': pullback, 'rebound': rebound, 'volume': volume},
+            penalties=[
+                ('broken_trend', 0.5, 'broken_trend', broken_trend),
+                ('low_liquidity', 0.8, 'low_liquidity', low_liquidity),
+            ],
+            valid=~invalid
+        )
+
     def _score_trend(self, f1d: Dict[str, Any]) -> float:
         """
         Score trend strength (0-100).
@@ -245,6 +347,21 @@ class PullbackScorer:
         ratio = (max_spike - self.min_volume_spike) / (2.0 - self.min_volume_spike)
         return ratio * 70.0
     
+    def reasons(self, features: Dict[str, Any], flags: List[str]) -> List[str]:
+        """
+        Generate reasons for an already scored symbol.
+
+        Components are recomputed from the features (cheap for a handful of
+        published rows) so thresholds see the unrounded values, as in score().
+        """
+        f1d = features.get('1d', {})
+        f4h = features.get('4h', {})
+        return self._generate_reasons(
+            self._score_trend(f1d), self._score_pullback(f1d),
+            self._score_rebound(f1d, f4h), self._score_volume(f1d, f4h),
+            f1d, f4h, flags
+        )
+    
     def _generate_reasons(
         self,
         trend_score: float,
@@ -305,7 +422,9 @@ class PullbackScorer:
 def score_pullbacks(
     features_data: Dict[str, Dict[str, Any]],
     volumes: Dict[str, float],
-    config: Dict[str, Any]
+    config: Dict[str, Any],
+    with_reasons: bool = True,
+    top_n: Optional[int] = None
 ) -> List[Dict[str, Any]]:
     """
     Score all symbols for pullback setups and return ranked list.
@@ -314,41 +433,42 @@ def score_pullbacks(
         features_data: Dict mapping symbol -> features
         volumes: Dict mapping symbol -> 24h volume
         config: Config dict
+        with_reasons: Generate 'reasons' for every row (False: numeric results
+            only; use attach_pullback_reasons for the rows that get published)
+        top_n: Return only the best `top_n` symbols (None: full ranking)
     
     Returns:
-        List of scored symbols, sorted by score (descending)
+        List of scored symbols, sorted by score (descending, ties by symbol)
     """
     scorer = PullbackScorer(config)
-    results = []
     
     logger.info(f"Scoring {len(features_data)} symbols for pullback setups")
     
-    for symbol, features in features_data.items():
-        volume = volumes.get(symbol, 0)
-        
-        try:
-            score_result = scorer.score(symbol, features, volume)
-            
-            results.append({
-                'symbol': symbol,
-                'price_usdt': features.get('price_usdt'),
-                'coin_name': features.get('coin_name'),
-                'market_cap': features.get('market_cap'),
-                'quote_volume_24h': features.get('quote_volume_24h'),
-                'score': score_result['score'],
-                'components': score_result['components'],
-                'penalties': score_result['penalties'],
-                'flags': score_result['flags'],
-                'reasons': score_result['reasons']
-            })
-            
-        except Exception as e:
-            logger.error(f"Failed to score {symbol}: {e}")
-            continue
-    
-    # Sort by score (descending)
-    results.sort(key=lambda x: x['score'], reverse=True)
+    table = FeatureTable.from_features(features_data, volumes)
+    generate_reasons = scorer._generate_reasons if with_reasons else None
+    results = build_results(scorer.score_table(table), features_data, generate_reasons, top_n)
     
     logger.info(f"Pullback scoring complete: {len(results)} symbols scored")
     
     return results
+
+
+def attach_pullback_reasons(
+    results: List[Dict[str, Any]],
+    features_data: Dict[str, Dict[str, Any]],
+    config: Dict[str, Any],
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Materialize 'reasons' for the top `limit` rows of score_pullbacks(with_reasons=False).
+    
+    Args:
+        results: Ranked pullback results
+        features_data: Dict mapping symbol -> features
+        config: Config dict
+        limit: Rows to complete (None: all)
+    
+    Returns:
+        The same list, updated in place
+    """
+    return attach_reasons(results, features_data, PullbackScorer(config).reasons, limit)
@@ -18,6 +18,10 @@ Penalties:
 import logging
 from typing import Dict, Any, Optional, List
 
+import numpy as np
+
+from .table import FeatureTable, ScoreTable, truthy, build_results, attach_reasons
+
 logger = logging.getLogger(__name__)
 
 
@@ -55,6 +59,13 @@ class ReversalScorer:
             'volume': 0.20
         }
         
+        # Optional overrides, e.g. {'volume': 0.4} (used by parameter sweeps)
+        overrides = scoring_config.get('component_weights', {})
+        unknown = set(overrides) - set(self.weights)
+        if unknown:
+            raise ValueError(f"Unknown reversal component weights: {sorted(unknown)}")
+        self.weights.update(overrides)
+        
         logger.info("Reversal Scorer initialized")
     
     def score(
@@ -134,6 +145,98 @@ class ReversalScorer:
             'reasons': reasons
         }
     
+    def score_table(self, table: FeatureTable) -> ScoreTable:
+        """
+        Score all symbols of a feature table at once.
+
+        Every expression mirrors the scalar component methods (same
+        operations, same order), so results are identical to score().
+        Rows the scalar path would reject (None where a number is
+        compared or formatted) are marked invalid.
+        """
+        dd, dd_none = table.column('1d', 'drawdown_from_ath', None)
+        base_detected, base_detected_none = table.column('1d', 'base_detected', None)
+        atr, atr_none = table.column('1d', 'atr_pct', None)
+        dist_ema20, dist_ema20_none = table.column('1d', 'dist_ema20_pct', None)
+        dist_ema50, dist_ema50_none = table.column('1d', 'dist_ema50_pct', None)
+        hh_20, hh_20_none = table.column('1d', 'hh_20', None)
+        r7, r7_none = table.column('1d', 'r_7', None)
+        vol_1d, vol_1d_none = table.column('1d', 'volume_spike', 1.0)
+        vol_4h, vol_4h_none = table.column('4h', 'volume_spike', 1.0)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # _score_drawdown (NaN drawdown falls through every check -> 50)
+            dd_pct = np.abs(dd)
+            ratio = (dd_pct - self.min_drawdown) / (self.ideal_drawdown_min - self.min_drawdown)
+            excess = dd_pct - self.ideal_drawdown_max
+            penalty = np.where(0.5 < excess / 20, 0.5, excess / 20)  # == min(excess / 20, 0.5)
+            drawdown = np.select(
+                [
+                    dd_none | (dd >= 0),
+                    dd_pct < self.min_drawdown,
+                    (self.ideal_drawdown_min <= dd_pct) & (dd_pct <= self.ideal_drawdown_max),
+                    dd_pct < self.ideal_drawdown_min,
+                    dd_pct > self.ideal_drawdown_max,
+                ],
+                [0.0, 0.0, 100.0, 50.0 + ratio * 50.0, 100.0 * (1 - penalty)],
+                default=50.0
+            )
+
+            # _score_base
+            atr_set = truthy(atr, atr_none)
+            base = np.select(
+                [~truthy(base_detected, base_detected_none), atr_set & (atr < 5), atr_set & (atr < 10)],
+                [0.0, 100.0, 80.0],
+                default=60.0
+            )
+
+            # _score_reclaim
+            r7_set = truthy(r7, r7_none)
+            reclaim = (
+                0.0
+                + np.where(truthy(dist_ema20, dist_ema20_none) & (dist_ema20 > 0), 30.0, 0.0)
+                + np.where(truthy(dist_ema50, dist_ema50_none) & (dist_ema50 > 0), 30.0, 0.0)
+                + np.where(truthy(hh_20, hh_20_none), 20.0, 0.0)
+                + np.select([r7_set & (r7 > 10), r7_set & (r7 > 5)], [20.0, 10.0], default=0.0)
+            )
+            reclaim = np.where(100.0 < reclaim, 100.0, reclaim)
+
+            # _score_volume
+            max_spike = np.where(vol_4h > vol_1d, vol_4h, vol_1d)  # == max(vol_1d, vol_4h)
+            vol_ratio = (max_spike - self.min_volume_spike) / (3.0 - self.min_volume_spike)
+            volume = np.select(
+                [max_spike < self.min_volume_spike, max_spike >= 3.0],
+                [0.0, 100.0],
+                default=vol_ratio * 100.0
+            )
+
+            raw_score = (
+                drawdown * self.weights['drawdown'] +
+                base * self.weights['base'] +
+                reclaim * self.weights['reclaim'] +
+                volume * self.weights['volume']
+            )
+
+            # Penalties (multiplicative, in scalar order)
+            overextended = truthy(dist_ema50, dist_ema50_none) & (dist_ema50 > self.overextension_threshold)
+            low_liquidity = table.quote_volume < 500_000
+            final_score = raw_score * np.where(overextended, 0.7, 1.0)
+            final_score = final_score * np.where(low_liquidity, 0.8, 1.0)
+
+        # The reclaim reason formats dist_ema50, which fails for None
+        invalid = table.invalid | vol_1d_none | vol_4h_none | ((reclaim > 60) & dist_ema50_none)
+
+        return ScoreTable(
+            symbols=table.symbols,
+            score=final_score,
+            components={'drawdown': drawdown, 'base': base, 'reclaim': reclaim, 'volume': volume},
+            penalties=[
+                ('overextension', 0.7, 'overextended', overextended),
+                ('low_liquidity', 0.8, 'low_liquidity', low_liquidity),
+            ],
+            valid=~invalid
+        )
+
     def _score_drawdown(self, f1d: Dict[str, Any]) -> float:
         """
         Score drawdown context (0-100).
@@ -247,6 +350,21 @@ class ReversalScorer:
         ratio = (max_spike - self.min_volume_spike) / (3.0 - self.min_volume_spike)
         return ratio * 100.0
     
+    def reasons(self, features: Dict[str, Any], flags: List[str]) -> List[str]:
+        """
+        Generate reasons for an already scored symbol.
+
+        Components are recomputed from the features (cheap for a handful of
+        published rows) so thresholds see the unrounded values, as in score().
+        """
+        f1d = features.get('1d', {})
+        f4h = features.get('4h', {})
+        return self._generate_reasons(
+            self._score_drawdown(f1d), self._score_base(f1d),
+            self._score_reclaim(f1d, f4h), self._score_volume(f1d, f4h),
+            f1d, f4h, flags
+        )
+    
     def _generate_reasons(
         self,
         dd_score: float,
@@ -304,7 +422,9 @@ class ReversalScorer:
 def score_reversals(
     features_data: Dict[str, Dict[str, Any]],
     volumes: Dict[str, float],
-    config: Dict[str, Any]
+    config: Dict[str, Any],
+    with_reasons: bool = True,
+    top_n: Optional[int] = None
 ) -> List[Dict[str, Any]]:
     """
     Score all symbols for reversal setups and return ranked list.
@@ -313,41 +433,42 @@ def score_reversals(
         features_data: Dict mapping symbol -> features
         volumes: Dict mapping symbol -> 24h volume
         config: Config dict
+        with_reasons: Generate 'reasons' for every row (False: numeric results
+            only; use attach_reversal_reasons for the rows that get published)
+        top_n: Return only the best `top_n` symbols (None: full ranking)
     
     Returns:
-        List of scored symbols, sorted by score (descending)
+        List of scored symbols, sorted by score (descending, ties by symbol)
     """
     scorer = ReversalScorer(config)
-    results = []
     
     logger.info(f"Scoring {len(features_data)} symbols for reversal setups")
     
-    for symbol, features in features_data.items():
-        volume = volumes.get(symbol, 0)
-        
-        try:
-            score_result = scorer.score(symbol, features, volume)
-            
-            results.append({
-                'symbol': symbol,
-                'price_usdt': features.get('price_usdt'),
-                'coin_name': features.get('coin_name'),
-                'market_cap': features.get('market_cap'),
-                'quote_volume_24h': features.get('quote_volume_24h'),
-                'score': score_result['score'],
-                'components': score_result['components'],
-                'penalties': score_result['penalties'],
-                'flags': score_result['flags'],
-                'reasons': score_result['reasons']
-            })
-            
-        except Exception as e:
-            logger.error(f"Failed to score {symbol}: {e}")
-            continue
-    
-    # Sort by score (descending)
-    results.sort(key=lambda x: x['score'], reverse=True)
+    table = FeatureTable.from_features(features_data, volumes)
+    generate_reasons = scorer._generate_reasons if with_reasons else None
+    results = build_results(scorer.score_table(table), features_data, generate_reasons, top_n)
     
     logger.info(f"Reversal scoring complete: {len(results)} symbols scored")
     
     return results
+
+
+def attach_reversal_reasons(
+    results: List[Dict[str, Any]],
+    features_data: Dict[str, Dict[str, Any]],
+    config: Dict[str, Any],
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Materialize 'reasons' for the top `limit` rows of score_reversals(with_reasons=False).
+    
+    Args:
+        results: Ranked reversal results
+        features_data: Dict mapping symbol -> features
+        config: Config dict
+        limit: Rows to complete (None: all)
+    
+    Returns:
+        The same list, updated in place
+    """
+    return attach_reasons(results, features_data, ReversalScorer(config).reasons, limit)
@@ -0,0 +1,274 @@
+"""
+Columnar Scoring
+================
+
+FeatureTable turns the per-symbol feature dicts into one NumPy column per
+(timeframe, feature), so each scorer can evaluate all of its components
+for every symbol at once (`score_table`). ScoreTable holds the resulting
+component and penalty columns and converts rows back into the result
+dicts of the scalar `score()` path.
+
+Reasons are the only per-row string work in scoring. Results can be built
+without them and completed later with `attach_reasons`, only for the rows
+that actually get published.
+
+Columns keep `dict.get(key, default)` semantics: a missing key yields the
+caller's default, and None values are tracked in a separate mask because
+the scalar scorers treat None differently from NaN (None is falsy and
+raises TypeError in comparisons, which makes the symbol unscorable).
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Any, List, Tuple, Callable, Optional, Sequence
+
+import numpy as np
+
+from ...utils.ranking import top_k_indices
+
+logger = logging.getLogger(__name__)
+
+# Column entry status
+PRESENT, NONE, MISSING = 0, 1, 2
+
+TIMEFRAMES = ("1d", "4h")
+
+
+def truthy(values: np.ndarray, none: np.ndarray) -> np.ndarray:
+    """Python truthiness of a column (None and 0 are falsy, NaN is truthy)."""
+    return ~none & (values != 0)
+
+
+class FeatureTable:
+    """Feature columns for a list of symbols (row i = symbols[i])."""
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        columns: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]],
+        quote_volume: np.ndarray,
+        invalid: Optional[np.ndarray] = None
+    ):
+        """
+        Initialize feature table.
+
+        Args:
+            symbols: Row labels
+            columns: (timeframe, feature) -> (float64 values, int8 status)
+            quote_volume: 24h quote volume per row
+            invalid: Rows the scalar scorers cannot score (malformed input)
+        """
+        self.symbols = list(symbols)
+        self.columns = columns
+        self.quote_volume = quote_volume
+        self.invalid = invalid if invalid is not None else np.zeros(len(self.symbols), dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @classmethod
+    def from_features(
+        cls,
+        features_data: Dict[str, Dict[str, Any]],
+        volumes: Dict[str, float]
+    ) -> "FeatureTable":
+        """
+        Build columns from FeatureEngine output.
+
+        Args:
+            features_data: Dict mapping symbol -> features ('1d'/'4h' sub-dicts)
+            volumes: Dict mapping symbol -> 24h volume
+
+        Returns:
+            FeatureTable with one column per feature seen in any symbol
+        """
+        symbols = list(features_data)
+        n = len(symbols)
+        columns: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]] = {}
+        quote_volume = np.zeros(n)
+        invalid = np.zeros(n, dtype=bool)
+
+        for i, symbol in enumerate(symbols):
+            features = features_data[symbol]
+
+            volume = volumes.get(symbol, 0)
+            if volume is None:
+                invalid[i] = True
+            else:
+                quote_volume[i] = volume
+
+            for tf in TIMEFRAMES:
+                try:
+                    items = features.get(tf, {}).items()
+                except AttributeError:
+                    invalid[i] = True
+                    continue
+
+                for key, value in items:
+                    column = columns.get((tf, key))
+                    if column is None:
+                        column = (np.full(n, np.nan), np.full(n, MISSING, dtype=np.int8))
+                        columns[(tf, key)] = column
+
+                    values, status = column
+                    try:
+                        values[i] = float(value)
+                        status[i] = PRESENT
+                    except (TypeError, ValueError):
+                        # None (or non-numeric): not comparable in the scalar path
+                        status[i] = NONE
+
+        return cls(symbols, columns, quote_volume, invalid)
+
+    @classmethod
+    def concat(cls, tables: Sequence["FeatureTable"]) -> "FeatureTable":
+        """
+        Stack tables row-wise (e.g. one per snapshot day).
+
+        Columns absent from a table are MISSING for its rows, exactly as if
+        the key had not been present in those feature dicts.
+        """
+        keys = list(dict.fromkeys(key for table in tables for key in table.columns))
+        columns = {}
+        for key in keys:
+            parts = [
+                table.columns.get(key, (np.full(len(table), np.nan), np.full(len(table), MISSING, dtype=np.int8)))
+                for table in tables
+            ]
+            columns[key] = (
+                np.concatenate([values for values, _ in parts]) if parts else np.empty(0),
+                np.concatenate([status for _, status in parts]) if parts else np.empty(0, dtype=np.int8),
+            )
+
+        return cls(
+            [symbol for table in tables for symbol in table.symbols],
+            columns,
+            np.concatenate([table.quote_volume for table in tables]) if tables else np.empty(0),
+            np.concatenate([table.invalid for table in tables]) if tables else np.empty(0, dtype=bool),
+        )
+
+    def column(self, timeframe: str, key: str, default: Optional[float] = np.nan) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Feature column with `features[timeframe].get(key, default)` semantics.
+
+        Returns:
+            (values, none_mask) - values are NaN wherever none_mask is set
+        """
+        n = len(self.symbols)
+        values, status = self.columns.get(
+            (timeframe, key),
+            (np.full(n, np.nan), np.full(n, MISSING, dtype=np.int8))
+        )
+
+        missing = status == MISSING
+        none = status == NONE
+        if default is None:
+            none = none | missing
+        else:
+            values = np.where(missing, default, values)
+        return values, none
+
+
+@dataclass
+class ScoreTable:
+    """Vectorized scorer output (unrounded, as in the scalar path)."""
+
+    symbols: List[str]
+    score: np.ndarray
+    components: Dict[str, np.ndarray]
+    penalties: List[Tuple[str, float, str, np.ndarray]]  # (name, factor, flag, mask) in application order
+    valid: np.ndarray
+
+    def component_values(self, i: int) -> List[float]:
+        """Unrounded component scores of row i (in component order)."""
+        return [float(values[i]) for values in self.components.values()]
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """Score dict of row i, as returned by Scorer.score() (without reasons)."""
+        applied = [(name, factor, flag) for name, factor, flag, mask in self.penalties if mask[i]]
+        return {
+            'score': round(float(self.score[i]), 2),
+            'components': {name: round(float(values[i]), 2) for name, values in self.components.items()},
+            'penalties': {name: factor for name, factor, _ in applied},
+            'flags': [flag for _, _, flag in applied],
+        }
+
+
+def build_results(
+    scored: ScoreTable,
+    features_data: Dict[str, Dict[str, Any]],
+    generate_reasons: Optional[Callable[..., List[str]]] = None,
+    top_n: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Convert a ScoreTable into the ranked result list of score_* functions.
+
+    Rows are ranked on the published (rounded) score, ties broken by symbol.
+    With `top_n` only the best rows are selected (partial selection) and
+    turned into dicts.
+
+    Args:
+        scored: Output of Scorer.score_table
+        features_data: Dict mapping symbol -> features
+        generate_reasons: The scorer's _generate_reasons (None: leave out 'reasons')
+        top_n: Keep only the best rows (None: full ranking)
+
+    Returns:
+        Result dicts, best first
+    """
+    results = []
+
+    for i in np.flatnonzero(~scored.valid):
+        logger.error(f"Failed to score {scored.symbols[i]}: invalid feature values")
+
+    rounded = np.array([round(float(score), 2) for score in scored.score])
+
+    for i in top_k_indices(rounded, scored.symbols, top_n, scored.valid):
+        symbol = scored.symbols[i]
+        features = features_data[symbol]
+
+        try:
+            row = scored.row(i)
+            if generate_reasons is not None:
+                row['reasons'] = generate_reasons(
+                    *scored.component_values(i),
+                    features.get('1d', {}), features.get('4h', {}), row['flags']
+                )
+        except Exception as e:
+            logger.error(f"Failed to score {symbol}: {e}")
+            continue
+
+        results.append({
+            'symbol': symbol,
+            'price_usdt': features.get('price_usdt'),
+            'coin_name': features.get('coin_name'),
+            'market_cap': features.get('market_cap'),
+            'quote_volume_24h': features.get('quote_volume_24h'),
+            **row
+        })
+
+    return results
+
+
+def attach_reasons(
+    results: List[Dict[str, Any]],
+    features_data: Dict[str, Dict[str, Any]],
+    reasons: Callable[[Dict[str, Any], List[str]], List[str]],
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fill in 'reasons' (in place) for the first `limit` rows that lack them.
+
+    Args:
+        results: Ranked results built without reasons
+        features_data: Dict mapping symbol -> features
+        reasons: The scorer's reasons(features, flags)
+        limit: Rows to complete (None: all)
+
+    Returns:
+        The same list
+    """
+    for result in results[:limit]:
+        if 'reasons' not in result:
+            result['reasons'] = reasons(features_data[result['symbol']], result['flags'])
+    return results
@@ -9,6 +9,8 @@ Uses cheap metrics (24h volume) to rank and select top N candidates.
 import logging
 from typing import List, Dict, Any
 
+from ..utils.ranking import top_k
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,22 +47,19 @@ class ShortlistSelector:
                 - market_cap: float
         
         Returns:
-            Shortlist (top N by volume)
+            Shortlist (top N by volume, ties by symbol)
         """
         if not filtered_symbols:
             logger.warning("No symbols to shortlist (empty input)")
             return []
         
-        # Sort by volume (descending)
-        sorted_symbols = sorted(
+        # Top N by volume (partial selection, no full sort)
+        shortlist = top_k(
             filtered_symbols,
-            key=lambda x: x.get('quote_volume_24h', 0),
-            reverse=True
+            self.max_size,
+            value=lambda x: x.get('quote_volume_24h', 0)
         )
         
-        # Take top N
-        shortlist = sorted_symbols[:self.max_size]
-        
         logger.info(f"Shortlist selected: {len(shortlist)} symbols from {len(filtered_symbols)} "
                    f"(top {len(shortlist)/len(filtered_symbols)*100:.1f}% by volume)")
         
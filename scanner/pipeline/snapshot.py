@@ -4,16 +4,174 @@ Snapshot System
 
 Creates deterministic daily snapshots for backtesting and reproducibility.
 Snapshots include all pipeline data at a specific point in time.
+
+Formats (`snapshots.format`):
+- json:    one compact JSON file per day (<runtime_dir>/<date>.json, or
+           .json.gz / .json.zst with `snapshots.json_compression`)
+- parquet: one directory per day (<runtime_dir>/<date>/) holding a small
+           manifest.json (meta, counts, layout) plus one Parquet table per
+           section (universe, filtered, shortlist, features, reversals,
+           breakouts, pullbacks)
+
+Parquet sections are flattened: nested dicts become columns joined with
+"__" (e.g. `components__breakout`, `1d__close`) over the union of their
+keys, with nulls where a row lacks a key. When a nested dict or one of its
+keys is missing in some rows, a marker column named after the dict (e.g.
+`4h`) lists the keys absent in each row (null: dict absent), so rows round
+trip exactly; the `__absent__` column does the same for top-level keys.
+Only keys mixing dicts with other values, or holding only
+empty dicts, are stored as JSON text.
+Stats and listing read only the manifest, and `load_section` /
+`load_sections` read just the requested columns, for one or many days.
 """
 
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Sequence
 from datetime import datetime
 from pathlib import Path
 import json
 
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ..utils.artifact_writer import submit, atomic_path, write_text
+from ..utils import json_codec
+
 logger = logging.getLogger(__name__)
 
+SEP = "__"
+MANIFEST = "manifest.json"
+# Marker column of the top level (absent top-level keys per row)
+ROOT_MARKER = "__absent__"
+
+DATA_SECTIONS = ('universe', 'filtered', 'shortlist', 'features')
+SCORING_SECTIONS = ('reversals', 'breakouts', 'pullbacks')
+
+
+# -------------------------------------------------------------------------
+# Flattening (parquet layout)
+# -------------------------------------------------------------------------
+def _plan_layout(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Decide which keys become flat columns, nested column groups or JSON text."""
+    keys: List[str] = []
+    seen = set()
+    for record in records:
+        for key in record:
+            if key not in seen:
+                seen.add(key)
+                keys.append(key)
+
+    optional = [k for k in keys if any(k not in r for r in records)]
+    nested: Dict[str, Any] = {}
+    json_keys: List[str] = []
+
+    for key in keys:
+        values = [r[key] for r in records if key in r]
+        dicts = [v for v in values if isinstance(v, dict)]
+        if not dicts:
+            continue
+        # Dicts mixed with other values (or only empty dicts): JSON text
+        if len(dicts) < len(values) or not any(dicts):
+            json_keys.append(key)
+            continue
+        # Union of the nested keys; missing ones are written as nulls
+        sub = _plan_layout(dicts)
+        # Marker column (absent keys per row) when the group or any of its keys is optional
+        sub['marker'] = key in optional or bool(sub['optional'])
+        nested[key] = sub
+
+    return {'keys': keys, 'optional': optional, 'json': json_keys, 'nested': nested}
+
+
+def _columns(layout: Dict[str, Any], prefix: str = "") -> List[str]:
+    """All flat column names of a layout, in key order."""
+    columns = [ROOT_MARKER] if not prefix and layout.get('marker') else []
+    for key in layout['keys']:
+        name = prefix + key
+        sub = layout['nested'].get(key)
+        if sub is None:
+            columns.append(name)
+            continue
+        if sub.get('marker'):
+            columns.append(name)
+        columns.extend(_columns(sub, name + SEP))
+    return columns
+
+
+def _flatten(record: Dict[str, Any], layout: Dict[str, Any], prefix: str, out: Dict[str, Any]) -> Dict[str, Any]:
+    for key, value in record.items():
+        name = prefix + key
+        if key in layout['nested']:
+            sub = layout['nested'][key]
+            if sub.get('marker'):
+                out[name] = [k for k in sub['keys'] if k not in value]
+            _flatten(value, sub, name + SEP, out)
+        elif key in layout['json']:
+            out[name] = json.dumps(value, ensure_ascii=False)
+        else:
+            out[name] = value
+    return out
+
+
+def _unflatten(
+    flat: Dict[str, Any],
+    layout: Dict[str, Any],
+    prefix: str = "",
+    absent: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    record = {}
+    for key in layout['keys']:
+        name = prefix + key
+        if absent is not None and key in absent:
+            continue
+        sub = layout['nested'].get(key)
+        if sub is not None:
+            if not sub.get('marker'):
+                record[key] = _unflatten(flat, sub, name + SEP)
+            elif flat.get(name) is not None:  # null marker: key absent in this row
+                record[key] = _unflatten(flat, sub, name + SEP, flat[name])
+            continue
+        if name not in flat:
+            continue
+        value = flat[name]
+        if absent is None and value is None and key in layout['optional']:
+            continue  # key was absent in this row
+        if key in layout['json'] and value is not None:
+            value = json.loads(value)
+        record[key] = value
+    return record
+
+
+def _plan_section(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Layout of a snapshot section (top-level marker when some rows lack keys)."""
+    layout = _plan_layout(records)
+    layout['marker'] = bool(layout['optional'])
+    return layout
+
+
+def _rows(records: List[Dict[str, Any]], layout: Dict[str, Any]) -> List[Dict[str, Any]]:
+    rows = []
+    for record in records:
+        row = _flatten(record, layout, "", {})
+        if layout.get('marker'):
+            row[ROOT_MARKER] = [k for k in layout['keys'] if k not in record]
+        rows.append(row)
+    return rows
+
+
+def _table(records: List[Dict[str, Any]], layout: Dict[str, Any]) -> pa.Table:
+    """Flattened records as a table with every layout column (nulls where a row lacks a key)."""
+    rows = _rows(records, layout)
+    return pa.table({column: [row.get(column) for row in rows] for column in _columns(layout)})
+
+
+def _json_columns(layout: Dict[str, Any], prefix: str = "") -> List[str]:
+    columns = [prefix + key for key in layout['json']]
+    for key, sub in layout['nested'].items():
+        columns.extend(_json_columns(sub, prefix + key + SEP))
+    return columns
+
 
 class SnapshotManager:
     """Manages daily pipeline snapshots."""
@@ -32,11 +190,17 @@ class SnapshotManager:
             snapshot_config = config.get('snapshots', {})
         
         self.snapshots_dir = Path(snapshot_config.get('runtime_dir', 'snapshots/runtime'))
+        self.format = snapshot_config.get('format', 'json')
+        if self.format not in ('json', 'parquet'):
+            raise ValueError(f"Unknown snapshot format: {self.format}")
+        # JSON format only: None, 'gzip' or 'zstd'
+        self.json_compression = snapshot_config.get('json_compression')
+        json_codec.check_compression(self.json_compression)
         
         # Ensure directory exists
         self.snapshots_dir.mkdir(parents=True, exist_ok=True)
         
-        logger.info(f"Snapshot Manager initialized: {self.snapshots_dir}")
+        logger.info(f"Snapshot Manager initialized: {self.snapshots_dir} ({self.format})")
     
     def create_snapshot(
         self,
@@ -59,13 +223,14 @@ class SnapshotManager:
             filtered: Post-filter universe
             shortlist: Shortlisted symbols
             features: Computed features
-            reversal_scores: Reversal scoring results
+            reversal_scores: Reversal scoring results (rows past the published
+                top-N may carry no 'reasons')
             breakout_scores: Breakout scoring results
             pullback_scores: Pullback scoring results
             metadata: Optional metadata
         
         Returns:
-            Path to saved snapshot file
+            Path to saved snapshot file (json) or directory (parquet)
         """
         logger.info(f"Creating snapshot for {run_date}")
         
@@ -96,26 +261,125 @@ class SnapshotManager:
         
         if metadata:
             snapshot['meta'].update(metadata)
-            
+        
         # Safety: ensure as-of exists (for reproducibility)
         if 'asof_ts_ms' not in snapshot['meta']:
             snapshot['meta']['asof_ts_ms'] = int(datetime.utcnow().timestamp() * 1000)
-
+        
         if 'asof_iso' not in snapshot['meta']:
             snapshot['meta']['asof_iso'] = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
-            
-        # Save snapshot
-        snapshot_path = self.snapshots_dir / f"{run_date}.json"
         
-        with open(snapshot_path, 'w', encoding='utf-8') as f:
-            json.dump(snapshot, f, indent=2, ensure_ascii=False)
+        if self.format == 'parquet':
+            return self._save_parquet(run_date, snapshot)
+        
+        # Save snapshot (serialized here, written on the artifact writer)
+        snapshot_path = json_codec.compressed_path(self.snapshots_dir / f"{run_date}.json", self.json_compression)
+        data = json_codec.dumps(snapshot)
+        submit(snapshot_path.name, self._write_json, snapshot_path, data)
+        
+        return snapshot_path
+    
+    @staticmethod
+    def _write_json(snapshot_path: Path, data: bytes) -> None:
+        with atomic_path(snapshot_path) as tmp_path:
+            tmp_path.write_bytes(json_codec.compress(data, snapshot_path))
         
         # Get file size
         size_mb = snapshot_path.stat().st_size / (1024 * 1024)
         
         logger.info(f"Snapshot saved: {snapshot_path} ({size_mb:.2f} MB)")
+    
+    def _save_parquet(self, run_date: str, snapshot: Dict[str, Any]) -> Path:
+        """Build one Parquet table per section; tables and manifest are written on the artifact writer."""
+        snapshot_dir = self.snapshots_dir / run_date
         
-        return snapshot_path
+        sections = {}
+        tables = {}
+        
+        for name in DATA_SECTIONS + SCORING_SECTIONS:
+            group = 'data' if name in DATA_SECTIONS else 'scoring'
+            data = snapshot[group][name]
+            
+            if isinstance(data, dict):
+                kind = 'mapping'
+                records = [{'symbol': key, **value} for key, value in data.items()]
+            else:
+                kind = 'list'
+                records = list(data)
+            
+            layout = _plan_section(records)
+            table = _table(records, layout)
+            
+            tables[f"{name}.parquet"] = table
+            
+            sections[name] = {
+                'group': group,
+                'kind': kind,
+                'file': f"{name}.parquet",
+                'rows': len(records),
+                'layout': layout,
+            }
+        
+        manifest = {
+            'format': 'parquet',
+            'meta': snapshot['meta'],
+            'pipeline': snapshot['pipeline'],
+            'counts': {name: section['rows'] for name, section in sections.items()},
+            'sections': sections,
+        }
+        
+        submit(snapshot_dir.name, self._write_parquet, snapshot_dir, tables,
+               json.dumps(manifest, indent=2, ensure_ascii=False))
+        
+        return snapshot_dir
+    
+    @staticmethod
+    def _write_parquet(snapshot_dir: Path, tables: Dict[str, pa.Table], manifest_text: str) -> None:
+        snapshot_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Drop a stale manifest first: a directory without one is incomplete
+        manifest_path = snapshot_dir / MANIFEST
+        if manifest_path.exists():
+            manifest_path.unlink()
+        
+        total_bytes = 0
+        for file_name, table in tables.items():
+            path = snapshot_dir / file_name
+            with atomic_path(path) as tmp_path:
+                pq.write_table(table, tmp_path)
+            total_bytes += path.stat().st_size
+        
+        # Manifest last: it marks the snapshot as complete
+        write_text(manifest_path, manifest_text)
+        
+        logger.info(f"Snapshot saved: {snapshot_dir} ({total_bytes / (1024 * 1024):.2f} MB)")
+    
+    def _manifest_path(self, run_date: str) -> Path:
+        return self.snapshots_dir / run_date / MANIFEST
+    
+    def load_manifest(self, run_date: str) -> Dict[str, Any]:
+        """
+        Load the manifest of a parquet snapshot (meta, counts, layout).
+        
+        Raises:
+            FileNotFoundError: If no parquet snapshot exists for the date
+        """
+        manifest_path = self._manifest_path(run_date)
+        
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"Snapshot manifest not found: {manifest_path}")
+        
+        return json_codec.load_file(manifest_path)
+    
+    def load_meta(self, run_date: str) -> Dict[str, Any]:
+        """
+        Snapshot meta (date, mode, asof_ts_ms, ...).
+        
+        Parquet snapshots read only the manifest.
+        """
+        if self._manifest_path(run_date).exists():
+            return self.load_manifest(run_date)['meta']
+        return self.load_snapshot(run_date)['meta']
     
     def load_snapshot(self, run_date: str) -> Dict[str, Any]:
         """
@@ -130,17 +394,122 @@ class SnapshotManager:
         Raises:
             FileNotFoundError: If snapshot doesn't exist
         """
-        snapshot_path = self.snapshots_dir / f"{run_date}.json"
+        if self._manifest_path(run_date).exists():
+            logger.info(f"Loading snapshot: {self.snapshots_dir / run_date}")
+            manifest = self.load_manifest(run_date)
+            snapshot = {
+                'meta': manifest['meta'],
+                'pipeline': manifest['pipeline'],
+                'data': {},
+                'scoring': {}
+            }
+            for name, section in manifest['sections'].items():
+                snapshot[section['group']][name] = self._read_records(run_date, section)
+            return snapshot
+        
+        snapshot_path = self._json_path(run_date)
         
         if not snapshot_path.exists():
             raise FileNotFoundError(f"Snapshot not found: {snapshot_path}")
         
         logger.info(f"Loading snapshot: {snapshot_path}")
         
-        with open(snapshot_path, 'r', encoding='utf-8') as f:
-            snapshot = json.load(f)
+        return json_codec.load_file(snapshot_path)
+    
+    def _json_path(self, run_date: str) -> Path:
+        """JSON snapshot of a date, whichever compression it was written with."""
+        plain = self.snapshots_dir / f"{run_date}.json"
+        for suffix in ('', *json_codec.COMPRESSION_SUFFIXES.values()):
+            path = plain.with_name(plain.name + suffix)
+            if path.exists():
+                return path
+        return plain
+    
+    def _read_records(self, run_date: str, section: Dict[str, Any]):
+        """Rebuild the original list/dict of a parquet section."""
+        table = pq.read_table(self.snapshots_dir / run_date / section['file'])
+        layout = section['layout']
+        records = [
+            _unflatten(row, layout, absent=row.get(ROOT_MARKER) if layout.get('marker') else None)
+            for row in table.to_pylist()
+        ]
         
-        return snapshot
+        if section['kind'] == 'mapping':
+            return {record.pop('symbol'): record for record in records}
+        return records
+    
+    def load_section(
+        self,
+        run_date: str,
+        section: str,
+        columns: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Load one section as a flat table (nested keys joined with "__").
+        
+        Parquet snapshots read only the requested columns; JSON snapshots
+        are loaded in full and flattened the same way.
+        
+        Args:
+            run_date: Date string (YYYY-MM-DD)
+            section: universe, filtered, shortlist, features, reversals,
+                breakouts or pullbacks
+            columns: Flat column names to load (None: all)
+        
+        Returns:
+            DataFrame with one row per entry (features: one per symbol)
+        """
+        if self._manifest_path(run_date).exists():
+            meta = self.load_manifest(run_date)['sections'][section]
+            path = self.snapshots_dir / run_date / meta['file']
+            if columns is not None:
+                available = set(pq.read_schema(path).names)
+                columns = [c for c in columns if c in available]
+            df = pq.read_table(path, columns=columns).to_pandas()
+            layout = meta['layout']
+        else:
+            snapshot = self.load_snapshot(run_date)
+            group = 'data' if section in DATA_SECTIONS else 'scoring'
+            data = snapshot[group][section]
+            if isinstance(data, dict):
+                data = [{'symbol': key, **value} for key, value in data.items()]
+            layout = _plan_section(data)
+            df = pd.DataFrame(_rows(data, layout), columns=_columns(layout))
+            if columns is not None:
+                df = df[[c for c in columns if c in df.columns]]
+        
+        for column in _json_columns(layout):
+            if column in df.columns:
+                df[column] = [json.loads(v) if isinstance(v, str) else v for v in df[column]]
+        
+        return df.drop(columns=[ROOT_MARKER], errors='ignore')
+    
+    def load_sections(
+        self,
+        section: str,
+        columns: Optional[Sequence[str]] = None,
+        dates: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Load one section across many days into a single table.
+        
+        Args:
+            section: Section name (see load_section)
+            columns: Flat column names to load (None: all)
+            dates: Dates to load (None: all snapshots)
+        
+        Returns:
+            DataFrame with a leading 'date' column
+        """
+        frames = []
+        for run_date in (dates if dates is not None else self.list_snapshots()):
+            df = self.load_section(run_date, section, columns)
+            df.insert(0, 'date', run_date)
+            frames.append(df)
+        
+        if not frames:
+            return pd.DataFrame(columns=['date', *(columns or [])])
+        return pd.concat(frames, ignore_index=True)
     
     def list_snapshots(self) -> List[str]:
         """
@@ -149,13 +518,17 @@ class SnapshotManager:
         Returns:
             List of date strings (YYYY-MM-DD)
         """
-        snapshots = []
+        snapshots = set()
+        
+        for path in self.snapshots_dir.glob("*.json*"):
+            if path.name.startswith('.'):  # in-flight temp files
+                continue
+            snapshots.add(path.name.split('.json')[0])
         
-        for path in self.snapshots_dir.glob("*.json"):
-            date = path.stem  # Filename without extension
-            snapshots.append(date)
+        for path in self.snapshots_dir.glob(f"*/{MANIFEST}"):
+            snapshots.add(path.parent.name)
         
-        snapshots.sort()
+        snapshots = sorted(snapshots)
         
         logger.info(f"Found {len(snapshots)} snapshots")
         
@@ -165,22 +538,31 @@ class SnapshotManager:
         """
         Get statistics about a snapshot without loading full data.
         
+        Parquet snapshots answer from the manifest alone.
+        
         Args:
             run_date: Date string
         
         Returns:
             Stats dict
         """
-        snapshot = self.load_snapshot(run_date)
+        if self._manifest_path(run_date).exists():
+            manifest = self.load_manifest(run_date)
+            meta, pipeline, counts = manifest['meta'], manifest['pipeline'], manifest['counts']
+            scoring_counts = {name: counts[name] for name in SCORING_SECTIONS}
+        else:
+            snapshot = self.load_snapshot(run_date)
+            meta, pipeline = snapshot['meta'], snapshot['pipeline']
+            scoring_counts = {name: len(snapshot['scoring'][name]) for name in SCORING_SECTIONS}
         
         return {
-            'date': snapshot['meta']['date'],
-            'created_at': snapshot['meta']['created_at'],
-            'universe_count': snapshot['pipeline']['universe_count'],
-            'filtered_count': snapshot['pipeline']['filtered_count'],
-            'shortlist_count': snapshot['pipeline']['shortlist_count'],
-            'features_count': snapshot['pipeline']['features_count'],
-            'reversal_count': len(snapshot['scoring']['reversals']),
-            'breakout_count': len(snapshot['scoring']['breakouts']),
-            'pullback_count': len(snapshot['scoring']['pullbacks'])
+            'date': meta['date'],
+            'created_at': meta['created_at'],
+            'universe_count': pipeline['universe_count'],
+            'filtered_count': pipeline['filtered_count'],
+            'shortlist_count': pipeline['shortlist_count'],
+            'features_count': pipeline['features_count'],
+            'reversal_count': scoring_counts['reversals'],
+            'breakout_count': scoring_counts['breakouts'],
+            'pullback_count': scoring_counts['pullbacks']
         }
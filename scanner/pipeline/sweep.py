@@ -0,0 +1,266 @@
+"""
+Parameter Sweep
+===============
+
+Grid search over scoring thresholds and component weights, evaluated on
+stored snapshots.
+
+The features of every snapshot day are loaded once into a single
+FeatureTable (rows = (day, symbol)) and the forward returns of every row
+are computed once from the raw OHLCV close matrix (see backtest_runner).
+Neither depends on the scoring config, so each grid variant costs one
+vectorized `score_table` call per setup plus a per-day top-N selection.
+
+Grid keys are dotted paths below `scoring`, e.g.:
+
+    breakout.ideal_volume_spike: [2.0, 2.5, 3.0]
+    breakout.component_weights.volume: [0.3, 0.4]
+    reversal.ideal_drawdown_min: [40, 50]
+
+Only the setups named in the grid are re-scored.
+"""
+
+import argparse
+import copy
+import itertools
+import logging
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from .backtest_runner import BacktestRunner, PriceMatrix, return_metrics, date_to_ms
+from .scoring.table import FeatureTable
+from .scoring.breakout import BreakoutScorer
+from .scoring.pullback import PullbackScorer
+from .scoring.reversal import ReversalScorer
+from ..utils.raw_collector import load_raw_ohlcv
+
+logger = logging.getLogger(__name__)
+
+SCORERS = {
+    'breakout': BreakoutScorer,
+    'pullback': PullbackScorer,
+    'reversal': ReversalScorer,
+}
+
+
+def expand_grid(grid: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """
+    Cartesian product of a parameter grid.
+
+    Args:
+        grid: Dotted parameter path -> candidate values
+
+    Returns:
+        List of {path: value} variants (grid key order, last key varies fastest)
+    """
+    for path in grid:
+        if path.split('.', 1)[0] not in SCORERS:
+            raise ValueError(f"Sweep parameter must start with a setup name: {path}")
+
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+def apply_overrides(scoring_config: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy of a `scoring` config section with dotted-path overrides applied.
+
+    Args:
+        scoring_config: Base `scoring` section
+        params: Dotted path -> value
+
+    Returns:
+        New scoring section
+    """
+    scoring_config = copy.deepcopy(scoring_config)
+    for path, value in params.items():
+        *parents, leaf = path.split('.')
+        node = scoring_config
+        for key in parents:
+            node = node.setdefault(key, {})
+        node[leaf] = value
+    return scoring_config
+
+
+class ParameterSweep:
+    """Re-scores stored feature snapshots for many scoring configs."""
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize parameter sweep.
+
+        Args:
+            config: Config dict with 'scoring', 'backtest', 'snapshots' and
+                optional 'sweep' sections
+        """
+        # Handle both dict and ScannerConfig object
+        if hasattr(config, 'raw'):
+            raw = config.raw
+        else:
+            raw = config
+        sweep_config = raw.get('sweep', {})
+
+        self.scoring_config = raw.get('scoring', {})
+        self.top_n = sweep_config.get('top_n', raw.get('output', {}).get('top_n_per_setup', 10))
+        self.output_dir = Path(sweep_config.get('output_dir', 'reports/sweep'))
+        self.backtest = BacktestRunner(raw)
+
+        self.table: Optional[FeatureTable] = None
+        self.day_codes = np.empty(0, dtype=np.int64)
+        self.dates: List[str] = []
+        self.returns: Dict[int, np.ndarray] = {}
+
+        logger.info(f"Parameter Sweep initialized: top_n={self.top_n}")
+
+    def load(self, dates: Optional[Sequence[str]] = None) -> None:
+        """
+        Load features and forward returns of all snapshot days (once per sweep).
+
+        Args:
+            dates: Snapshot dates (None: all)
+        """
+        snapshots = self.backtest.snapshots
+        if dates is None:
+            dates = snapshots.list_snapshots()
+
+        tables = []
+        asof = []
+        for run_date in dates:
+            snapshot = snapshots.load_snapshot(run_date)
+            data = snapshot['data']
+            # Same volume map as the pipeline (shortlist 24h volume)
+            volumes = {entry['symbol']: entry['quote_volume_24h'] for entry in data['shortlist']}
+            table = FeatureTable.from_features(data['features'], volumes)
+            tables.append(table)
+            asof.append(snapshot['meta'].get('asof_ts_ms') or date_to_ms(run_date))
+
+        self.dates = list(dates)
+        self.table = FeatureTable.concat(tables)
+        sizes = [len(table) for table in tables]
+        self.day_codes = np.repeat(np.arange(len(tables)), sizes)
+
+        prices = PriceMatrix.from_ohlcv(load_raw_ohlcv(self.backtest.raw_dir, timeframe='1d'))
+        rows = prices.entry_rows(np.repeat(np.array(asof, dtype=np.int64), sizes))
+        cols = prices.columns(self.table.symbols)
+        self.returns = prices.forward_returns(rows, cols, self.backtest.horizons, self.backtest.slippage_bps)
+
+        logger.info(f"Sweep data: {len(self.table)} feature rows from {len(tables)} snapshots")
+
+    def picks(self, score: np.ndarray, valid: np.ndarray) -> np.ndarray:
+        """
+        Row indices of the top-N valid rows of every day.
+
+        Ranked like the published results: score rounded to 2 decimals
+        descending, ties by symbol, NaN last.
+        """
+        candidates = np.flatnonzero(valid)
+        keys = -np.round(score[candidates], 2)
+        keys[np.isnan(keys)] = np.inf
+        labels = np.array(self.table.symbols, dtype=object)[candidates]
+
+        order = candidates[np.lexsort((labels, keys, self.day_codes[candidates]))]
+        days = self.day_codes[order]
+        rank = np.arange(len(order)) - np.searchsorted(days, days, side='left') + 1
+
+        return order if self.top_n is None else order[rank <= self.top_n]
+
+    def evaluate(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Score one grid variant and evaluate its top-N picks.
+
+        Args:
+            params: Dotted path -> value
+
+        Returns:
+            One result row per re-scored setup
+        """
+        scoring_config = apply_overrides(self.scoring_config, params)
+        setups = sorted({path.split('.', 1)[0] for path in params}) or sorted(SCORERS)
+
+        rows = []
+        for setup in setups:
+            scored = SCORERS[setup]({'scoring': scoring_config}).score_table(self.table)
+            picks = self.picks(scored.score, scored.valid)
+            threshold = self.backtest.hit_threshold(setup)
+
+            row = {**params, 'setup': setup, 'signals': len(picks)}
+            for k, returns in self.returns.items():
+                metrics = return_metrics(returns[picks], threshold)
+                for name in ('count', 'hit_rate', 'mean', 'median'):
+                    row[f'{k}d_{name}'] = metrics.get(name, np.nan)
+            rows.append(row)
+
+        return rows
+
+    def run(self, grid: Dict[str, Sequence[Any]], dates: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Evaluate every variant of a grid.
+
+        Args:
+            grid: Dotted parameter path -> candidate values
+            dates: Snapshot dates (None: all)
+
+        Returns:
+            DataFrame with one row per (variant, setup): parameters + metrics
+        """
+        variants = expand_grid(grid)
+        if self.table is None:
+            self.load(dates)
+
+        logger.info(f"Sweeping {len(variants)} scoring variants")
+        rows = []
+        for variant_id, params in enumerate(variants):
+            for row in self.evaluate(params):
+                rows.append({'variant': variant_id, **row})
+
+        return pd.DataFrame(rows)
+
+    def save(self, results: pd.DataFrame) -> Path:
+        """Write the sweep results as CSV (named by snapshot range)."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"sweep_{self.dates[0]}_{self.dates[-1]}" if self.dates else "sweep_empty"
+        path = self.output_dir / f"{stem}.csv"
+        results.to_csv(path, index=False)
+        logger.info(f"Sweep results saved: {path}")
+        return path
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from ..config import load_config
+
+    parser = argparse.ArgumentParser(description="Grid search over scoring parameters on stored snapshots")
+    parser.add_argument("--grid", required=True, help="YAML file: dotted scoring path -> list of values")
+    parser.add_argument("--from", dest="date_from", help="First snapshot date (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", help="Last snapshot date (YYYY-MM-DD)")
+    parser.add_argument("--top-n", type=int, help="Picks per setup and day (default: output.top_n_per_setup)")
+    args = parser.parse_args(argv)
+
+    with open(args.grid, 'r', encoding='utf-8') as f:
+        grid = yaml.safe_load(f)
+
+    cfg = load_config()
+    if args.top_n is not None:
+        cfg.raw.setdefault('sweep', {})['top_n'] = args.top_n
+
+    sweep = ParameterSweep(cfg)
+    dates = [
+        d for d in sweep.backtest.snapshots.list_snapshots()
+        if (args.date_from is None or d >= args.date_from) and (args.date_to is None or d <= args.date_to)
+    ]
+    results = sweep.run(grid, dates)
+    path = sweep.save(results)
+
+    objective = f"{sweep.backtest.horizons[0]}d_mean"
+    for setup, group in results.groupby('setup'):
+        print(f"\n{setup} - best variants by {objective}:")
+        print(group.sort_values(objective, ascending=False).head(10).to_string(index=False))
+    print(f"\nSaved: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,134 @@
+"""
+Universe Table
+==============
+
+Symbol-keyed join of the MEXC universe, 24h tickers, mapping results and
+the shortlist. Built once per run and shared by the filter input, feature
+enrichment, the scoring volume map and the snapshot, so every per-symbol
+lookup is a dict access instead of a list scan or a repeated mapping call.
+"""
+
+import logging
+from typing import Dict, Any, List, Iterable
+
+from ..clients.mapping import MappingResult
+
+logger = logging.getLogger(__name__)
+
+
+class UniverseTable:
+    """Per-symbol universe data (ticker + mapping), plus shortlist membership."""
+
+    def __init__(self, rows: Dict[str, Dict[str, Any]]):
+        """
+        Initialize universe table.
+
+        Args:
+            rows: symbol -> row dict, in universe order
+        """
+        self.rows = rows
+        self.shortlist: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.rows
+
+    def get(self, symbol: str) -> Dict[str, Any]:
+        """Row for a symbol (empty dict if not in the universe)."""
+        return self.rows.get(symbol, {})
+
+    def filter_input(self) -> List[Dict[str, Any]]:
+        """
+        Mapped symbols in the shape expected by UniverseFilters.
+
+        Returns:
+            List of {'symbol', 'base', 'quote_volume_24h', 'market_cap'} dicts
+        """
+        return [
+            {
+                'symbol': row['symbol'],
+                'base': row['base'],
+                'quote_volume_24h': row['quote_volume_24h'],
+                'market_cap': row['market_cap'],
+            }
+            for row in self.rows.values()
+            if row['mapped']
+        ]
+
+    def set_shortlist(self, shortlist: Iterable[Dict[str, Any]]) -> None:
+        """Index the shortlist entries by symbol."""
+        self.shortlist = {entry['symbol']: entry for entry in shortlist}
+
+    def volume_map(self) -> Dict[str, float]:
+        """24h quote volume per shortlisted symbol (scoring input)."""
+        return {symbol: entry['quote_volume_24h'] for symbol, entry in self.shortlist.items()}
+
+    def snapshot_rows(self) -> List[Dict[str, Any]]:
+        """Universe rows for the snapshot (universe order)."""
+        return list(self.rows.values())
+
+
+def build_universe_table(
+    universe: List[str],
+    tickers: List[Dict[str, Any]],
+    mapping_results: Dict[str, MappingResult]
+) -> UniverseTable:
+    """
+    Join universe symbols with their 24h ticker and mapping result.
+
+    Args:
+        universe: MEXC Spot USDT symbols
+        tickers: 24h ticker dicts (MEXC format)
+        mapping_results: symbol -> MappingResult (from SymbolMapper.map_universe)
+
+    Returns:
+        UniverseTable keyed by symbol
+    """
+    ticker_map = {t['symbol']: t for t in tickers}
+    rows = {}
+
+    for symbol in universe:
+        ticker = ticker_map.get(symbol)
+        mapping = mapping_results.get(symbol)
+        mapped = bool(mapping and mapping.mapped)
+
+        rows[symbol] = {
+            'symbol': symbol,
+            'base': symbol.replace('USDT', ''),
+            'price_usdt': float(ticker.get('lastPrice', 0)) if ticker else None,
+            'quote_volume_24h': float((ticker or {}).get('quoteVolume', 0)),
+            'market_cap': mapping._get_market_cap() if mapped else None,
+            'coin_name': mapping.cmc_data.get('name', 'Unknown') if mapped else 'Unknown',
+            'mapped': mapped,
+        }
+
+    logger.info(f"Universe table: {len(rows)} symbols ({len(ticker_map)} tickers)")
+    return UniverseTable(rows)
+
+
+def enrich_features(features: Dict[str, Dict[str, Any]], table: UniverseTable) -> Dict[str, Dict[str, Any]]:
+    """
+    Add price, coin name, market cap and volume to each symbol's features (in place).
+
+    Market cap and volume come from the shortlist entry (None if the symbol
+    was not shortlisted), price and name from the universe row.
+
+    Args:
+        features: symbol -> features (FeatureEngine output)
+        table: Universe table with the shortlist set
+
+    Returns:
+        The same features dict
+    """
+    for symbol, symbol_features in features.items():
+        row = table.get(symbol)
+        entry = table.shortlist.get(symbol)
+
+        symbol_features['price_usdt'] = row.get('price_usdt')
+        symbol_features['coin_name'] = row.get('coin_name', 'Unknown')
+        symbol_features['market_cap'] = entry.get('market_cap') if entry else None
+        symbol_features['quote_volume_24h'] = entry.get('quote_volume_24h') if entry else None
+
+    return features
@@ -0,0 +1,307 @@
+"""
+Pipeline Benchmark
+==================
+
+End-to-end `run_pipeline` benchmark on synthetic universes.
+
+For every universe size a synthetic MEXC/CMC market (exchange info,
+tickers, klines, listings) is generated and served through the offline
+stand-in, and the complete offline pipeline runs in a scratch directory.
+Per-stage wall and CPU times come from the run profile the pipeline
+writes (see utils/profiling.py); the peak of traced Python allocations per
+stage comes from a second run under tracemalloc, so tracing does not skew
+the timings.
+
+Every invocation appends one entry to a JSON history and is compared with
+the previous entry of the same universe size, so slow-downs in hot paths
+show up as a flagged stage.
+
+    python -m scanner.tools.benchmark --sizes 100 1000 10000
+"""
+
+import argparse
+import copy
+import json
+import logging
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence
+
+import numpy as np
+
+from ..clients.offline_market import OfflineMarket
+from ..config import ScannerConfig
+from ..pipeline import offline_outputs, run_pipeline
+from ..utils.candle_store import CandleArrays
+from ..utils.profiling import peak_rss_mb
+from ..utils.time_utils import INTERVAL_MS
+
+logger = logging.getLogger(__name__)
+
+# Stages faster than this are not flagged (timer noise)
+MIN_COMPARE_S = 0.05
+
+
+def synthetic_market(
+    n_symbols: int,
+    seed: int = 0,
+    bars: Optional[Dict[str, int]] = None,
+    end_ms: Optional[int] = None,
+    **faults
+) -> OfflineMarket:
+    """
+    Random-walk market with `n_symbols` USDT pairs and matching CMC listings.
+
+    Market caps (30M-10B) and daily quote volumes (100k-100M) are
+    log-uniform, so the universe filters drop a realistic share.
+
+    Args:
+        n_symbols: Universe size
+        seed: RNG seed
+        bars: Candles per timeframe (default: 1d 150, 4h 200)
+        end_ms: Open time after the last closed candle (default: now)
+        **faults: Passed to OfflineMarket (latency_ms, rate_limit_rate, ...)
+
+    Returns:
+        OfflineMarket serving the synthetic data
+    """
+    rng = np.random.default_rng(seed)
+    bars = bars or {'1d': 150, '4h': 200}
+    end_ms = end_ms or int(time.time() * 1000)
+
+    symbols = [f"X{i:05d}USDT" for i in range(n_symbols)]
+    base_price = np.exp(rng.uniform(np.log(0.01), np.log(100.0), n_symbols))
+    daily_quote_volume = np.exp(rng.uniform(np.log(1e5), np.log(1e8), n_symbols))
+
+    candles: Dict[str, Dict[str, CandleArrays]] = {}
+    for tf, n in bars.items():
+        step = INTERVAL_MS[tf]
+        open_time = (end_ms // step - n + np.arange(n, dtype=np.int64)) * step
+        close_time = open_time + step - 1
+
+        scale = np.sqrt(step / INTERVAL_MS['1d'])
+        drift = rng.normal(0.0, 0.003, (n_symbols, 1)) * scale
+        vol = rng.uniform(0.02, 0.08, (n_symbols, 1)) * scale
+        close = base_price[:, None] * np.exp(np.cumsum(drift + vol * rng.standard_normal((n_symbols, n)), axis=1))
+        open_ = np.concatenate([close[:, :1], close[:, :-1]], axis=1)
+        wick = 1 + np.abs(rng.normal(0, 0.5, (2, n_symbols, n))) * vol
+        high = np.maximum(open_, close) * wick[0]
+        low = np.minimum(open_, close) / wick[1]
+        quote_volume = daily_quote_volume[:, None] * scale ** 2 * rng.lognormal(0.0, 0.5, (n_symbols, n))
+        volume = quote_volume / close
+
+        candles[tf] = {
+            symbol: CandleArrays(open_time, close_time, open_[i], high[i], low[i], close[i], volume[i], quote_volume[i])
+            for i, symbol in enumerate(symbols)
+        }
+
+    market_cap = np.exp(rng.uniform(np.log(3e7), np.log(1e10), n_symbols))
+    listings = [
+        {
+            "id": i + 1,
+            "name": f"Synthetic {symbol[:-4]}",
+            "symbol": symbol[:-4],
+            "slug": f"synthetic-{symbol[:-4].lower()}",
+            "cmc_rank": i + 1,
+            "platform": None,
+            "tags": [],
+            "quote": {"USD": {"price": float(candles['1d'][symbol].close[-1]), "market_cap": float(cap)}},
+        }
+        for i, (symbol, cap) in enumerate(zip(symbols, market_cap))
+    ]
+
+    return OfflineMarket(candles, listings, seed=seed, **faults)
+
+
+def benchmark_config(base: Dict[str, Any], n_symbols: int) -> ScannerConfig:
+    """Offline run over the whole filtered universe, without pacing or persisted candles."""
+    raw = copy.deepcopy(base)
+    raw.setdefault('general', {})['run_mode'] = 'offline'
+    raw.setdefault('shortlist', {})['max_size'] = n_symbols
+    raw.setdefault('data_sources', {}).setdefault('mexc', {})['rate_limit_per_sec'] = 1e9
+    raw.setdefault('ohlcv', {})['incremental_cache'] = False
+    return ScannerConfig(raw=raw)
+
+
+def _run_once(config: ScannerConfig, market: OfflineMarket, trace_memory: bool) -> Dict[str, Any]:
+    """Run the pipeline once in a scratch directory; returns its run profile."""
+    market.stats.clear()
+    reports_dir = offline_outputs(config.raw)['output']['reports_dir']
+
+    cwd = os.getcwd()
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        with tempfile.TemporaryDirectory(prefix="scanner-bench-") as workdir:
+            os.chdir(workdir)
+            run_pipeline(config, offline_market=market)
+            profile_path = next(Path(reports_dir).glob("*.profile.json"))
+            with open(profile_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    finally:
+        os.chdir(cwd)
+        if trace_memory:
+            tracemalloc.stop()
+
+
+def run_benchmark(
+    base_config: Dict[str, Any],
+    n_symbols: int,
+    seed: int = 0,
+    trace_memory: bool = True,
+    **faults
+) -> Dict[str, Any]:
+    """
+    Offline pipeline runs on one synthetic universe.
+
+    Wall times come from an untraced run; tracemalloc slows allocation-heavy
+    stages several-fold, so per-stage peak memory is taken from a second,
+    traced run.
+
+    Returns:
+        Result with total wall time, per-stage wall time / peak traced
+        memory, process peak RSS and stand-in request counts
+    """
+    market = synthetic_market(n_symbols, seed=seed, **faults)
+    config = benchmark_config(base_config, n_symbols)
+
+    profile = _run_once(config, market, trace_memory=False)
+    requests = sum(count for key, count in market.stats.items() if not key.startswith('fault_'))
+    stages = {
+        name: {'wall_s': stage['wall_s'], 'cpu_s': stage['cpu_s']}
+        for name, stage in profile['stages'].items()
+    }
+    if trace_memory:
+        traced = _run_once(config, market, trace_memory=True)
+        for name, stage in traced['stages'].items():
+            if name in stages:
+                stages[name]['peak_mb'] = stage['traced_peak_mb']
+
+    return {
+        'symbols': n_symbols,
+        'total_s': profile['total']['wall_s'],
+        'peak_rss_mb': peak_rss_mb(),
+        'requests': requests,
+        'bytes_downloaded': profile['total'].get('bytes_downloaded', 0),
+        'stages': stages,
+    }
+
+
+def load_history(path: Path) -> List[Dict[str, Any]]:
+    """Benchmark history (oldest first); empty if missing."""
+    if not path.exists():
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(
+    entry: Dict[str, Any],
+    history: Sequence[Dict[str, Any]],
+    threshold_pct: float
+) -> List[Dict[str, Any]]:
+    """
+    Stages slower than in the previous run of the same universe size.
+
+    Args:
+        entry: Current history entry
+        history: Earlier entries (oldest first)
+        threshold_pct: Allowed slow-down in percent
+
+    Returns:
+        One row per flagged stage: size, stage, previous / current wall time, change
+    """
+    regressions = []
+    for size, result in entry['results'].items():
+        previous = next((h['results'][size] for h in reversed(history) if size in h.get('results', {})), None)
+        if previous is None:
+            continue
+
+        for stage, timing in result['stages'].items():
+            before = previous['stages'].get(stage, {}).get('wall_s')
+            if before is None or max(before, timing['wall_s']) < MIN_COMPARE_S:
+                continue
+            change_pct = (timing['wall_s'] / before - 1) * 100 if before else float('inf')
+            if change_pct > threshold_pct:
+                regressions.append({
+                    'symbols': int(size),
+                    'stage': stage,
+                    'before_s': before,
+                    'after_s': timing['wall_s'],
+                    'change_pct': round(change_pct, 1),
+                })
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from ..config import load_config
+
+    cfg = load_config()
+    bench_config = cfg.raw.get('benchmark', {})
+
+    parser = argparse.ArgumentParser(description="End-to-end pipeline benchmark on synthetic universes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=bench_config.get('sizes', [100, 1000, 10000]),
+                        help="Universe sizes (symbols)")
+    parser.add_argument("--history", default=bench_config.get('history_file', 'reports/benchmark/history.json'),
+                        help="JSON history file (one entry appended per run)")
+    parser.add_argument("--threshold", type=float, default=bench_config.get('regression_threshold_pct', 20),
+                        help="Flag stages slower than the previous run by more than this percentage")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Stand-in latency per request")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Skip the tracemalloc run (no per-stage peak memory)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with 1 if a stage is flagged")
+    args = parser.parse_args(argv)
+
+    history_path = Path(args.history).resolve()
+    entry = {
+        'timestamp': datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'trace_memory': not args.no_memory,
+        'results': {},
+    }
+
+    for n_symbols in args.sizes:
+        result = run_benchmark(cfg.raw, n_symbols, seed=args.seed, trace_memory=not args.no_memory,
+                               latency_ms=args.latency_ms)
+        entry['results'][str(n_symbols)] = result
+
+        print(f"\n{n_symbols} symbols: {result['total_s']:.2f}s total, "
+              f"{result['requests']} requests, peak RSS {result['peak_rss_mb']:.0f} MB")
+        for stage, timing in result['stages'].items():
+            peak = f"  {timing['peak_mb']:8.1f} MB" if 'peak_mb' in timing else ""
+            print(f"  {stage:<10} {timing['wall_s']:8.3f}s{peak}")
+
+    history = load_history(history_path)
+    regressions = compare(entry, history, args.threshold)
+    for row in regressions:
+        print(f"REGRESSION {row['symbols']} symbols / {row['stage']}: "
+              f"{row['before_s']:.3f}s -> {row['after_s']:.3f}s (+{row['change_pct']}%)")
+
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(history_path, 'w', encoding='utf-8') as f:
+        json.dump(history + [entry], f, indent=2)
+    print(f"\nHistory: {history_path} ({len(history) + 1} entries)")
+
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,139 @@
+"""
+Background artifact writer.
+
+Serializing and writing run artifacts - raw snapshots, reports, the
+pipeline snapshot - is moved off the pipeline threads onto one background
+thread. Producers hand over finished data (rendered text, Arrow tables,
+workbooks) through a bounded queue, so a slow disk back-pressures the
+pipeline instead of piling up pending artifacts in memory. The pipeline
+joins the writer once, at exit.
+
+Like `profiling.count()`, `submit()` reaches the writer of the running
+pipeline without threading it through every client: the pipeline
+activates its writer, and without one (tests, tools, backtests) the job
+runs inline.
+
+Every file goes through `atomic_path()`: it is written under a temporary
+name in the target directory and renamed on success, so a partially
+written artifact never appears under its final name.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from . import profiling
+
+logger = logging.getLogger(__name__)
+
+_active: Optional["ArtifactWriter"] = None
+
+_STOP = object()
+
+
+@contextmanager
+def atomic_path(path: str | Path) -> Iterator[Path]:
+    """
+    Temporary path next to `path`; renamed to `path` when the block succeeds.
+
+    On failure the temporary file is removed and the previous version of
+    `path` (if any) is left untouched.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def write_text(path: str | Path, text: str) -> Path:
+    """Write a text file atomically (UTF-8)."""
+    with atomic_path(path) as tmp_path:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+    return Path(path)
+
+
+def submit(name: str, func: Callable[..., Any], *args, **kwargs) -> None:
+    """
+    Run `func(*args, **kwargs)` on the active writer (inline without one).
+
+    Arguments must not be modified by the caller afterwards.
+    """
+    writer = _active
+    if writer is None or threading.current_thread() is writer._thread:
+        func(*args, **kwargs)
+    else:
+        writer.submit(name, func, *args, **kwargs)
+
+
+class ArtifactWriter:
+    """Runs write jobs in submission order on one background thread."""
+
+    def __init__(self, max_pending: int = 16):
+        """
+        Initialize artifact writer.
+
+        Args:
+            max_pending: Queued jobs before `submit` blocks
+        """
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, int(max_pending or 1)))
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+        self.errors: List[Tuple[str, BaseException]] = []
+        self.written = 0
+
+    def activate(self) -> "ArtifactWriter":
+        """Route module-level `submit()` calls to this writer."""
+        global _active
+        _active = self
+        return self
+
+    def deactivate(self) -> None:
+        global _active
+        if _active is self:
+            _active = None
+
+    def submit(self, name: str, func: Callable[..., Any], *args, **kwargs) -> None:
+        """Queue a job (blocks while `max_pending` jobs are waiting)."""
+        if not self._thread.is_alive():
+            raise RuntimeError("ArtifactWriter is closed")
+        self._queue.put((name, func, args, kwargs))
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                return
+            name, func, args, kwargs = job
+            started = time.perf_counter()
+            try:
+                func(*args, **kwargs)
+                self.written += 1
+            except Exception as e:
+                logger.error(f"Writing {name} failed: {e}")
+                self.errors.append((name, e))
+            profiling.count('artifacts_written')
+            profiling.count('artifact_write_ms', round((time.perf_counter() - started) * 1000))
+
+    def close(self) -> List[Tuple[str, BaseException]]:
+        """
+        Finish all queued jobs and stop the thread.
+
+        Returns:
+            (job name, exception) for every failed job
+        """
+        self.deactivate()
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        return self.errors
@@ -0,0 +1,241 @@
+"""
+Response cache.
+
+API responses (exchangeInfo, 24h tickers, klines, CMC listings) used to be
+cached as `data/raw/<date>/<name>.json`: valid for the whole UTC day, never
+evicted. The cache here gives every entry an expiry from its resource:
+
+- exchange_info / listings: fixed TTL (default 24h)
+- tickers: fixed TTL (default 5 min)
+- klines: until the close of the current (still forming) candle
+
+Entries live under content-hash names (`<dir>/<h[:2]>/<h>.json`, h =
+sha256 of the cache key; `.json.gz` / `.json.zst` with compression) as
+compact JSON (see json_codec) with their expiry inside the file. The disk tier
+has a byte budget: when a write exceeds it, entries are evicted least
+recently used first (a hit touches the file's mtime). Recently used
+entries are also kept in memory, so repeated lookups in one process skip
+the JSON parse. Returned data is shared with the memory tier: treat it as
+read-only.
+
+Hits, misses, expirations and evictions are counted in the run profile.
+Like `profiling.count()`, the module-level `get_cache()` reaches the cache
+of the running pipeline; without an active one a default cache is used.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from . import json_codec, profiling
+from .time_utils import interval_to_ms
+
+_active: Optional["ResponseCache"] = None
+_default: Optional["ResponseCache"] = None
+_default_lock = threading.Lock()
+
+DEFAULT_TTL_S = {
+    "exchange_info": 24 * 3600,
+    "listings": 24 * 3600,
+    "tickers": 5 * 60,
+}
+
+# Resources without a configured TTL
+FALLBACK_TTL_S = 24 * 3600
+
+
+def get_cache() -> "ResponseCache":
+    """The active cache, or a process-wide default one."""
+    global _default
+    cache = _active
+    if cache is not None:
+        return cache
+    with _default_lock:
+        if _default is None:
+            _default = ResponseCache()
+        return _default
+
+
+def candle_close_ttl_s(interval: str, now_ms: Optional[int] = None) -> float:
+    """Seconds until the current candle of `interval` closes (UTC-aligned)."""
+    step = interval_to_ms(interval)
+    now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+    return ((now_ms // step + 1) * step - now_ms) / 1000
+
+
+class ResponseCache:
+    """Disk cache with per-resource TTLs, an LRU byte budget and a memory tier."""
+
+    def __init__(
+        self,
+        base_dir: str | Path = "data/cache",
+        max_bytes: int = 512 * 2**20,
+        memory_items: int = 256,
+        ttl_s: Optional[Dict[str, float]] = None,
+        compression: Optional[str] = None
+    ):
+        """
+        Initialize response cache.
+
+        Args:
+            base_dir: Cache directory
+            max_bytes: Disk budget; least recently used entries are evicted beyond it
+            memory_items: Entries kept in memory (0 disables the memory tier)
+            ttl_s: TTL overrides per resource (seconds)
+            compression: None, 'gzip' or 'zstd'
+        """
+        self.base_dir = Path(base_dir)
+        self.max_bytes = int(max_bytes)
+        self.memory_items = int(memory_items)
+        self.ttl_s = {**DEFAULT_TTL_S, **(ttl_s or {})}
+        self.compression = compression
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        # path -> (size, last use); built from a directory scan on first write
+        self._index: Optional[Dict[Path, Tuple[int, float]]] = None
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "ResponseCache":
+        """Build from the 'cache' config section."""
+        # Handle both dict and ScannerConfig object
+        if hasattr(config, 'raw'):
+            cache_config = config.raw.get('cache', {})
+        else:
+            cache_config = config.get('cache', {})
+
+        return cls(
+            base_dir=cache_config.get('dir', 'data/cache'),
+            max_bytes=int(cache_config.get('max_mb', 512) * 2**20),
+            memory_items=cache_config.get('memory_items', 256),
+            ttl_s=cache_config.get('ttl_s'),
+            compression=cache_config.get('compression'),
+        )
+
+    def activate(self) -> "ResponseCache":
+        """Route module-level `get_cache()` calls to this cache."""
+        global _active
+        _active = self
+        return self
+
+    def deactivate(self) -> None:
+        global _active
+        if _active is self:
+            _active = None
+
+    # -------------------------------------------------------------------------
+    # Lookup
+    # -------------------------------------------------------------------------
+    def path(self, key: str) -> Path:
+        """Content-hash file name of a cache key."""
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return json_codec.compressed_path(self.base_dir / digest[:2] / f"{digest}.json", self.compression)
+
+    def ttl(self, resource: Optional[str], interval: Optional[str] = None) -> float:
+        """TTL in seconds for a resource (klines: until the candle closes)."""
+        if resource == "klines" and interval:
+            return candle_close_ttl_s(interval)
+        return float(self.ttl_s.get(resource, FALLBACK_TTL_S))
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached data for `key`, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    profiling.count('cache_hits')
+                    profiling.count('cache_memory_hits')
+                    return entry[1]
+                del self._memory[key]
+
+        path = self.path(key)
+        try:
+            envelope = json_codec.load_file(path)
+        except (OSError, ValueError):
+            profiling.count('cache_misses')
+            return None
+
+        if envelope.get('key') != key or envelope.get('expires_at', 0) <= now:
+            profiling.count('cache_misses')
+            profiling.count('cache_expired')
+            with self._lock:
+                self._remove(path)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            if self._index is not None and path in self._index:
+                self._index[path] = (self._index[path][0], now)
+            self._remember(key, envelope['expires_at'], envelope['data'])
+        profiling.count('cache_hits')
+        return envelope['data']
+
+    def put(self, key: str, data: Any, ttl_s: float) -> Path:
+        """Store `data` under `key` for `ttl_s` seconds."""
+        now = time.time()
+        expires_at = now + ttl_s
+        path = self.path(key)
+        json_codec.dump_file({'key': key, 'expires_at': expires_at, 'data': data}, path)
+
+        with self._lock:
+            self._remember(key, expires_at, data)
+            index = self._load_index()
+            size = path.stat().st_size
+            self._bytes += size - index.get(path, (0, 0))[0]
+            index[path] = (size, now)
+            self._evict(keep=path)
+        return path
+
+    # -------------------------------------------------------------------------
+    # Memory tier / eviction (callers hold the lock)
+    # -------------------------------------------------------------------------
+    def _remember(self, key: str, expires_at: float, data: Any) -> None:
+        if self.memory_items <= 0:
+            return
+        self._memory[key] = (expires_at, data)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _load_index(self) -> Dict[Path, Tuple[int, float]]:
+        if self._index is None:
+            self._index = {}
+            for path in self.base_dir.glob("*/*.json*"):
+                if path.name.startswith("."):  # in-flight temp files
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                self._index[path] = (stat.st_size, stat.st_mtime)
+            self._bytes = sum(size for size, _ in self._index.values())
+        return self._index
+
+    def _evict(self, keep: Path) -> None:
+        if self._bytes <= self.max_bytes:
+            return
+        for path, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if self._bytes <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            self._remove(path)
+            profiling.count('cache_evictions')
+            profiling.count('cache_evicted_bytes', size)
+
+    def _remove(self, path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        if self._index is not None and path in self._index:
+            self._bytes -= self._index.pop(path)[0]
@@ -0,0 +1,220 @@
+"""
+Persistent candle store.
+
+Keeps one growing kline history per symbol/interval across runs, so daily
+runs only download the missing tail instead of the full lookback window.
+
+Candles are stored column-wise as NumPy arrays and opened with
+`np.load(mmap_mode='r')`, so readers slice contiguous float64 columns
+directly instead of parsing JSON and converting strings.
+
+Layout:
+    <base_dir>/<interval>/<symbol>.time.npy    int64   (2, n): open_time, close_time
+    <base_dir>/<interval>/<symbol>.ohlcv.npy   float64 (6, n): open, high, low, close,
+                                                               volume, quote_volume
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .io_utils import load_json
+
+logger = logging.getLogger(__name__)
+
+# close_time placeholder for klines that do not carry one (never "closed")
+MISSING_TIME = np.iinfo(np.int64).max
+
+
+@dataclass(frozen=True)
+class CandleArrays:
+    """Column view of a kline series (oldest first)."""
+
+    open_time: np.ndarray
+    close_time: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    quote_volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.open_time)
+
+    @classmethod
+    def from_klines(cls, klines: Sequence[Sequence]) -> "CandleArrays":
+        """
+        Build columns from MEXC kline rows.
+
+        Rows: [openTime, open, high, low, close, volume, closeTime, quoteVolume]
+        (closeTime and quoteVolume are optional).
+        """
+        n = len(klines)
+        times = np.full((2, n), MISSING_TIME, dtype=np.int64)
+        values = np.full((6, n), np.nan, dtype=np.float64)
+
+        for i, k in enumerate(klines):
+            times[0, i] = int(float(k[0]))
+            if len(k) > 6 and k[6] is not None:
+                try:
+                    times[1, i] = int(float(k[6]))
+                except (TypeError, ValueError):
+                    pass
+            values[0:5, i] = [float(v) for v in k[1:6]]
+            if len(k) > 7 and k[7] is not None:
+                values[5, i] = float(k[7])
+
+        return cls._from_blocks(times, values)
+
+    @classmethod
+    def _from_blocks(cls, times: np.ndarray, values: np.ndarray) -> "CandleArrays":
+        return cls(
+            open_time=times[0], close_time=times[1],
+            open=values[0], high=values[1], low=values[2], close=values[3],
+            volume=values[4], quote_volume=values[5],
+        )
+
+    def _blocks(self) -> tuple[np.ndarray, np.ndarray]:
+        times = np.vstack([self.open_time, self.close_time]).astype(np.int64, copy=False)
+        values = np.vstack([
+            self.open, self.high, self.low, self.close, self.volume, self.quote_volume
+        ]).astype(np.float64, copy=False)
+        return times, values
+
+    def tail(self, n: int) -> "CandleArrays":
+        """Newest `n` candles (views, no copy)."""
+        start = max(len(self) - n, 0)
+        return CandleArrays(*(getattr(self, f)[start:] for f in self.__dataclass_fields__))
+
+    def to_klines(self) -> List[List]:
+        """Convert back to MEXC-style kline rows (numbers, not strings)."""
+        rows = []
+        for i in range(len(self)):
+            close_time = int(self.close_time[i])
+            quote_volume = float(self.quote_volume[i])
+            rows.append([
+                int(self.open_time[i]),
+                float(self.open[i]), float(self.high[i]), float(self.low[i]),
+                float(self.close[i]), float(self.volume[i]),
+                None if close_time == MISSING_TIME else close_time,
+                None if np.isnan(quote_volume) else quote_volume,
+            ])
+        return rows
+
+
+class CandleStore:
+    """Per-symbol/interval kline history, merged and de-duplicated on openTime."""
+
+    def __init__(self, base_dir: str | Path = "data/candles", max_candles: int = 1000):
+        """
+        Initialize candle store.
+
+        Args:
+            base_dir: Root directory of the store
+            max_candles: Candles retained per symbol/interval (oldest dropped first)
+        """
+        self.base_dir = Path(base_dir)
+        self.max_candles = max_candles
+
+    def _paths(self, symbol: str, interval: str) -> tuple[Path, Path]:
+        base = self.base_dir / interval
+        return base / f"{symbol}.time.npy", base / f"{symbol}.ohlcv.npy"
+
+    def load(self, symbol: str, interval: str) -> Optional[CandleArrays]:
+        """
+        Open stored candles as memory-mapped columns.
+
+        Returns:
+            CandleArrays, or None if nothing is stored or the files are unreadable
+        """
+        time_path, ohlcv_path = self._paths(symbol, interval)
+
+        if not time_path.exists():
+            return self._load_legacy_json(symbol, interval)
+
+        try:
+            times = np.load(time_path, mmap_mode='r')
+            values = np.load(ohlcv_path, mmap_mode='r')
+        except Exception as e:
+            logger.warning(f"Discarding unreadable candle store {time_path}: {e}")
+            return None
+
+        if times.shape[1] != values.shape[1]:
+            logger.warning(f"Discarding inconsistent candle store {time_path}")
+            return None
+
+        return CandleArrays._from_blocks(times, values)
+
+    def _load_legacy_json(self, symbol: str, interval: str) -> Optional[CandleArrays]:
+        """Read (and convert) a history written by the earlier JSON store."""
+        json_path = self.base_dir / interval / f"{symbol}.json"
+        if not json_path.exists():
+            return None
+
+        try:
+            candles = CandleArrays.from_klines(load_json(json_path))
+        except Exception as e:
+            logger.warning(f"Discarding unreadable candle store {json_path}: {e}")
+            return None
+
+        self.save(symbol, interval, candles)
+        json_path.unlink()
+        return candles
+
+    def save(self, symbol: str, interval: str, candles: CandleArrays | Sequence[Sequence]) -> None:
+        """
+        Replace stored candles for one symbol/interval.
+
+        Files are written to a temp name and renamed, so readers holding a
+        memory map of the previous version keep a valid (old) file.
+        """
+        if not isinstance(candles, CandleArrays):
+            candles = CandleArrays.from_klines(candles)
+        times, values = candles.tail(self.max_candles)._blocks()
+
+        for path, block in zip(self._paths(symbol, interval), (times, values)):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(path.name + ".tmp")
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.ascontiguousarray(block))
+            os.replace(tmp_path, path)
+
+    def last_open_time(self, symbol: str, interval: str) -> Optional[int]:
+        """openTime of the newest stored kline (None if empty)."""
+        candles = self.load(symbol, interval)
+        return int(candles.open_time[-1]) if candles is not None and len(candles) else None
+
+    def merge(self, symbol: str, interval: str, klines: CandleArrays | Sequence[Sequence]) -> CandleArrays:
+        """
+        Merge new klines into the store and persist the result.
+
+        Rows are keyed on openTime; a fetched row replaces a stored one, so a
+        candle that was still open at the previous run gets its final values.
+
+        Returns:
+            Merged history (oldest first, at most `max_candles`)
+        """
+        new = klines if isinstance(klines, CandleArrays) else CandleArrays.from_klines(klines)
+        stored = self.load(symbol, interval)
+
+        new_times, new_values = new._blocks()
+        if stored is not None and len(stored):
+            old_times, old_values = stored._blocks()
+            times = np.concatenate([old_times, new_times], axis=1)
+            values = np.concatenate([old_values, new_values], axis=1)
+        else:
+            times, values = new_times, new_values
+
+        # Stable sort keeps stored rows before fetched ones; keep the last per openTime
+        order = np.argsort(times[0], kind='stable')
+        times, values = times[:, order], values[:, order]
+        keep = np.r_[times[0, 1:] != times[0, :-1], True] if times.shape[1] else np.ones(0, bool)
+        merged = CandleArrays._from_blocks(times[:, keep], values[:, keep]).tail(self.max_candles)
+
+        self.save(symbol, interval, merged)
+        return merged
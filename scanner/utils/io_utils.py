@@ -2,15 +2,16 @@
 I/O utilities for file operations and caching.
 """
 
-import json
 from pathlib import Path
 from typing import Any, Optional
-from datetime import datetime
+
+from . import json_codec
+from .cache import get_cache
 
 
 def load_json(filepath: str | Path) -> dict | list:
     """
-    Load JSON from file.
+    Load JSON from file (.gz / .zst files are decompressed).
     
     Args:
         filepath: Path to JSON file
@@ -20,69 +21,65 @@ def load_json(filepath: str | Path) -> dict | list:
         
     Raises:
         FileNotFoundError: If file doesn't exist
-        json.JSONDecodeError: If file is not valid JSON
+        ValueError: If file is not valid JSON
     """
-    filepath = Path(filepath)
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return json_codec.load_file(filepath)
 
 
-def save_json(data: Any, filepath: str | Path, indent: int = 2) -> None:
+def save_json(data: Any, filepath: str | Path, indent: Optional[int] = 2) -> None:
     """
-    Save data as JSON to file.
+    Save data as JSON to file (atomically; compressed for .gz / .zst paths).
     
     Args:
         data: Data to serialize
         filepath: Output file path
-        indent: JSON indentation (default: 2)
+        indent: 2 for files people read (default), None for compact output
     """
-    filepath = Path(filepath)
-    filepath.parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=indent, ensure_ascii=False)
+    json_codec.dump_file(data, filepath, pretty=indent is not None)
 
 
-def get_cache_path(cache_type: str, date: Optional[str] = None) -> Path:
+def get_cache_path(cache_type: str) -> Path:
     """
-    Get standardized cache file path.
+    Get cache file path (content-hash name, see scanner.utils.cache).
     
     Args:
-        cache_type: Type of cache (e.g., 'universe', 'marketcap', 'klines')
-        date: Date string (YYYY-MM-DD), defaults to today
+        cache_type: Cache key (e.g., 'mexc_24h_tickers', 'mexc_klines_BTCUSDT_1d')
         
     Returns:
         Path to cache file
     """
-    if date is None:
-        from .time_utils import utc_date
-        date = utc_date()
-    
-    cache_dir = Path("data/raw") / date
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    
-    return cache_dir / f"{cache_type}.json"
+    return get_cache().path(cache_type)
 
 
-def cache_exists(cache_type: str, date: Optional[str] = None) -> bool:
-    """Check if cache file exists for given type and date."""
-    return get_cache_path(cache_type, date).exists()
+def cache_exists(cache_type: str) -> bool:
+    """Check if an unexpired cache entry exists for the given key."""
+    return load_cache(cache_type) is not None
 
 
-def load_cache(cache_type: str, date: Optional[str] = None) -> Optional[dict | list]:
+def load_cache(cache_type: str) -> Optional[dict | list]:
     """
-    Load cached data if exists.
+    Load cached data if present and not expired.
     
     Returns:
-        Cached data or None if not found
+        Cached data (shared, treat as read-only) or None if not found
     """
-    cache_path = get_cache_path(cache_type, date)
-    if cache_path.exists():
-        return load_json(cache_path)
-    return None
+    return get_cache().get(cache_type)
 
 
-def save_cache(data: Any, cache_type: str, date: Optional[str] = None) -> None:
-    """Save data to cache."""
-    cache_path = get_cache_path(cache_type, date)
-    save_json(data, cache_path)
+def save_cache(
+    data: Any,
+    cache_type: str,
+    resource: Optional[str] = None,
+    interval: Optional[str] = None
+) -> None:
+    """
+    Save data to cache.
+    
+    Args:
+        data: Data to cache
+        cache_type: Cache key
+        resource: TTL class ('exchange_info', 'tickers', 'klines', 'listings')
+        interval: Candle interval (klines: cached until the candle closes)
+    """
+    cache = get_cache()
+    cache.put(cache_type, data, cache.ttl(resource, interval))
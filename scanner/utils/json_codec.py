@@ -0,0 +1,121 @@
+"""
+JSON serialization for machine-written artifacts.
+
+API caches, candle store state and JSON snapshots go through `dumps` /
+`loads` / `dump_file` / `load_file` instead of stdlib `json` with
+`indent=2`:
+
+- backend: orjson when installed (several times faster in both
+  directions), stdlib json otherwise; `SCANNER_JSON_BACKEND=json` forces
+  the stdlib
+- compact output by default; `pretty=True` (indent 2) for files people read
+- optional compression, chosen by file suffix: `.gz` (gzip) or `.zst`
+  (zstandard, when installed)
+
+orjson writes NaN/Infinity as null, like the JSON spec requires (stdlib
+json writes non-standard NaN tokens). Values orjson cannot serialize
+(e.g. integers beyond 64 bit) fall back to stdlib json.
+"""
+
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+from .artifact_writer import atomic_path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def backend() -> str:
+    """JSON backend in use ('orjson' or 'json')."""
+    if orjson is not None and os.getenv("SCANNER_JSON_BACKEND", "orjson") != "json":
+        return "orjson"
+    return "json"
+
+
+def dumps(data: Any, pretty: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON (compact unless `pretty`)."""
+    if backend() == "orjson":
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(data, option=option)
+        except TypeError:
+            pass
+
+    if pretty:
+        text = json.dumps(data, indent=2, ensure_ascii=False)
+    else:
+        text = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    return text.encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON text or UTF-8 bytes."""
+    if backend() == "orjson":
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def check_compression(compression: Optional[str]) -> None:
+    """Raise if `compression` is not None, 'gzip' or an available 'zstd'."""
+    if compression and compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unknown JSON compression: {compression} (use gzip or zstd)")
+    if compression == "zstd" and zstandard is None:
+        raise ImportError("zstd compression requires the 'zstandard' package")
+
+
+def compressed_path(path: str | Path, compression: Optional[str]) -> Path:
+    """`path` with the suffix of `compression` ('gzip', 'zstd' or None) appended."""
+    check_compression(compression)
+    path = Path(path)
+    if not compression:
+        return path
+    return path.with_name(path.name + COMPRESSION_SUFFIXES[compression])
+
+
+def compress(data: bytes, path: str | Path) -> bytes:
+    """Compress `data` as the suffix of `path` says (unchanged otherwise)."""
+    suffix = Path(path).suffix
+    if suffix == ".gz":
+        return gzip.compress(data, compresslevel=6)
+    if suffix == ".zst":
+        return zstandard.ZstdCompressor().compress(data)
+    return data
+
+
+def decompress(data: bytes, path: str | Path) -> bytes:
+    """Inverse of `compress`."""
+    suffix = Path(path).suffix
+    if suffix == ".gz":
+        return gzip.decompress(data)
+    if suffix == ".zst":
+        return zstandard.ZstdDecompressor().decompress(data)
+    return data
+
+
+def dump_file(data: Any, path: str | Path, pretty: bool = False) -> Path:
+    """Write `data` as JSON to `path` atomically (compressed per suffix)."""
+    path = Path(path)
+    with atomic_path(path) as tmp_path:
+        tmp_path.write_bytes(compress(dumps(data, pretty=pretty), path))
+    return path
+
+
+def load_file(path: str | Path) -> Any:
+    """Read a JSON file written by `dump_file` (or any plain JSON file)."""
+    path = Path(path)
+    return loads(decompress(path.read_bytes(), path))
@@ -0,0 +1,228 @@
+"""
+Market-cap history store.
+
+Append-only history of CMC listings keyed by (cmc_id, snapshot date).
+Every run used to normalize and re-write the full listing payload
+(~5,000 rows) even when it came from the day's cache; the store instead
+
+- skips the write entirely when the payload hash equals the last one, and
+- otherwise appends only the rows and columns that changed since the
+  previous state (static fields like name, slug or tags are written once).
+
+Listings that disappear get a row with `listed = False`, so point-in-time
+lookups do not resurrect delisted coins.
+
+Layout:
+    <base_dir>/parts/snapshot_date=<YYYY-MM-DD>/<run_id>.parquet
+        changed rows x changed columns (plus cmc_id)
+    <base_dir>/latest.parquet
+        current full state (schema metadata: payload hash, date, run id)
+
+A value as of a date is the value from the newest part up to that date
+that contains both the row and the column, so `load_asof` / `history`
+read each part once.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .artifact_writer import atomic_path
+
+logger = logging.getLogger(__name__)
+
+KEY = "cmc_id"
+LATEST = "latest.parquet"
+META_KEY = b"marketcap_store"
+
+
+def payload_hash(listings: Sequence[Dict[str, Any]]) -> str:
+    """Stable hash of a CMC listing payload."""
+    text = json.dumps(listings, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def flatten_listings(listings: Sequence[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    CMC listings as a flat table indexed by cmc_id.
+
+    Nested dicts become `__`-joined columns (quote__USD__market_cap);
+    remaining dicts/lists are stored as JSON text (same layout as the raw
+    marketcap snapshot).
+    """
+    df = pd.json_normalize(list(listings), sep="__")
+    for col in df.columns:
+        if df[col].dtype == "object" and df[col].map(lambda v: isinstance(v, (dict, list))).any():
+            df[col] = df[col].map(
+                lambda v: json.dumps(v, ensure_ascii=False) if isinstance(v, (dict, list)) else v
+            )
+    df = df.rename(columns={"id": KEY}).set_index(KEY)
+    df["listed"] = True
+    return df
+
+
+def _changed(current: pd.DataFrame, previous: pd.DataFrame) -> pd.DataFrame:
+    """Cell-wise "differs from previous" (null == null; rows new to the store: changed)."""
+    cur = current.astype(object)
+    prev = previous.reindex(index=current.index, columns=current.columns).astype(object)
+    same = (cur == prev) | (cur.isna() & prev.isna())
+    same.loc[~current.index.isin(previous.index)] = False
+    return ~same
+
+
+def _last(series: List[pd.Series]) -> pd.Series:
+    """Concatenate per-part values; the newest value per cmc_id wins."""
+    values = pd.concat(series)
+    return values[~values.index.duplicated(keep="last")]
+
+
+class MarketCapHistoryStore:
+    """Append-only, change-only history of CMC listings."""
+
+    def __init__(self, base_dir: str | Path = "data/raw/marketcap"):
+        """
+        Initialize market-cap history store.
+
+        Args:
+            base_dir: Root directory of the store
+        """
+        self.base_dir = Path(base_dir)
+
+    # -------------------------------------------------------------------------
+    # Write
+    # -------------------------------------------------------------------------
+    def latest(self) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """Current full state (indexed by cmc_id) and its metadata; empty if none."""
+        path = self.base_dir / LATEST
+        if not path.exists():
+            return pd.DataFrame(index=pd.Index([], name=KEY)), {}
+
+        table = pq.read_table(path)
+        meta = json.loads((table.schema.metadata or {}).get(META_KEY, b"{}"))
+        return table.to_pandas().set_index(KEY), meta
+
+    def append(
+        self,
+        listings: Sequence[Dict[str, Any]],
+        snapshot_date: str,
+        run_id: Optional[str] = None
+    ) -> Optional[Path]:
+        """
+        Record a listing payload.
+
+        Args:
+            listings: CMC listings (`data` of listings/latest)
+            snapshot_date: Date the payload belongs to (YYYY-MM-DD)
+            run_id: Orders several payloads of one day (default: snapshot_date)
+
+        Returns:
+            Path of the written part, or None if nothing changed
+        """
+        run_id = run_id or snapshot_date
+        digest = payload_hash(listings)
+        previous, meta = self.latest()
+        if meta.get("payload_hash") == digest:
+            logger.info(f"Market-cap history: payload unchanged since {meta.get('run_id')}, nothing written")
+            return None
+
+        current = flatten_listings(listings)
+        # Listings that disappeared since the last payload
+        gone = previous.index.difference(current.index)
+        if len(gone):
+            delisted = previous.loc[gone]
+            delisted = delisted[delisted["listed"].fillna(False).astype(bool)]
+            current = pd.concat([current, delisted.assign(listed=False)])
+
+        changed = _changed(current, previous)
+        rows = changed.any(axis=1)
+        columns = changed.columns[changed.any(axis=0)]
+
+        part_path = None
+        if rows.any():
+            part = current.loc[rows, columns].reset_index()
+            part_path = self.base_dir / "parts" / f"snapshot_date={snapshot_date}" / f"{run_id}.parquet"
+            with atomic_path(part_path) as tmp_path:
+                part.to_parquet(tmp_path, index=False)
+            logger.info(f"Market-cap history: {len(part)} rows x {len(columns)} columns changed -> {part_path}")
+
+        # New full state: current payload plus coins delisted earlier
+        state = pd.concat([current, previous.loc[previous.index.difference(current.index)]])
+        table = pa.Table.from_pandas(state.reset_index(), preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            META_KEY: json.dumps({"payload_hash": digest, "snapshot_date": snapshot_date, "run_id": run_id}),
+        })
+        with atomic_path(self.base_dir / LATEST) as tmp_path:
+            pq.write_table(table, tmp_path)
+
+        return part_path
+
+    # -------------------------------------------------------------------------
+    # Read
+    # -------------------------------------------------------------------------
+    def _parts(self, until: Optional[str] = None) -> List[Tuple[str, str, Path]]:
+        """(snapshot_date, run_id, path) up to `until`, oldest first."""
+        parts = []
+        for path in (self.base_dir / "parts").glob("snapshot_date=*/*.parquet"):
+            snapshot_date = path.parent.name.split("=", 1)[1]
+            if until is None or snapshot_date <= until:
+                parts.append((snapshot_date, path.stem, path))
+        return sorted(parts)
+
+    def load_asof(self, date: Optional[str] = None, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Listings as known on `date` (default: newest), indexed by cmc_id.
+
+        Args:
+            date: Snapshot date (YYYY-MM-DD), inclusive
+            columns: Flattened columns to return (default: all)
+
+        Returns:
+            One row per listed coin
+        """
+        values: Dict[str, List[pd.Series]] = {}
+        for _, _, path in self._parts(date):
+            available = pq.read_schema(path).names
+            wanted = [c for c in available if c != KEY and (columns is None or c in columns or c == "listed")]
+            if not wanted:
+                continue
+            part = pd.read_parquet(path, columns=[KEY, *wanted]).set_index(KEY)
+            for column in wanted:
+                values.setdefault(column, []).append(part[column])
+
+        if not values:
+            return pd.DataFrame(columns=list(columns or []), index=pd.Index([], name=KEY))
+
+        df = pd.DataFrame({column: _last(series) for column, series in values.items()})
+        df = df[df["listed"].fillna(False).astype(bool)].drop(columns="listed")
+        if columns is not None:
+            df = df.reindex(columns=[c for c in columns if c != "listed"])
+        df.index.name = KEY
+        return df
+
+    def history(self, column: str, cmc_ids: Optional[Sequence[int]] = None) -> pd.DataFrame:
+        """
+        Change points of one column: (snapshot_date, cmc_id, value), oldest first.
+
+        The value holds from its snapshot_date until the next change point.
+        """
+        frames = []
+        for snapshot_date, _, path in self._parts():
+            if column not in pq.read_schema(path).names:
+                continue
+            part = pd.read_parquet(path, columns=[KEY, column])
+            if cmc_ids is not None:
+                part = part[part[KEY].isin(cmc_ids)]
+            frames.append(part.rename(columns={column: "value"}).assign(snapshot_date=snapshot_date))
+
+        if not frames:
+            return pd.DataFrame(columns=["snapshot_date", KEY, "value"])
+        df = pd.concat(frames, ignore_index=True)[["snapshot_date", KEY, "value"]]
+        # Several runs on one day: the last one counts
+        return df.drop_duplicates(["snapshot_date", KEY], keep="last").reset_index(drop=True)
@@ -0,0 +1,157 @@
+"""
+Run profiling utilities.
+
+RunProfiler records one entry per pipeline stage: wall time, process CPU
+time, process peak RSS (high-water mark at the end of the stage) and
+counters reported from anywhere in the code via `count()` - API calls,
+bytes downloaded, cache hits/misses. With tracemalloc running, the peak of
+traced allocations within the stage is added as well.
+
+Counters reach the profiler of the running pipeline without threading it
+through every client: the pipeline activates its profiler, and `count()`
+is a no-op when none is active (tests, tools, backtests).
+"""
+
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_active: Optional["RunProfiler"] = None
+
+# Stage entries that are measurements, not counters
+MEASURES = ('wall_s', 'cpu_s', 'peak_rss_mb', 'traced_peak_mb')
+
+
+def count(counter: str, n: int = 1) -> None:
+    """Add to a counter of the active profiler (no-op without one)."""
+    profiler = _active
+    if profiler is not None:
+        profiler.count(counter, n)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Process peak resident set size in MB (None where unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (2**20 if sys.platform == 'darwin' else 2**10), 1)
+
+
+class RunProfiler:
+    """Per-stage wall/CPU time, peak RSS and counters of one pipeline run."""
+
+    def __init__(self):
+        self.started_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._open: Dict[str, tuple] = {}
+        self._counters: Dict[str, Counter] = {}
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+
+    def activate(self) -> "RunProfiler":
+        """Route module-level `count()` calls to this profiler."""
+        global _active
+        _active = self
+        return self
+
+    def deactivate(self) -> None:
+        global _active
+        if _active is self:
+            _active = None
+
+    # -------------------------------------------------------------------------
+    # Stages
+    # -------------------------------------------------------------------------
+    def _begin(self, name: str) -> None:
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        with self._lock:
+            self._open[name] = (time.perf_counter(), time.process_time())
+            self._counters.setdefault(name, Counter())
+
+    def _end(self, name: str) -> None:
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        with self._lock:
+            wall0, cpu0 = self._open.pop(name)
+            stage = {
+                'wall_s': round(wall - wall0, 4),
+                'cpu_s': round(cpu - cpu0, 4),
+                'peak_rss_mb': peak_rss_mb(),
+            }
+            if tracemalloc.is_tracing():
+                stage['traced_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+            stage.update(sorted(self._counters.pop(name).items()))
+            self.stages[name] = stage
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Record a block as a stage; stages may run concurrently.
+
+        Counters from the calling thread go to this stage. CPU time is
+        process-wide, so overlapping stages share the CPU they overlap with.
+        """
+        self._begin(name)
+        previous = getattr(self._local, 'stage', None)
+        self._local.stage = name
+        try:
+            yield
+        finally:
+            self._local.stage = previous
+            self._end(name)
+
+    def count(self, counter: str, n: int = 1) -> None:
+        """
+        Add to a counter of the stage running in this thread, else of the
+        only open stage (a stage's own worker threads), else 'unstaged'.
+        """
+        name = getattr(self._local, 'stage', None)
+        with self._lock:
+            if name is None:
+                name = next(iter(self._open)) if len(self._open) == 1 else 'unstaged'
+            self._counters.setdefault(name, Counter())[counter] += n
+
+    # -------------------------------------------------------------------------
+    # Output
+    # -------------------------------------------------------------------------
+    def to_dict(self) -> Dict[str, Any]:
+        """Profile so far: completed stages plus run totals."""
+        with self._lock:
+            stages = {name: dict(stage) for name, stage in self.stages.items()}
+            unstaged = dict(self._counters.get('unstaged', {}))
+
+        counters: Counter = Counter(unstaged)
+        for stage in stages.values():
+            counters.update({key: value for key, value in stage.items() if key not in MEASURES})
+
+        return {
+            'started_at': self.started_at,
+            'total': {
+                'wall_s': round(time.perf_counter() - self._wall0, 4),
+                'cpu_s': round(time.process_time() - self._cpu0, 4),
+                'peak_rss_mb': peak_rss_mb(),
+                **dict(sorted(counters.items())),
+            },
+            'stages': stages,
+        }
+
+    def save(self, path: str | Path) -> Path:
+        """Write the profile as JSON (atomically, see artifact_writer.atomic_path)."""
+        # Imported here: json_codec -> artifact_writer -> profiling
+        from . import json_codec
+        return json_codec.dump_file(self.to_dict(), path, pretty=True)
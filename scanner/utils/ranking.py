@@ -0,0 +1,79 @@
+"""
+Ranking utilities.
+
+Partial top-k selection (O(n log k)) instead of sorting everything when
+only the best few rows are used. Order is deterministic: value descending,
+ties broken by label (symbol) ascending, NaN ranked last.
+"""
+
+import heapq
+import math
+from typing import Any, Callable, List, Optional, Sequence
+
+import numpy as np
+
+
+def _rank_key(value: float, label: str) -> tuple:
+    return (math.inf if value != value else -value, label)
+
+
+def top_k(
+    items: Sequence[Any],
+    k: Optional[int],
+    value: Callable[[Any], float],
+    label: Callable[[Any], str] = lambda item: item['symbol']
+) -> List[Any]:
+    """
+    Best `k` items, ranked.
+
+    Args:
+        items: Items to rank
+        k: Number of items to keep (None: full ranking)
+        value: Ranking value of an item (higher is better)
+        label: Tie-break label of an item (lower wins)
+
+    Returns:
+        Ranked list of at most `k` items
+    """
+    def sort_key(item):
+        return _rank_key(value(item), label(item))
+
+    if k is None or k >= len(items):
+        return sorted(items, key=sort_key)
+    return heapq.nsmallest(max(k, 0), items, key=sort_key)
+
+
+def top_k_indices(
+    values: np.ndarray,
+    labels: Sequence[str],
+    k: Optional[int],
+    mask: Optional[np.ndarray] = None
+) -> List[int]:
+    """
+    Row indices of the best `k` entries of a value column, ranked.
+
+    Uses np.partition to find the k-th best value and only sorts the rows
+    at or above it (boundary ties included, so the label tie-break holds).
+
+    Args:
+        values: Ranking values (higher is better, NaN last)
+        labels: Tie-break label per row (lower wins)
+        k: Number of rows to keep (None: full ranking)
+        mask: Rows eligible for ranking (default: all)
+
+    Returns:
+        Ranked list of at most `k` row indices
+    """
+    candidates = np.arange(len(values)) if mask is None else np.flatnonzero(mask)
+    keys = -np.asarray(values, dtype=float)[candidates]
+    keys[np.isnan(keys)] = np.inf
+
+    if k is not None and k < len(candidates):
+        if k <= 0:
+            return []
+        kth = np.partition(keys, k - 1)[k - 1]
+        within = keys <= kth
+        candidates, keys = candidates[within], keys[within]
+
+    order = sorted(range(len(candidates)), key=lambda j: (keys[j], labels[candidates[j]]))
+    return [int(candidates[j]) for j in order[:k]]
@@ -0,0 +1,66 @@
+"""
+Rate limiting utilities.
+
+Thread-safe token bucket shared by all workers that talk to the same API.
+Requests carry a weight (MEXC counts heavy endpoints as several requests),
+so a single bucket can enforce the exchange's weighted request budget.
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Token bucket limiter with weighted reservations.
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    A caller reserves `weight` tokens; if the bucket runs dry the balance
+    goes negative and the caller is told how long to wait. Reservations are
+    taken under a lock, so concurrent callers are served in arrival order
+    and the long-run throughput never exceeds `rate`.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Tokens (request weight) refilled per second
+            capacity: Maximum burst size (default: one second worth of tokens)
+        """
+        if rate <= 0:
+            raise ValueError(f"rate must be > 0, got {rate}")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else float(rate)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._last_refill = now
+
+    def reserve(self, weight: float = 1.0) -> float:
+        """
+        Reserve `weight` tokens.
+
+        Returns:
+            Seconds the caller must wait before sending the request (0 if none)
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= weight
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, weight: float = 1.0) -> None:
+        """Block until `weight` tokens are available."""
+        wait = self.reserve(weight)
+        if wait > 0:
+            time.sleep(wait)
@@ -11,16 +11,50 @@ Ziel:
 - Kein Code-Duplikat in den Clients oder Pipelines
 """
 
+import os
 import json
 import pandas as pd
-from typing import List, Dict, Any
-from scanner.utils.save_raw import save_raw_snapshot
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from scanner.utils.save_raw import (
+    save_raw_snapshot, raw_base_dir, raw_run_id, raw_run_dir, csv_export_enabled, csv_gzip_enabled
+)
+from scanner.utils.artifact_writer import submit
+from scanner.utils.candle_store import CandleArrays, MISSING_TIME
+from scanner.utils.marketcap_store import MarketCapHistoryStore
+from scanner.utils.time_utils import interval_to_ms
 
 
 # ===============================================================
 # OHLCV Snapshots
 # ===============================================================
 
+# Spalten einer Partition (date/timeframe stecken im Pfad, nicht in der Datei)
+OHLCV_DATASET_SCHEMA = pa.schema([
+    ("symbol", pa.dictionary(pa.int32(), pa.string())),
+    ("open_time", pa.int64()),
+    ("close_time", pa.int64()),
+    ("open", pa.float64()),
+    ("high", pa.float64()),
+    ("low", pa.float64()),
+    ("close", pa.float64()),
+    ("volume", pa.float64()),
+    ("quote_volume", pa.float64()),
+])
+OHLCV_DATASET_DIR = "ohlcv"
+
+
+def ohlcv_partition_path(base_root: str, run_id: str, timeframe: str) -> str:
+    """<BASEDIR>/ohlcv/date=<YYYY-MM-DD>/timeframe=<tf>/<RUN_ID>.parquet"""
+    return os.path.join(
+        base_root, OHLCV_DATASET_DIR, f"date={run_id[:10]}", f"timeframe={timeframe}", f"{run_id}.parquet"
+    )
+
+
 def collect_raw_ohlcv(results: Dict[str, Dict[str, Any]]):
     """
     Speichert alle OHLCV-Daten als Rohdaten-Snapshot.
@@ -31,40 +65,310 @@ def collect_raw_ohlcv(results: Dict[str, Dict[str, Any]]):
         return None
 
     try:
-        flat_records = []
+        writer = OHLCVSnapshotWriter()
         for symbol, tf_data in results.items():
-            for tf, candles in tf_data.items():
-                for candle in candles:
-                    if not isinstance(candle, (list, tuple)) or len(candle) < 6:
-                        print(f"[WARN] Skipping malformed candle for {symbol} {tf}: {candle}")
-                        continue
-
-                    flat_records.append({
-                        "symbol": symbol,
-                        "timeframe": tf,
-                        "open_time": candle[0],
-                        "close_time": candle[6] if len(candle) > 6 else None,
-                        "open": candle[1],
-                        "high": candle[2],
-                        "low": candle[3],
-                        "close": candle[4],
-                        "volume": candle[5],
-                        "quote_volume": candle[7] if len(candle) > 7 else None,
-                    })
-        df = pd.DataFrame(flat_records)
-        return save_raw_snapshot(df, source_name="ohlcv_snapshot")
+            writer.add(symbol, tf_data)
+        return writer.close()
     except Exception as e:
         print(f"[WARN] Could not collect OHLCV snapshot: {e}")
         return None
 
 
+class OHLCVSnapshotWriter:
+    """
+    Schreibt den OHLCV-Rohdaten-Snapshot spaltenweise und inkrementell.
+
+    Pro Symbol/Timeframe werden typisierte Arrays (CandleArrays) gepuffert -
+    keine Python-Objekte pro Kerze. Alle `chunk_rows` Zeilen werden die
+    Arrays einmal zusammengefügt und als Row Group in ein partitioniertes
+    Parquet-Dataset geschrieben (siehe ohlcv_partition_path), Symbole
+    dictionary-kodiert. CSV nur als Debug-Export (`RAW_SNAPSHOT_CSV=1`).
+
+    Zusammenfügen und Schreiben laufen auf dem Artifact-Writer (falls aktiv);
+    Dateien erscheinen erst nach close() unter ihrem endgültigen Namen.
+    """
+
+    def __init__(self, chunk_rows: int = 50_000):
+        self.chunk_rows = chunk_rows
+        self.run_id = raw_run_id()
+        self.base_root = raw_base_dir()
+        self.csv_enabled = csv_export_enabled()
+        self._pending: Dict[str, List[tuple]] = {}
+        self._pending_rows = 0
+        self._timeframes: List[str] = []
+        self._rows = 0
+        self._csv_path: Optional[str] = None
+        # Nur auf dem Writer-Thread benutzt: (ParquetWriter, Temp-Pfad) pro Timeframe
+        self._writers: Dict[str, tuple] = {}
+        self._csv_tmp_path: Optional[str] = None
+        self._failed = False
+
+    def add(self, symbol: str, tf_data: Dict[str, Any]) -> None:
+        """Kerzen eines Symbols (timeframe -> CandleArrays oder Kline-Listen) anhängen."""
+        for tf, candles in tf_data.items():
+            if not isinstance(candles, CandleArrays):
+                try:
+                    candles = CandleArrays.from_klines(candles)
+                except (TypeError, ValueError, IndexError) as e:
+                    print(f"[WARN] Skipping malformed candles for {symbol} {tf}: {e}")
+                    continue
+            if not len(candles):
+                continue
+            if tf not in self._timeframes:
+                self._timeframes.append(tf)
+            self._pending.setdefault(tf, []).append((symbol, candles))
+            self._pending_rows += len(candles)
+            self._rows += len(candles)
+
+        if self._pending_rows >= self.chunk_rows:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._pending:
+            pending, self._pending, self._pending_rows = self._pending, {}, 0
+            submit("ohlcv_snapshot", self._write_chunk, pending)
+
+    @staticmethod
+    def _table(members: List[tuple]) -> pa.Table:
+        # Arrays einmal pro Block zusammenfügen
+        symbols = [symbol for symbol, _ in members]
+        lengths = [len(candles) for _, candles in members]
+        indices = np.repeat(np.arange(len(symbols), dtype=np.int32), lengths)
+
+        def column(name):
+            return np.concatenate([getattr(candles, name) for _, candles in members])
+
+        close_time = column("close_time")
+        return pa.Table.from_arrays(
+            [
+                pa.DictionaryArray.from_arrays(pa.array(indices), pa.array(symbols, pa.string())),
+                pa.array(column("open_time").astype(np.int64, copy=False)),
+                pa.array(close_time.astype(np.int64, copy=False), mask=close_time == MISSING_TIME),
+                *(pa.array(column(name).astype(np.float64, copy=False))
+                  for name in ("open", "high", "low", "close", "volume", "quote_volume")),
+            ],
+            schema=OHLCV_DATASET_SCHEMA,
+        )
+
+    def _write_chunk(self, pending: Dict[str, List[tuple]]) -> None:
+        # Rohdaten-Snapshot ist optional: Fehler nur melden, Pipeline läuft weiter
+        if self._failed:
+            return
+        try:
+            self._write_tables(pending)
+        except Exception as e:
+            print(f"[WARN] Could not collect OHLCV snapshot: {e}")
+            self._failed = True
+
+    def _write_tables(self, pending: Dict[str, List[tuple]]) -> None:
+        for tf, members in pending.items():
+            table = self._table(members)
+
+            if tf not in self._writers:
+                path = ohlcv_partition_path(self.base_root, self.run_id, tf)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                self._writers[tf] = (pq.ParquetWriter(tmp_path, OHLCV_DATASET_SCHEMA), tmp_path)
+            self._writers[tf][0].write_table(table)
+
+            if self.csv_enabled:
+                self._append_csv(table, tf)
+
+    def _append_csv(self, table: pa.Table, timeframe: str) -> None:
+        try:
+            started = self._csv_tmp_path is not None
+            if not started:
+                self._csv_tmp_path = f"{self._csv_target()}.{os.getpid()}.tmp"
+            df = table.to_pandas()
+            df.insert(1, "timeframe", timeframe)
+            df.to_csv(
+                self._csv_tmp_path,
+                index=False,
+                mode="a" if started else "w",
+                header=not started,
+                compression="gzip" if self._csv_target().endswith(".gz") else None,
+            )
+        except Exception as e:
+            print(f"[ERROR] CSV export failed: {e}")
+            self.csv_enabled = False
+
+    def _csv_target(self) -> str:
+        if self._csv_path is None:
+            csv_name = "ohlcv_snapshot.csv.gz" if csv_gzip_enabled() else "ohlcv_snapshot.csv"
+            self._csv_path = os.path.join(raw_run_dir(), csv_name)
+        return self._csv_path
+
+    def _finish(self) -> None:
+        # Temp-Dateien schließen und umbenennen -> erst jetzt sichtbar
+        for tf, (writer, tmp_path) in self._writers.items():
+            writer.close()
+            if self._failed:
+                os.remove(tmp_path)
+                continue
+            path = ohlcv_partition_path(self.base_root, self.run_id, tf)
+            os.replace(tmp_path, path)
+            print(f"[INFO] Raw data snapshot saved as Parquet: {path}")
+        if self._csv_tmp_path is not None:
+            if self.csv_enabled and not self._failed:
+                os.replace(self._csv_tmp_path, self._csv_path)
+                print(f"[INFO] Raw data snapshot saved as CSV: {self._csv_path}")
+            elif os.path.exists(self._csv_tmp_path):
+                os.remove(self._csv_tmp_path)
+        if self._failed:
+            print("[ERROR] Could not save any raw data snapshot.")
+            return
+        print(f"[INFO] Raw OHLCV snapshot complete ({self._rows} candles) → "
+              f"{os.path.join(self.base_root, OHLCV_DATASET_DIR)}")
+
+    def close(self):
+        """
+        Restliche Zeilen schreiben und Dateien schließen.
+
+        Returns:
+            Zielpfade {"parquet": [...], "csv": ...} (bei aktivem Artifact-Writer
+            ggf. noch in Arbeit), oder None ohne Daten
+        """
+        if not self._timeframes:
+            print("[WARN] No OHLCV data to snapshot.")
+            return None
+
+        self._flush()
+        submit("ohlcv_snapshot", self._finish)
+        return {
+            "parquet": [ohlcv_partition_path(self.base_root, self.run_id, tf) for tf in self._timeframes],
+            "csv": self._csv_target() if self.csv_enabled else None,
+        }
+
+
+def load_raw_ohlcv(
+    base_dir: Optional[str] = None,
+    timeframe: str = "1d",
+    fields: Sequence[str] = ("close",)
+) -> pd.DataFrame:
+    """
+    Lädt alle OHLCV-Rohdaten-Snapshots einer Timeframe als eine Tabelle
+    (symbol, open_time, *fields). Gelesen werden das partitionierte Dataset
+    (<BASEDIR>/ohlcv/date=*/timeframe=<tf>/<RUN_ID>.parquet) und ältere
+    Snapshots (<BASEDIR>/<RUN_ID>/ohlcv_snapshot.parquet).
+
+    - Kerzen, die zum Zeitpunkt des Runs (RUN_ID) noch offen waren, werden verworfen.
+    - Überlappende Kerzen mehrerer Runs: der neueste Run gewinnt.
+    - Felder, die ältere Snapshots nicht haben (z.B. quote_volume), sind NaN.
+    """
+    base_root = Path(base_dir or raw_base_dir())
+    columns = ["symbol", "open_time", *fields]
+    # Ältere Snapshots haben keine close_time-Spalte -> aus open_time ableiten
+    candle_ms = interval_to_ms(timeframe) or 0
+
+    # (RUN_ID, Pfad, Timeframe-Filter nötig?) - nach RUN_ID sortiert
+    sources = [(path.stem, path, False)
+               for path in base_root.glob(f"{OHLCV_DATASET_DIR}/date=*/timeframe={timeframe}/*.parquet")]
+    sources += [(path.parent.name, path, True) for path in base_root.glob("*/ohlcv_snapshot.parquet")]
+
+    frames = []
+    for run_id, path, legacy in sorted(sources):
+        available = set(pq.read_schema(path).names)
+        df = pd.read_parquet(
+            path,
+            columns=[c for c in columns if c in available],
+            filters=[("timeframe", "==", timeframe)] if legacy else None,
+        ).reindex(columns=columns)
+        df["symbol"] = df["symbol"].astype(str)
+        try:
+            run_ts = datetime.strptime(run_id, "%Y-%m-%d_%H-%M-%S").replace(tzinfo=timezone.utc)
+            df = df[df["open_time"] + candle_ms <= int(run_ts.timestamp() * 1000)]
+        except ValueError:
+            pass
+        frames.append(df)
+
+    if not frames:
+        return pd.DataFrame(columns=columns)
+
+    df = pd.concat(frames, ignore_index=True)
+    for field in fields:
+        df[field] = pd.to_numeric(df[field], errors="coerce")
+    df = df.drop_duplicates(["symbol", "open_time"], keep="last")
+    return df.sort_values(["symbol", "open_time"], ignore_index=True)
+
+
+OHLCV_FIELDS = ("open", "high", "low", "close", "volume", "quote_volume")
+
+
+def load_candle_history(base_dir: Optional[str], timeframe: str) -> Dict[str, CandleArrays]:
+    """
+    Wie load_raw_ohlcv, aber als CandleArrays pro Symbol (alle OHLCV-Felder,
+    älteste Kerze zuerst). Fehlendes quote_volume (ältere Snapshots) wird
+    als close * volume geschätzt.
+    """
+    df = load_raw_ohlcv(base_dir, timeframe, fields=OHLCV_FIELDS)
+    if df.empty:
+        return {}
+
+    open_time = df["open_time"].to_numpy(dtype=np.int64)
+    close = df["close"].to_numpy(dtype=float)
+    volume = df["volume"].to_numpy(dtype=float)
+    quote_volume = df["quote_volume"].to_numpy(dtype=float)
+    quote_volume = np.where(np.isnan(quote_volume), close * volume, quote_volume)
+    columns = {
+        "open_time": open_time,
+        "close_time": open_time + interval_to_ms(timeframe) - 1,
+        "open": df["open"].to_numpy(dtype=float),
+        "high": df["high"].to_numpy(dtype=float),
+        "low": df["low"].to_numpy(dtype=float),
+        "close": close,
+        "volume": volume,
+        "quote_volume": quote_volume,
+    }
+
+    # Zeilen sind nach (symbol, open_time) sortiert -> an Symbolwechseln teilen
+    symbols = df["symbol"].to_numpy()
+    bounds = np.flatnonzero(symbols[1:] != symbols[:-1]) + 1
+    starts = np.concatenate([[0], bounds])
+    stops = np.concatenate([bounds, [len(df)]])
+
+    return {
+        symbols[start]: CandleArrays(**{name: values[start:stop] for name, values in columns.items()})
+        for start, stop in zip(starts, stops)
+    }
+
+
 # ===============================================================
 # MarketCap Snapshots
 # ===============================================================
 
+MARKETCAP_STORE_DIR = "marketcap"
+
+
+def marketcap_store(base_root: Optional[str] = None) -> MarketCapHistoryStore:
+    """
+    MarketCap-Historie unter <BASEDIR>/marketcap (siehe MarketCapHistoryStore).
+    """
+    return MarketCapHistoryStore(os.path.join(base_root or raw_base_dir(), MARKETCAP_STORE_DIR))
+
+
+def record_raw_marketcap(data: List[Dict[str, Any]]):
+    """
+    Hängt die Listings an die MarketCap-Historie an.
+
+    Unveränderte Payloads (z.B. aus dem Tages-Cache) werden nicht erneut
+    geschrieben; sonst nur die geänderten Zeilen/Spalten.
+    """
+    if not data:
+        print("[WARN] No MarketCap data to snapshot.")
+        return None
+
+    try:
+        run_id = raw_run_id()
+        return marketcap_store().append(data, snapshot_date=run_id[:10], run_id=run_id)
+    except Exception as e:
+        print(f"[WARN] Could not record MarketCap history: {e}")
+        return None
+
+
 def collect_raw_marketcap(data: List[Dict[str, Any]]):
     """
-    Speichert alle MarketCap-Daten (Listings) als Rohdaten-Snapshot.
+    Speichert alle MarketCap-Daten (Listings) als vollständigen Rohdaten-Snapshot
+    pro Run (Legacy-Format; die Pipeline nutzt record_raw_marketcap).
     Erwartet die Ausgabe aus MarketCapClient.get_listings() oder get_all_listings().
 
     Wichtig: CMC liefert verschachtelte Strukturen (z.B. quote -> USD -> ...).
@@ -93,6 +397,14 @@ def collect_raw_marketcap(data: List[Dict[str, Any]]):
         return None
 
 
+def submit_raw_marketcap(data: List[Dict[str, Any]]) -> None:
+    """
+    Wie record_raw_marketcap, aber auf dem Artifact-Writer (falls aktiv).
+    `data` darf danach nicht mehr verändert werden.
+    """
+    submit("marketcap_history", record_raw_marketcap, data)
+
+
 # ===============================================================
 # Feature Snapshots (optional für spätere Erweiterung)
 # ===============================================================
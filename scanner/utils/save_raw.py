@@ -2,38 +2,67 @@ import os
 import pandas as pd
 from datetime import datetime
 
+from scanner.utils.artifact_writer import atomic_path
 
-def save_raw_snapshot(
-    df: pd.DataFrame,
-    source_name: str = "unknown",
-    require_parquet: bool = False
-):
-    """
-    Speichert die Rohdaten eines Runs im Ordner <BASEDIR>/<RUN_ID>/.
 
-    - BASEDIR: per ENV `RAW_SNAPSHOT_BASEDIR` konfigurierbar (default: data/raw)
-    - RUN_ID: wird einmal pro Run/Prozess erzeugt (ENV `RAW_SNAPSHOT_RUN_ID`)
-             -> sorgt dafür, dass alle Snapshots eines Runs im selben Ordner landen.
+def raw_base_dir() -> str:
+    """Basisordner aller Runs (ENV `RAW_SNAPSHOT_BASEDIR`, default: data/raw)."""
+    # Basisordner konfigurierbar machen (z. B. snapshots/raw in GitHub Actions)
+    return os.getenv("RAW_SNAPSHOT_BASEDIR", os.path.join("data", "raw"))
 
-    Exportiert immer zwei Formate:
-      1. Parquet (für Analyse, effizient)
-      2. CSV (für manuelle Kontrolle, optional gzip per `RAW_SNAPSHOT_CSV_GZIP=1`)
-    """
 
-    # 1) Ein Ordner pro Run: RUN_ID einmalig erzeugen und für den Prozess merken
+def raw_run_id() -> str:
+    """
+    RUN_ID des laufenden Runs (ENV `RAW_SNAPSHOT_RUN_ID`, Format YYYY-MM-DD_HH-MM-SS).
+    Wird einmal pro Run/Prozess erzeugt -> alle Snapshots eines Runs gehören zusammen.
+    """
     run_id = os.getenv("RAW_SNAPSHOT_RUN_ID")
     if not run_id:
         run_id = datetime.utcnow().strftime("%Y-%m-%d_%H-%M-%S")
         os.environ["RAW_SNAPSHOT_RUN_ID"] = run_id
+    return run_id
+
 
-    # 2) Basisordner konfigurierbar machen (z. B. snapshots/raw in GitHub Actions)
-    base_root = os.getenv("RAW_SNAPSHOT_BASEDIR", os.path.join("data", "raw"))
-    base_dir = os.path.join(base_root, run_id)
+def raw_run_dir() -> str:
+    """Ordner des laufenden Runs: <BASEDIR>/<RUN_ID>/ (wird angelegt)."""
+    base_dir = os.path.join(raw_base_dir(), raw_run_id())
     os.makedirs(base_dir, exist_ok=True)
+    return base_dir
+
+
+def csv_export_enabled() -> bool:
+    """
+    CSV-Export (Debug) aktiv? Standardmäßig aus - Parquet ist das Archivformat.
+    Einschalten per ENV `RAW_SNAPSHOT_CSV=1`.
+    """
+    return os.getenv("RAW_SNAPSHOT_CSV", "0").lower() in ("1", "true", "yes")
+
+
+def csv_gzip_enabled() -> bool:
+    """CSV-Export gzip-komprimiert? (ENV `RAW_SNAPSHOT_CSV_GZIP=1`)"""
+    return os.getenv("RAW_SNAPSHOT_CSV_GZIP", "0").lower() in ("1", "true", "yes")
+
+
+def save_raw_snapshot(
+    df: pd.DataFrame,
+    source_name: str = "unknown",
+    require_parquet: bool = False
+):
+    """
+    Speichert die Rohdaten eines Runs im Ordner <BASEDIR>/<RUN_ID>/
+    (siehe raw_run_dir). Dateien werden atomar geschrieben (Temp-Datei + Rename).
+
+    Formate:
+      1. Parquet (für Analyse, effizient) - immer
+      2. CSV (für manuelle Kontrolle) - nur per `RAW_SNAPSHOT_CSV=1` oder wenn
+         Parquet fehlschlägt; optional gzip per `RAW_SNAPSHOT_CSV_GZIP=1`
+    """
+
+    base_dir = raw_run_dir()
 
     parquet_path = os.path.join(base_dir, f"{source_name}.parquet")
 
-    csv_gzip = os.getenv("RAW_SNAPSHOT_CSV_GZIP", "0").lower() in ("1", "true", "yes")
+    csv_gzip = csv_gzip_enabled()
     csv_filename = f"{source_name}.csv.gz" if csv_gzip else f"{source_name}.csv"
     csv_path = os.path.join(base_dir, csv_filename)
 
@@ -41,7 +70,8 @@ def save_raw_snapshot(
 
     # --- 1️⃣ Parquet speichern ---
     try:
-        df.to_parquet(parquet_path, index=False)
+        with atomic_path(parquet_path) as tmp_path:
+            df.to_parquet(tmp_path, index=False)
         print(f"[INFO] Raw data snapshot saved as Parquet: {parquet_path}")
         saved_paths["parquet"] = parquet_path
     except Exception as e:
@@ -51,12 +81,17 @@ def save_raw_snapshot(
     if require_parquet and not saved_paths["parquet"]:
         print("[ERROR] Parquet export is REQUIRED for this snapshot but failed.")
 
-    # --- 2️⃣ CSV speichern ---
+    # --- 2️⃣ CSV speichern (Debug-Export bzw. Fallback) ---
+    if not csv_export_enabled() and saved_paths["parquet"]:
+        print(f"[INFO] Raw data snapshot complete → {base_dir}")
+        return saved_paths
+
     try:
-        if csv_gzip:
-            df.to_csv(csv_path, index=False, compression="gzip")
-        else:
-            df.to_csv(csv_path, index=False)
+        with atomic_path(csv_path) as tmp_path:
+            if csv_gzip:
+                df.to_csv(tmp_path, index=False, compression="gzip")
+            else:
+                df.to_csv(tmp_path, index=False)
         print(f"[INFO] Raw data snapshot saved as CSV: {csv_path}")
         saved_paths["csv"] = csv_path
     except Exception as e:
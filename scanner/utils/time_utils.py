@@ -46,3 +46,23 @@ def timestamp_to_ms(dt: datetime) -> int:
 def ms_to_timestamp(ms: int) -> datetime:
     """Convert milliseconds since epoch to datetime."""
     return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+
+
+# Kline interval lengths (MEXC naming)
+INTERVAL_MS = {
+    "1m": 60_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "60m": 3_600_000,
+    "1h": 3_600_000,
+    "4h": 14_400_000,
+    "1d": 86_400_000,
+    "1W": 604_800_000,
+    "1w": 604_800_000,
+}
+
+
+def interval_to_ms(interval: str) -> Optional[int]:
+    """Convert a kline interval (e.g. '4h', '1d') to milliseconds (None if unknown)."""
+    return INTERVAL_MS.get(interval)
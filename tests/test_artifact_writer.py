@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+
+from scanner.utils import artifact_writer
+from scanner.utils.artifact_writer import ArtifactWriter, atomic_path, write_text
+
+
+def test_atomic_path_keeps_previous_version_on_failure(tmp_path) -> None:
+    target = tmp_path / "report.json"
+    write_text(target, "old")
+
+    with pytest.raises(RuntimeError):
+        with atomic_path(target) as tmp:
+            tmp.write_text("partial")
+            raise RuntimeError("disk full")
+
+    assert target.read_text() == "old"
+    assert [p.name for p in tmp_path.iterdir()] == ["report.json"]
+
+
+def test_writer_runs_jobs_in_order_in_background_and_collects_errors() -> None:
+    done = []
+    release = threading.Event()
+
+    def job(i):
+        release.wait()
+        if i == 2:
+            raise ValueError("boom")
+        done.append((i, threading.current_thread().name))
+
+    writer = ArtifactWriter(max_pending=8).activate()
+    for i in range(5):
+        artifact_writer.submit(f"job{i}", job, i)
+    assert done == []  # submit does not wait for the write
+
+    release.set()
+    errors = writer.close()
+    assert [i for i, _ in done] == [0, 1, 3, 4]
+    assert {name for _, name in done} == {"artifact-writer"}
+    assert [name for name, _ in errors] == ["job2"]
+
+    # Without an active writer jobs run inline
+    artifact_writer.submit("inline", job, 7)
+    assert done[-1] == (7, threading.current_thread().name)
+
+
+def test_pipeline_failure_releases_run_singletons(tmp_path, monkeypatch) -> None:
+    import scanner.pipeline as pipeline
+    from scanner.tools.benchmark import benchmark_config, synthetic_market
+    from scanner.utils import cache, profiling
+
+    def fail(*args, **kwargs):
+        raise ValueError("client setup failed")
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(pipeline, "MarketCapClient", fail)  # before the DAG starts
+    with pytest.raises(ValueError):
+        pipeline.run_pipeline(benchmark_config({}, 10), offline_market=synthetic_market(10, seed=3))
+
+    assert artifact_writer._active is None
+    assert cache._active is None
+    assert profiling._active is None
+    assert not [t for t in threading.enumerate() if t.name == "artifact-writer"]
+
+
+def test_failed_excel_save_does_not_fail_the_run(tmp_path, monkeypatch) -> None:
+    openpyxl = pytest.importorskip("openpyxl")
+    from scanner.pipeline import run_pipeline
+    from scanner.tools.benchmark import benchmark_config, synthetic_market
+
+    def fail(self, filename):
+        raise OSError("disk full")
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(openpyxl.Workbook, "save", fail)
+    run_pipeline(benchmark_config({}, 10), offline_market=synthetic_market(10, seed=3))
+
+    offline = tmp_path / "reports" / "offline"
+    assert not list(offline.glob("*.xlsx"))
+    assert len(list(offline.glob("*.profile.json"))) == 1
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scanner.pipeline.backtest_runner import BacktestRunner, PriceMatrix, DAY_MS, date_to_ms
+from scanner.pipeline.snapshot import SnapshotManager
+
+
+def _write_raw_ohlcv(raw_dir, start_ms: int, days: int) -> None:
+    rows = []
+    for i in range(days):
+        # AAA rises 1 per day from 100, BBB is flat; BBB has a gap on day 10
+        rows.append(("AAAUSDT", "1d", start_ms + i * DAY_MS, str(100.0 + i)))
+        if i != 10:
+            rows.append(("BBBUSDT", "1d", start_ms + i * DAY_MS, "50"))
+    df = pd.DataFrame(rows, columns=["symbol", "timeframe", "open_time", "close"])
+    run_dir = raw_dir / "2026-03-01_00-00-00"
+    run_dir.mkdir(parents=True)
+    df.to_parquet(run_dir / "ohlcv_snapshot.parquet", index=False)
+
+
+def _setup_history(tmp_path) -> dict:
+    _write_raw_ohlcv(tmp_path / "raw", date_to_ms("2026-01-01"), 40)
+
+    config = {
+        "snapshots": {"runtime_dir": str(tmp_path / "runtime"), "format": "parquet"},
+        "backtest": {
+            "forward_return_days": [3, 7],
+            "slippage_bps": 0,
+            "hit_threshold_pct": {"breakout": 5},
+            "rank_buckets": [1],
+            "raw_dir": str(tmp_path / "raw"),
+        },
+    }
+    snapshots = SnapshotManager(config)
+    scores = [{"symbol": "AAAUSDT", "score": 80.0}, {"symbol": "BBBUSDT", "score": 40.0}]
+    for run_date in ("2026-01-05", "2026-01-08"):
+        snapshots.create_snapshot(
+            run_date, universe=[], filtered=[], shortlist=[], features={},
+            reversal_scores=[], breakout_scores=scores, pullback_scores=[],
+            metadata={"asof_ts_ms": date_to_ms(run_date) + 5 * 3600 * 1000},
+        )
+    return config
+
+
+def test_backtest_forward_returns_and_metrics(tmp_path) -> None:
+    config = _setup_history(tmp_path)
+
+    result = BacktestRunner(config).run()
+    breakout = result["setups"]["breakout"]
+
+    # 2026-01-05 05:00 -> entry is the 2026-01-04 candle (day 3, close 103)
+    assert breakout["signals"] == 4
+    three = breakout["horizons"]["3d"]
+    assert three["count"] == 4
+    assert three["by_rank"]["top_1"]["mean"] == pytest.approx((106 / 103 + 109 / 106) / 2 - 1)
+    assert three["hit_rate"] == 0.0
+    # BBB exit on 2026-01-11 (day 10) is missing: no forward fill
+    assert breakout["horizons"]["7d"]["count"] == 3
+    assert breakout["horizons"]["7d"]["rank_corr"] < 0  # rank 1 (AAA) outperforms
+
+
+def test_parallel_backtest_matches_single_process(tmp_path) -> None:
+    config = _setup_history(tmp_path)
+    single = BacktestRunner(config).run()
+
+    config["backtest"]["workers"] = 2
+    parallel = BacktestRunner(config).run()
+
+    assert parallel["setups"] == single["setups"]
+
+
+def test_price_matrix_slippage_both_legs() -> None:
+    df = pd.DataFrame({"symbol": ["X", "X"], "open_time": [0, DAY_MS], "close": [100.0, 110.0]})
+    prices = PriceMatrix.from_ohlcv(df)
+    returns = prices.forward_returns(np.array([0, 1]), prices.columns(["X", "X"]), [1], slippage_bps=10)
+    assert returns[1][0] == pytest.approx(110 * 0.999 / (100 * 1.001) - 1)
+    assert np.isnan(returns[1][1])
@@ -0,0 +1,19 @@
+from scanner.tools.benchmark import compare, run_benchmark
+
+
+def test_benchmark_records_pipeline_stages(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    result = run_benchmark({}, 40, seed=3)
+
+    assert result["symbols"] == 40
+    assert result["requests"] > 0
+    assert result["bytes_downloaded"] > 0
+    for stage in ("listings", "mapping", "filters", "shortlist", "ohlcv_features", "scoring", "report_json", "snapshot"):
+        assert result["stages"][stage]["wall_s"] >= 0
+        assert result["stages"][stage]["peak_mb"] >= 0
+    assert list(tmp_path.iterdir()) == []  # pipeline output stays in the scratch directory
+
+    entry = {"results": {"40": result}}
+    slower = {"results": {"40": {**result, "stages": {"ohlcv_features": {"wall_s": 10.0}}}}}
+    assert compare(slower, [entry], 20)[0]["stage"] == "ohlcv_features"
+    assert compare(entry, [slower], 20) == []
@@ -0,0 +1,41 @@
+import os
+
+from scanner.utils import profiling
+from scanner.utils.cache import ResponseCache, candle_close_ttl_s
+
+
+def test_ttl_memory_tier_and_lru_eviction(tmp_path) -> None:
+    profiler = profiling.RunProfiler().activate()
+    try:
+        cache = ResponseCache(tmp_path, memory_items=1, ttl_s={"tickers": 60})
+        payload = list(range(20))
+
+        cache.put("a", payload, cache.ttl("tickers"))
+        assert cache.get("a") == payload  # memory tier
+        cache.put("b", payload, cache.ttl("exchange_info"))
+        assert cache.get("a") == payload  # evicted from memory, read from disk
+
+        # Expired entries are misses and removed
+        cache.put("old", payload, -1)
+        assert cache.get("old") is None
+        assert not cache.path("old").exists()
+
+        # Over budget: the least recently used entry goes
+        os.utime(cache.path("b"), (0, 0))
+        size = cache.path("a").stat().st_size
+        fresh = ResponseCache(tmp_path, max_bytes=2 * size + size // 2, memory_items=0)
+        fresh.put("c", payload, 60)
+        assert not cache.path("b").exists()
+        assert fresh.get("a") == payload and fresh.get("c") == payload
+
+        counters = profiler.to_dict()["total"]
+    finally:
+        profiler.deactivate()
+
+    assert counters["cache_hits"] == 4
+    assert counters["cache_memory_hits"] == 1
+    assert counters["cache_expired"] == 1
+    assert counters["cache_evictions"] == 1
+
+    # Klines stay cached until the forming candle closes
+    assert candle_close_ttl_s("4h", now_ms=4 * 3600 * 1000 + 1000) == 4 * 3600 - 1
@@ -0,0 +1,80 @@
+import numpy as np
+
+from scanner.clients.mexc_client import MEXCClient
+from scanner.pipeline.features import FeatureEngine
+from scanner.utils.candle_store import CandleArrays, CandleStore
+from scanner.utils.time_utils import timestamp_to_ms, utc_now
+
+DAY_MS = 86_400_000
+
+
+def _kline(open_ms: int, close: float) -> list:
+    return [open_ms, "1", "1", "1", str(close), "10", open_ms + DAY_MS - 1, "10"]
+
+
+class _RecordingMEXC(MEXCClient):
+    """MEXCClient whose HTTP layer serves a fixed daily series."""
+
+    def __init__(self, series: list[list], **kwargs):
+        super().__init__(**kwargs)
+        self.series = series
+        self.calls: list[dict] = []
+
+    def _request(self, method, endpoint, params=None):
+        self.calls.append(dict(params))
+        rows = self.series
+        if "startTime" in params:
+            rows = [k for k in rows if k[0] >= params["startTime"]]
+            return rows[: params["limit"]]
+        return rows[-params["limit"]:]
+
+
+def test_merge_dedupes_on_open_time_and_newer_rows_win(tmp_path) -> None:
+    store = CandleStore(tmp_path)
+    store.merge("AUSDT", "1d", [_kline(0, 1.0), _kline(DAY_MS, 2.0)])
+    merged = store.merge("AUSDT", "1d", [_kline(DAY_MS, 2.5), _kline(2 * DAY_MS, 3.0)])
+
+    assert merged.open_time.tolist() == [0, DAY_MS, 2 * DAY_MS]
+    assert merged.close.tolist() == [1.0, 2.5, 3.0]
+    assert store.last_open_time("AUSDT", "1d") == 2 * DAY_MS
+
+    # Reads come back memory-mapped from the columnar files
+    loaded = store.load("AUSDT", "1d")
+    assert isinstance(loaded.close, np.memmap)
+    assert loaded.close.tolist() == [1.0, 2.5, 3.0]
+
+
+def test_second_run_downloads_only_the_missing_tail(tmp_path) -> None:
+    today = timestamp_to_ms(utc_now()) // DAY_MS * DAY_MS
+    series = [_kline(today - i * DAY_MS, float(i)) for i in range(200, -1, -1)]
+    store = CandleStore(tmp_path)
+
+    # Day 1: store is empty -> full window (the newest candle is still open)
+    day1 = _RecordingMEXC(series[:-2], candle_store=store)
+    window1 = day1.get_candles("AUSDT", "1d", limit=120)
+    assert len(window1) == 120
+    assert "startTime" not in day1.calls[0]
+
+    # Two days later: only the tail from the last stored candle is requested
+    day3 = _RecordingMEXC(series, candle_store=store)
+    window3 = day3.get_candles("AUSDT", "1d", limit=120)
+    assert day3.calls[0]["startTime"] == series[-3][0]
+    assert day3.calls[0]["limit"] <= 4
+    assert window3.open_time.tolist() == [k[0] for k in series[-120:]]
+    assert window3.close.tolist() == [float(k[4]) for k in series[-120:]]
+
+
+def test_features_from_arrays_match_features_from_kline_lists() -> None:
+    rng = np.random.default_rng(7)
+    closes = 100 * np.cumprod(1 + rng.normal(0, 0.03, 90))
+    klines = [
+        [i * DAY_MS, str(c), str(c * 1.02), str(c * 0.98), str(c), str(1000 + 10 * i), (i + 1) * DAY_MS - 1]
+        for i, c in enumerate(closes)
+    ]
+    asof = 80 * DAY_MS
+
+    engine = FeatureEngine(config={})
+    from_lists = engine.compute_all({"AUSDT": {"1d": klines}}, asof_ts_ms=asof)
+    from_arrays = engine.compute_all({"AUSDT": {"1d": CandleArrays.from_klines(klines)}}, asof_ts_ms=asof)
+
+    assert from_arrays == from_lists
@@ -0,0 +1,45 @@
+import threading
+import time
+
+import pytest
+
+from scanner.pipeline.dag import DagExecutor, Stage
+
+
+def test_independent_stages_overlap() -> None:
+    started = {}
+    both_running = threading.Barrier(2, timeout=5)
+
+    def fetch(name):
+        def run():
+            started[name] = time.perf_counter()
+            both_running.wait()  # deadlocks unless both run at the same time
+            return name.upper()
+        return run
+
+    stages = [
+        Stage("join", lambda a, b: a + b, ("a", "b"), ("ab",)),
+        Stage("fetch_a", fetch("a"), outputs=("a",)),
+        Stage("fetch_b", fetch("b"), outputs=("b",)),
+    ]
+    executor = DagExecutor(stages, max_workers=2)
+
+    assert executor.run()["ab"] == "AB"
+    assert executor.critical_path({"fetch_a": 1.0, "fetch_b": 2.0, "join": 0.5}) == ["fetch_b", "join"]
+
+
+def test_invalid_graphs_and_failures() -> None:
+    with pytest.raises(ValueError, match="cycle"):
+        DagExecutor([Stage("x", lambda y: y, ("y",), ("x",)), Stage("y", lambda x: x, ("x",), ("y",))])
+
+    def boom():
+        raise RuntimeError("boom")
+
+    ran = []
+    executor = DagExecutor([
+        Stage("boom", boom, outputs=("a",)),
+        Stage("after", lambda a: ran.append(a), ("a",)),
+    ])
+    with pytest.raises(RuntimeError, match="boom"):
+        executor.run()
+    assert ran == []
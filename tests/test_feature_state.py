@@ -0,0 +1,44 @@
+import numpy as np
+
+from scanner.pipeline.feature_state import FeatureState
+from scanner.pipeline.features import FeatureEngine
+from scanner.utils.candle_store import CandleArrays
+
+DAY_MS = 86_400_000
+
+
+def _random_candles(n: int, seed: int = 7) -> CandleArrays:
+    rng = np.random.default_rng(seed)
+    closes = 50 * np.cumprod(1 + rng.normal(0, 0.04, n))
+    highs = closes * (1 + rng.uniform(0, 0.05, n))
+    lows = closes * (1 - rng.uniform(0, 0.05, n))
+    volumes = rng.uniform(100, 10_000, n)
+    return CandleArrays.from_klines([
+        [i * DAY_MS, c, h, l, c, v, (i + 1) * DAY_MS - 1]
+        for i, (c, h, l, v) in enumerate(zip(closes, highs, lows, volumes))
+    ])
+
+
+def test_state_matches_full_window_features() -> None:
+    candles = _random_candles(120)
+    engine = FeatureEngine(config={})
+
+    for tf in ("1d", "4h"):
+        state = FeatureState.from_candles(candles, tf)
+        expected = engine._features_from_columns(
+            candles.close, candles.high, candles.low, candles.volume, tf, "TESTUSDT"
+        )
+        assert state.features() == expected
+
+
+def test_advancing_in_steps_matches_one_bootstrap() -> None:
+    candles = _random_candles(150)
+    state = FeatureState("1d")
+
+    # Like the replay: one as-of time after another, only newly closed candles applied
+    assert state.advance(candles, asof_ts_ms=100 * DAY_MS) == 100
+    assert state.advance(candles, asof_ts_ms=100 * DAY_MS) == 0
+    assert state.advance_to(candles, 150) == 50
+
+    assert state.count == 150
+    assert state.features() == FeatureState.from_candles(candles, "1d").features()
@@ -0,0 +1,32 @@
+import gzip
+
+import numpy as np
+import pytest
+
+from scanner.utils import json_codec
+
+
+@pytest.mark.parametrize("backend", ["orjson", "json"])
+def test_round_trip_compact_pretty_and_gzip(tmp_path, monkeypatch, backend) -> None:
+    if backend == "orjson" and json_codec.orjson is None:
+        pytest.skip("orjson not installed")
+    monkeypatch.setenv("SCANNER_JSON_BACKEND", backend)
+    data = {"symbol": "ÄBCUSDT", "klines": [[1, "2.5", 3.25]], "rank": None}
+
+    compact = json_codec.dumps(data)
+    assert b"\n" not in compact and b": " not in compact
+    assert b'\n  "symbol"' in json_codec.dumps(data, pretty=True)
+    assert json_codec.loads(compact) == data
+    # Non-string keys and values orjson rejects (ints beyond 64 bit) still serialize
+    assert json_codec.dumps({7: 2**70}) == b'{"7":1180591620717411303424}'
+
+    path = json_codec.compressed_path(tmp_path / "snapshot.json", "gzip")
+    json_codec.dump_file(data, path)
+    assert path.name == "snapshot.json.gz"
+    assert json_codec.loads(gzip.decompress(path.read_bytes())) == json_codec.load_file(path)
+
+    with pytest.raises(ValueError):
+        json_codec.compressed_path(path, "brotli")
+
+    if backend == "orjson":
+        assert json_codec.loads(json_codec.dumps({"x": np.float64(1.5)})) == {"x": 1.5}
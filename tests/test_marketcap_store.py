@@ -0,0 +1,42 @@
+import copy
+
+import pandas as pd
+
+from scanner.utils.marketcap_store import MarketCapHistoryStore
+
+
+def _listing(cmc_id: int, symbol: str, price: float) -> dict:
+    return {
+        "id": cmc_id,
+        "symbol": symbol,
+        "tags": ["mineable"],
+        "cmc_rank": cmc_id,
+        "quote": {"USD": {"price": price, "market_cap": price * 1000}},
+    }
+
+
+def test_history_writes_only_changes_and_answers_point_in_time(tmp_path) -> None:
+    store = MarketCapHistoryStore(tmp_path)
+    day1 = [_listing(1, "BTC", 100.0), _listing(2, "ETH", 10.0)]
+
+    assert store.append(day1, "2026-01-01", "2026-01-01_00-00-00") is not None
+    # Same payload again (e.g. served from the day's cache): nothing written
+    assert store.append(copy.deepcopy(day1), "2026-01-01", "2026-01-01_04-00-00") is None
+
+    day2 = copy.deepcopy(day1)
+    day2[0]["quote"]["USD"]["price"] = 110.0
+    part = pd.read_parquet(store.append(day2, "2026-01-02"))
+    assert part.to_dict("records") == [{"cmc_id": 1, "quote__USD__price": 110.0}]
+
+    # ETH delisted
+    store.append(day2[:1], "2026-01-03")
+
+    assert store.load_asof("2026-01-01")["quote__USD__price"].to_dict() == {1: 100.0, 2: 10.0}
+    assert store.load_asof("2026-01-02", ["symbol", "quote__USD__price"]).to_dict("index") == {
+        1: {"symbol": "BTC", "quote__USD__price": 110.0},
+        2: {"symbol": "ETH", "quote__USD__price": 10.0},
+    }
+    assert list(store.load_asof().index) == [1]
+
+    history = store.history("quote__USD__price", cmc_ids=[1])
+    assert history.values.tolist() == [["2026-01-01", 1, 100.0], ["2026-01-02", 1, 110.0]]
@@ -0,0 +1,152 @@
+import asyncio
+import time
+from email.utils import formatdate
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web
+
+from scanner.clients.mexc_async_client import AsyncMEXCClient
+from scanner.clients.mexc_client import retry_after_seconds
+from scanner.utils import profiling
+
+
+async def _serve_and_fetch(symbols: list[str]) -> tuple[dict, int]:
+    calls = {"klines": 0}
+
+    async def klines(request: web.Request) -> web.Response:
+        calls["klines"] += 1
+        # First request is throttled to exercise the Retry-After path
+        if calls["klines"] == 1:
+            return web.Response(status=429, headers={"Retry-After": "0"})
+        symbol = request.query["symbol"]
+        limit = int(request.query["limit"])
+        return web.json_response([[i, symbol, "1", "1", "1", "1", i + 1] for i in range(limit)])
+
+    app = web.Application()
+    app.router.add_get("/api/v3/klines", klines)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    try:
+        async with AsyncMEXCClient(retry_backoff=0, rate_limit_per_sec=1000, max_concurrency=4) as mexc:
+            mexc.BASE_URL = f"http://127.0.0.1:{port}"
+            results = await mexc.get_multiple_klines(symbols, "1d", limit=3, use_cache=False)
+    finally:
+        await runner.cleanup()
+
+    return results, calls["klines"]
+
+
+def test_async_client_fetches_concurrently_and_retries_429(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)  # cache files land in the temp dir
+    symbols = [f"S{i}USDT" for i in range(8)]
+
+    results, calls = asyncio.run(_serve_and_fetch(symbols))
+
+    assert list(results) == symbols
+    assert all(len(klines) == 3 and klines[0][1] == s for s, klines in results.items())
+    assert calls == len(symbols) + 1
+
+
+async def _serve_throttled(symbols: list[str]) -> list[tuple[str, int, float]]:
+    served = []
+
+    async def klines(request: web.Request) -> web.Response:
+        symbol = request.query["symbol"]
+        throttled = symbol == symbols[0] and not served
+        served.append((symbol, 429 if throttled else 200, time.monotonic()))
+        if throttled:
+            return web.Response(status=429, headers={"Retry-After": "0.3"})
+        return web.json_response([[0, symbol, "1", "1", "1", "1", 1]])
+
+    app = web.Application()
+    app.router.add_get("/api/v3/klines", klines)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    try:
+        async with AsyncMEXCClient(retry_backoff=0, rate_limit_per_sec=1000, max_concurrency=1) as mexc:
+            mexc.BASE_URL = f"http://127.0.0.1:{port}"
+            await mexc.get_multiple_klines(symbols, "1d", limit=1)
+            # Second pass is served from the cache
+            cached = await mexc.get_multiple_klines(symbols, "1d", limit=1)
+    finally:
+        await runner.cleanup()
+
+    assert all(klines[0][1] == s for s, klines in cached.items())
+    return served
+
+
+def test_async_client_waits_for_retry_after_outside_the_request_slot(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    symbols = ["AAAUSDT", "BBBUSDT", "CCCUSDT"]
+
+    served = asyncio.run(_serve_throttled(symbols))
+
+    # With a single slot, the other symbols are fetched while AAAUSDT waits
+    assert [entry[:2] for entry in served] == [
+        ("AAAUSDT", 429), ("BBBUSDT", 200), ("CCCUSDT", 200), ("AAAUSDT", 200),
+    ]
+    assert served[2][2] - served[0][2] < 0.2
+    assert served[3][2] - served[0][2] >= 0.3
+
+
+async def _serve_rate_limited(retry_after: str) -> tuple[int, Exception]:
+    calls = {"klines": 0}
+    error = None
+
+    async def klines(request: web.Request) -> web.Response:
+        calls["klines"] += 1
+        return web.Response(status=429, headers={"Retry-After": retry_after}, text="slow down")
+
+    app = web.Application()
+    app.router.add_get("/api/v3/klines", klines)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    try:
+        async with AsyncMEXCClient(max_retries=3, retry_backoff=0, rate_limit_per_sec=1000) as mexc:
+            mexc.BASE_URL = f"http://127.0.0.1:{port}"
+            try:
+                await mexc.get_klines("AAAUSDT", "1d", limit=1, use_cache=False)
+            except Exception as e:
+                error = e
+    finally:
+        await runner.cleanup()
+
+    return calls["klines"], error
+
+
+def test_async_client_raises_the_last_429_and_counts_requests() -> None:
+    profiler = profiling.RunProfiler().activate()
+    try:
+        # HTTP-date in the past: no wait, no ValueError
+        calls, error = asyncio.run(_serve_rate_limited("Wed, 21 Oct 2015 07:28:00 GMT"))
+        counters = profiler.to_dict()["total"]
+    finally:
+        profiler.deactivate()
+
+    assert calls == 3
+    assert isinstance(error, aiohttp.ClientResponseError) and error.status == 429
+    assert counters["api_calls"] == 3
+    assert counters["bytes_downloaded"] == 3 * len("slow down")
+
+
+def test_retry_after_accepts_seconds_and_http_dates() -> None:
+    assert retry_after_seconds({"Retry-After": "1.5"}, 3.0) == 1.5
+    assert retry_after_seconds({}, 3.0) == 3.0
+    assert retry_after_seconds({"Retry-After": "soon"}, 3.0) == 3.0
+    assert retry_after_seconds({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}, 3.0) == 0.0
+    in_a_minute = formatdate(time.time() + 60, usegmt=True)
+    assert 50 < retry_after_seconds({"Retry-After": in_a_minute}, 3.0) <= 60
@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import numpy as np
+
+from scanner.clients.marketcap_client import MarketCapClient
+from scanner.clients.mexc_client import MEXCClient
+from scanner.clients.offline_market import OfflineMarket
+from scanner.pipeline.snapshot import SnapshotManager
+from scanner.utils.candle_store import CandleArrays
+from scanner.utils.time_utils import INTERVAL_MS
+
+
+def _market(**faults) -> OfflineMarket:
+    candles = {}
+    for tf, n in (("1d", 30), ("4h", 60)):
+        open_time = 1767225600000 + np.arange(n, dtype=np.int64) * INTERVAL_MS[tf]
+        close = np.linspace(10.0, 20.0, n)
+        candles[tf] = {"AAAUSDT": CandleArrays(open_time, open_time + INTERVAL_MS[tf] - 1, close, close * 1.01,
+                                               close * 0.99, close, np.full(n, 100.0), close * 100.0)}
+    listings = [{"id": 1, "symbol": "AAA", "name": "Aaa", "cmc_rank": 1, "quote": {"USD": {"market_cap": 5e8}}}]
+    return OfflineMarket(candles, listings, **faults)
+
+
+def test_offline_market_serves_recorded_data(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)  # clients write caches and raw snapshots below cwd
+    market = _market()
+    mexc = MEXCClient(retry_backoff=0)
+    cmc = MarketCapClient(api_key="offline")
+    assert market.attach(mexc, cmc, "adapter") is None
+
+    assert mexc.get_spot_usdt_symbols(use_cache=False) == ["AAAUSDT"]
+    assert float(mexc.get_24h_tickers(use_cache=False)[0]["lastPrice"]) == 20.0
+
+    klines = mexc.get_klines("AAAUSDT", "1d", limit=5, use_cache=False)
+    assert len(klines) == 5
+    assert float(klines[-1][4]) == 20.0
+    assert cmc.get_listings(use_cache=False)[0]["quote"]["USD"]["market_cap"] == 5e8
+
+
+def test_offline_server_injects_rate_limits(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    market = _market(rate_limit_rate=0.5, seed=1)
+    mexc = MEXCClient(max_retries=20, retry_backoff=0)
+    cmc = MarketCapClient(api_key="offline")
+
+    with market.attach(mexc, cmc, "http"):
+        for _ in range(5):
+            assert len(mexc.get_klines("AAAUSDT", "4h", limit=10, use_cache=False)) == 10
+
+    assert market.stats["fault_429"] > 0
+    assert market.stats["/api/v3/klines"] == 5 + market.stats["fault_429"]
+
+
+def test_offline_run_keeps_live_outputs_and_raw_archive_untouched(tmp_path, monkeypatch) -> None:
+    from scanner.pipeline import run_pipeline
+    from scanner.tools.benchmark import benchmark_config, synthetic_market
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("RAW_SNAPSHOT_BASEDIR", str(tmp_path / "archive"))
+    live_cache = tmp_path / "data" / "cache"
+    live_cache.mkdir(parents=True)
+    (live_cache / "entry.json").write_text("{}")
+    run_pipeline(benchmark_config({}, 20), offline_market=synthetic_market(20, seed=3))
+
+    offline = tmp_path / "reports" / "offline"
+    assert len(list(offline.glob("*.json"))) == 2  # report + profile
+    assert len(list((offline / "snapshots").iterdir())) == 1
+    snapshots = SnapshotManager({"snapshots": {"runtime_dir": str(offline / "snapshots")}})
+    meta = snapshots.load_snapshot(snapshots.list_snapshots()[0])["meta"]
+    # The snapshot points at the complete profile instead of embedding a partial one
+    assert "profile" not in meta
+    assert Path(meta["profile_path"]).exists()
+    assert not list((tmp_path / "reports").glob("*.json"))
+    assert not (tmp_path / "snapshots").exists()
+    assert not (tmp_path / "archive").exists()
+    # Synthetic responses are cached apart from the live cache
+    assert [p.name for p in live_cache.rglob("*")] == ["entry.json"]
+    assert list((offline / "cache").rglob("*.json"))
@@ -0,0 +1,105 @@
+import threading
+import time
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+import scanner.pipeline.ohlcv as ohlcv_module
+from scanner.pipeline.ohlcv import OHLCVFetcher
+from scanner.utils.rate_limiter import TokenBucket
+
+
+class _FakeMEXC:
+    """Stand-in client: fixed latency, records peak concurrency."""
+
+    def __init__(self, latency: float = 0.02, missing: set[str] | None = None):
+        self.latency = latency
+        self.missing = missing or set()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+
+    def get_klines(self, symbol: str, interval: str, limit: int = 120) -> list[list]:
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+            if symbol in self.missing:
+                return []
+            return [[i, "1", "1", "1", "1", "1", i + 1] for i in range(limit)]
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture(autouse=True)
+def _no_raw_snapshot(monkeypatch):
+    monkeypatch.setattr(ohlcv_module, "OHLCVSnapshotWriter", None)
+
+
+def _config(max_workers: int) -> dict:
+    return {
+        "ohlcv": {
+            "timeframes": ["1d", "4h"],
+            "lookback": {"1d": 5, "4h": 5},
+            "min_candles": {"1d": 5, "4h": 5},
+            "max_workers": max_workers,
+        }
+    }
+
+
+def test_concurrent_fetch_matches_sequential_and_keeps_order() -> None:
+    shortlist = [{"symbol": f"S{i}USDT"} for i in range(12)]
+    missing = {"S3USDT", "S7USDT"}
+
+    sequential = OHLCVFetcher(_FakeMEXC(missing=missing), _config(1)).fetch_all(shortlist)
+
+    client = _FakeMEXC(missing=missing)
+    concurrent = OHLCVFetcher(client, _config(6)).fetch_all(shortlist)
+
+    assert concurrent == sequential
+    assert list(concurrent) == [s["symbol"] for s in shortlist if s["symbol"] not in missing]
+    assert client.peak_in_flight > 1
+
+
+def test_token_bucket_paces_weighted_requests() -> None:
+    bucket = TokenBucket(rate=100.0, capacity=10.0)
+
+    # Burst is free, then weight is paid for at `rate` per second
+    assert bucket.reserve(10) == 0.0
+    wait = bucket.reserve(5)
+    assert wait == pytest.approx(0.05, abs=0.01)
+
+
+def test_stream_is_bounded_and_writes_snapshot_incrementally(monkeypatch, tmp_path) -> None:
+    from scanner.utils.raw_collector import OHLCVSnapshotWriter, load_raw_ohlcv
+
+    monkeypatch.setenv("RAW_SNAPSHOT_BASEDIR", str(tmp_path))
+    monkeypatch.setenv("RAW_SNAPSHOT_RUN_ID", "2020-01-01_00-00-00")
+    monkeypatch.setattr(ohlcv_module, "OHLCVSnapshotWriter", lambda: OHLCVSnapshotWriter(chunk_rows=7))
+
+    shortlist = [{"symbol": f"S{i}USDT"} for i in range(20)]
+    client = _FakeMEXC(latency=0.0, missing={"S5USDT"})
+    calls = []
+    get_klines = client.get_klines
+    client.get_klines = lambda symbol, interval, limit=120: calls.append(symbol) or get_klines(symbol, interval, limit)
+    stream = OHLCVFetcher(client, _config(4)).stream(shortlist, queue_size=2)
+
+    first = next(stream)
+    time.sleep(0.05)
+    # Workers block on the full queue instead of fetching ahead:
+    # at most consumed + queued + one in hand per worker
+    assert len(set(calls)) <= 1 + 2 + 4
+    rest = list(stream)
+
+    assert sorted(s for s, _ in [first, *rest]) == sorted(s["symbol"] for s in shortlist if s["symbol"] != "S5USDT")
+    closes = load_raw_ohlcv(str(tmp_path), "1d")
+    assert closes["symbol"].nunique() == 19
+    assert len(closes) == 19 * 5
+
+    # Partitioned dataset, dictionary-encoded symbols, no CSV unless RAW_SNAPSHOT_CSV=1
+    part = tmp_path / "ohlcv" / "date=2020-01-01" / "timeframe=4h" / "2020-01-01_00-00-00.parquet"
+    assert pq.read_schema(part).field("symbol").type == pa.dictionary(pa.int32(), pa.string())
+    assert not list(tmp_path.rglob("*.csv*"))
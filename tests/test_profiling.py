@@ -0,0 +1,39 @@
+import json
+import threading
+
+from scanner.utils import profiling
+from scanner.utils.profiling import RunProfiler
+
+
+def test_counters_go_to_the_running_stage() -> None:
+    profiling.count("api_calls")  # no active profiler: ignored
+    profiler = RunProfiler().activate()
+
+    with profiler.stage("ohlcv"):
+        workers = [threading.Thread(target=profiling.count, args=("api_calls",)) for _ in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    with profiler.stage("reports"):
+        profiling.count("bytes_downloaded", 10)
+    profiler.deactivate()
+    profiling.count("api_calls")
+
+    profile = profiler.to_dict()
+    assert profile["stages"]["ohlcv"]["api_calls"] == 3
+    assert profile["stages"]["reports"]["bytes_downloaded"] == 10
+    assert profile["total"]["api_calls"] == 3
+    assert profile["stages"]["ohlcv"]["wall_s"] >= 0
+
+
+def test_save_writes_the_profile_atomically(tmp_path) -> None:
+    profiler = RunProfiler()
+    with profiler.stage("scoring"):
+        pass
+
+    path = profiler.save(tmp_path / "reports" / "2026-01-01.profile.json")
+
+    assert json.loads(path.read_text())["stages"]["scoring"]["wall_s"] >= 0
+    assert [p.name for p in path.parent.iterdir()] == ["2026-01-01.profile.json"]
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+from scanner.pipeline.features import FeatureEngine
+from scanner.pipeline.replay import ReplayRunner
+from scanner.utils.raw_collector import load_candle_history
+from scanner.pipeline.snapshot import SnapshotManager
+from scanner.utils.time_utils import INTERVAL_MS
+
+
+def _write_raw_ohlcv(raw_dir, start_ms: int, days: int, symbols=("AAAUSDT", "BBBUSDT"), volume_scale=None,
+                     history_days=None) -> None:
+    rng = np.random.default_rng(5)
+    rows = []
+    for symbol in symbols:
+        scale = (volume_scale or {}).get(symbol, 1.0)
+        symbol_days = (history_days or {}).get(symbol, days)
+        for tf, per_day in (("1d", 1), ("4h", 6)):
+            closes = 10 * np.exp(np.cumsum(rng.normal(0, 0.03, symbol_days * per_day)))
+            for i, close in enumerate(closes):
+                rows.append((symbol, tf, start_ms + i * INTERVAL_MS[tf], str(close * 0.99), str(close * 1.02),
+                             str(close * 0.97), str(close), str(rng.uniform(1e5, 1e6) * scale)))
+    df = pd.DataFrame(rows, columns=["symbol", "timeframe", "open_time", "open", "high", "low", "close", "volume"])
+    run_dir = raw_dir / "2026-04-01_00-00-00"
+    run_dir.mkdir(parents=True)
+    df.to_parquet(run_dir / "ohlcv_snapshot.parquet", index=False)
+
+
+def test_replay_matches_point_in_time_features(tmp_path) -> None:
+    _write_raw_ohlcv(tmp_path / "raw", 1767225600000, 75)  # 2026-01-01
+    config = {
+        "replay": {"raw_dir": str(tmp_path / "raw"), "snapshots_dir": str(tmp_path / "replay"),
+                   "start": "2026-03-05", "end": "2026-03-08"},
+        "universe_filters": {"history": {"min_history_days_1d": 60}},
+    }
+
+    paths = ReplayRunner(config).run()
+    assert [p.name for p in paths] == ["2026-03-05", "2026-03-06", "2026-03-07", "2026-03-08"]
+
+    history = {tf: load_candle_history(str(tmp_path / "raw"), tf) for tf in ("1d", "4h")}
+    snapshot = SnapshotManager({"snapshots": {"runtime_dir": str(tmp_path / "replay")}}).load_snapshot("2026-03-07")
+    asof = snapshot["meta"]["asof_ts_ms"]
+    assert snapshot["meta"]["mode"] == "backtest"
+
+    for symbol, features in snapshot["data"]["features"].items():
+        expected = FeatureEngine({}).compute_symbol(symbol, {tf: history[tf][symbol] for tf in history}, asof)
+        assert repr(features["1d"]) == repr(expected["1d"])
+        assert repr(features["4h"]) == repr(expected["4h"])
+        assert features["meta"]["last_update"] == expected["meta"]["last_update"]
+    assert len(snapshot["scoring"]["breakouts"]) == 2
+
+
+def test_replay_applies_liquidity_and_exclusion_filters(tmp_path) -> None:
+    # WBTC is excluded by pattern, CCC trades far below min_volume_24h
+    _write_raw_ohlcv(tmp_path / "raw", 1767225600000, 75, symbols=("AAAUSDT", "WBTCUSDT", "CCCUSDT"),
+                     volume_scale={"AAAUSDT": 10.0, "WBTCUSDT": 10.0, "CCCUSDT": 1e-4})
+    config = {
+        "replay": {"raw_dir": str(tmp_path / "raw"), "snapshots_dir": str(tmp_path / "replay"),
+                   "start": "2026-03-05", "end": "2026-03-05"},
+        "universe_filters": {"history": {"min_history_days_1d": 60}},
+    }
+
+    ReplayRunner(config).run()
+    snapshot = SnapshotManager({"snapshots": {"runtime_dir": str(tmp_path / "replay")}}).load_snapshot("2026-03-05")
+
+    assert [row["symbol"] for row in snapshot["data"]["filtered"]] == ["AAAUSDT"]
+    assert [row["symbol"] for row in snapshot["data"]["shortlist"]] == ["AAAUSDT"]
+    assert list(snapshot["data"]["features"]) == ["AAAUSDT"]
+
+
+def test_replay_drops_symbols_whose_history_ends(tmp_path) -> None:
+    # BBB's last daily candle is 2026-03-07 (delisted / no longer recorded)
+    _write_raw_ohlcv(tmp_path / "raw", 1767225600000, 75, history_days={"BBBUSDT": 66})
+    config = {
+        "replay": {"raw_dir": str(tmp_path / "raw"), "snapshots_dir": str(tmp_path / "replay"),
+                   "start": "2026-03-07", "end": "2026-03-10"},
+        "universe_filters": {"history": {"min_history_days_1d": 60}},
+    }
+
+    ReplayRunner(config).run()
+    manager = SnapshotManager({"snapshots": {"runtime_dir": str(tmp_path / "replay")}})
+
+    universes = {day: [row["symbol"] for row in manager.load_snapshot(day)["data"]["universe"]]
+                 for day in ("2026-03-07", "2026-03-08", "2026-03-09", "2026-03-10")}
+    assert universes == {
+        "2026-03-07": ["AAAUSDT", "BBBUSDT"],
+        "2026-03-08": ["AAAUSDT", "BBBUSDT"],
+        "2026-03-09": ["AAAUSDT"],
+        "2026-03-10": ["AAAUSDT"],
+    }
+    assert list(manager.load_snapshot("2026-03-09")["data"]["features"]) == ["AAAUSDT"]
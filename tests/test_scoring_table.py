@@ -0,0 +1,108 @@
+import math
+
+import numpy as np
+
+from scanner.pipeline.scoring.breakout import BreakoutScorer, score_breakouts
+from scanner.pipeline.scoring.pullback import PullbackScorer, score_pullbacks
+from scanner.pipeline.scoring.reversal import ReversalScorer, attach_reversal_reasons, score_reversals
+
+FEATURES = {
+    "r_3": (-15, 15), "r_7": (-25, 30), "dist_ema20_pct": (-10, 10), "dist_ema50_pct": (-20, 25),
+    "atr_pct": (0, 15), "volume_spike": (0, 4), "breakout_dist_20": (-8, 8),
+    "drawdown_from_ath": (-95, 0),
+}
+
+
+def _random_features(rng: np.random.Generator, n: int) -> tuple[dict, dict]:
+    """Feature dicts with a sprinkling of None, NaN, zeros and missing keys."""
+    features_data, volumes = {}, {}
+    for i in range(n):
+        symbol = f"S{i}USDT"
+        features = {"price_usdt": 1.0, "coin_name": symbol[:-4], "market_cap": None, "quote_volume_24h": None}
+        for tf in ("1d", "4h"):
+            tf_features = {}
+            for key, (lo, hi) in FEATURES.items():
+                roll = rng.random()
+                if roll < 0.04:
+                    continue
+                elif roll < 0.08:
+                    tf_features[key] = None
+                elif roll < 0.10:
+                    tf_features[key] = float("nan")
+                elif roll < 0.12:
+                    tf_features[key] = 0.0
+                else:
+                    tf_features[key] = float(rng.uniform(lo, hi))
+            tf_features["hh_20"] = bool(rng.random() < 0.5)
+            if tf == "1d" and rng.random() < 0.3:
+                tf_features["base_detected"] = bool(rng.random() < 0.7)
+            features[tf] = tf_features
+        if rng.random() < 0.05:
+            features.pop("4h")
+        features_data[symbol] = features
+        volumes[symbol] = float(rng.uniform(0, 2_000_000))
+    return features_data, volumes
+
+
+def _scalar_reference(scorer, features_data, volumes) -> list[dict]:
+    """Pre-vectorization score_* loop."""
+    results = []
+    for symbol, features in features_data.items():
+        try:
+            r = scorer.score(symbol, features, volumes.get(symbol, 0))
+        except Exception:
+            continue
+        results.append({
+            'symbol': symbol,
+            'price_usdt': features.get('price_usdt'),
+            'coin_name': features.get('coin_name'),
+            'market_cap': features.get('market_cap'),
+            'quote_volume_24h': features.get('quote_volume_24h'),
+            **r
+        })
+    results.sort(key=lambda x: (math.inf if math.isnan(x['score']) else -x['score'], x['symbol']))
+    return results
+
+
+def test_vectorized_scoring_matches_scalar_scorers() -> None:
+    features_data, volumes = _random_features(np.random.default_rng(3), 400)
+    config = {}
+
+    for scorer_cls, score_fn in (
+        (BreakoutScorer, score_breakouts),
+        (PullbackScorer, score_pullbacks),
+        (ReversalScorer, score_reversals),
+    ):
+        expected = _scalar_reference(scorer_cls(config), features_data, volumes)
+        actual = score_fn(features_data, volumes, config)
+
+        assert 0 < len(actual) < len(features_data)
+        # repr: exact float equality, NaN-safe, and catches int/float drift
+        assert repr(actual) == repr(expected)
+
+
+def test_lazy_reasons_match_eager_reasons_for_published_rows() -> None:
+    features_data, volumes = _random_features(np.random.default_rng(5), 200)
+    config = {}
+
+    eager = score_reversals(features_data, volumes, config)
+    lazy = score_reversals(features_data, volumes, config, with_reasons=False)
+    assert all('reasons' not in r for r in lazy)
+
+    attach_reversal_reasons(lazy, features_data, config, limit=10)
+
+    assert repr(lazy[:10]) == repr(eager[:10])
+    assert all('reasons' not in r for r in lazy[10:])
+    assert repr([{k: v for k, v in r.items() if k != 'reasons'} for r in eager[10:]]) == repr(lazy[10:])
+
+
+def test_top_n_selection_equals_head_of_full_ranking() -> None:
+    features_data, volumes = _random_features(np.random.default_rng(9), 300)
+    # Duplicate feature rows -> exact score ties, broken by symbol
+    for i in range(0, 60, 2):
+        features_data[f"T{i}USDT"] = features_data[f"S{i}USDT"]
+        volumes[f"T{i}USDT"] = volumes[f"S{i}USDT"]
+
+    full = score_breakouts(features_data, volumes, {})
+    for k in (0, 1, 10, 57):
+        assert repr(score_breakouts(features_data, volumes, {}, top_n=k)) == repr(full[:k])
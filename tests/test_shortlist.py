@@ -0,0 +1,15 @@
+from scanner.pipeline.shortlist import ShortlistSelector
+
+
+def test_shortlist_takes_top_volume_with_symbol_tie_break() -> None:
+    filtered = [
+        {"symbol": "CUSDT", "quote_volume_24h": 5.0},
+        {"symbol": "AUSDT", "quote_volume_24h": 1.0},
+        {"symbol": "DUSDT", "quote_volume_24h": 5.0},
+        {"symbol": "BUSDT", "quote_volume_24h": 9.0},
+        {"symbol": "EUSDT", "quote_volume_24h": 5.0},
+    ]
+    selector = ShortlistSelector({"shortlist": {"max_size": 3}})
+
+    assert [s["symbol"] for s in selector.select(filtered)] == ["BUSDT", "CUSDT", "DUSDT"]
+    assert [s["symbol"] for s in selector.select(filtered[::-1])] == ["BUSDT", "CUSDT", "DUSDT"]
@@ -0,0 +1,78 @@
+from scanner.pipeline.snapshot import SnapshotManager
+
+
+def _snapshot_args() -> dict:
+    features = {
+        "AAAUSDT": {
+            "1d": {"close": 1.5, "r_7": 4.2, "hh_20": True, "base_score": 71.0},
+            "4h": {"close": 1.5, "r_7": -0.3, "hh_20": False, "base_score": None},
+            "meta": {"symbol": "AAAUSDT", "last_update": 1769385600000},
+            "price_usdt": 1.5, "coin_name": "Triple A", "market_cap": 5e8, "quote_volume_24h": 2e6,
+        },
+        "BBBUSDT": {
+            "1d": {"close": 0.2, "r_7": 12.0, "hh_20": False, "base_score": 12.5},
+            "4h": {},
+            "meta": {"symbol": "BBBUSDT", "last_update": 1769385600000},
+            "price_usdt": None, "coin_name": "Unknown", "market_cap": None, "quote_volume_24h": None,
+        },
+    }
+    scores = [
+        {"symbol": "BBBUSDT", "score": 61.3, "components": {"breakout": 70.0, "volume": 55.1},
+         "penalties": {"low_liquidity": 0.8}, "flags": ["low_liquidity"], "reasons": ["Strong breakout"]},
+        {"symbol": "AAAUSDT", "score": 20.0, "components": {"breakout": 0.0, "volume": 40.0},
+         "penalties": {}, "flags": []},
+    ]
+    universe = [{"symbol": "AAAUSDT", "mapped": True}, {"symbol": "BBBUSDT", "mapped": False}]
+    return dict(
+        universe=universe, filtered=universe[:1], shortlist=universe[:1], features=features,
+        reversal_scores=[], breakout_scores=scores, pullback_scores=scores[:1],
+        metadata={"mode": "standard", "asof_ts_ms": 1769450000000},
+    )
+
+
+def test_parquet_snapshot_round_trips_and_loads_columns(tmp_path) -> None:
+    args = _snapshot_args()
+    json_mgr = SnapshotManager({"snapshots": {"runtime_dir": str(tmp_path / "json")}})
+    parquet_mgr = SnapshotManager({"snapshots": {"runtime_dir": str(tmp_path / "pq"), "format": "parquet"}})
+
+    json_mgr.create_snapshot("2026-01-02", **args)
+    parquet_mgr.create_snapshot("2026-01-02", **args)
+    parquet_mgr.create_snapshot("2026-01-03", **args)
+
+    expected = json_mgr.load_snapshot("2026-01-02")
+    actual = parquet_mgr.load_snapshot("2026-01-02")
+    assert actual["data"] == expected["data"]
+    assert actual["scoring"] == expected["scoring"]
+
+    assert parquet_mgr.list_snapshots() == ["2026-01-02", "2026-01-03"]
+    stats = parquet_mgr.get_snapshot_stats("2026-01-02")
+    assert stats["breakout_count"] == 2 and stats["reversal_count"] == 0
+    assert {k: v for k, v in stats.items() if k != "created_at"} == \
+        {k: v for k, v in json_mgr.get_snapshot_stats("2026-01-02").items() if k != "created_at"}
+
+    scores = parquet_mgr.load_sections("breakouts", columns=["symbol", "score", "components__volume"])
+    assert list(scores.columns) == ["date", "symbol", "score", "components__volume"]
+    assert scores["date"].tolist() == ["2026-01-02", "2026-01-02", "2026-01-03", "2026-01-03"]
+    assert scores["components__volume"].tolist() == [55.1, 40.0, 55.1, 40.0]
+
+    closes = parquet_mgr.load_section("2026-01-02", "features", ["symbol", "1d__close"])
+    assert closes.to_dict("records") == json_mgr.load_section("2026-01-02", "features", ["symbol", "1d__close"]).to_dict("records")
+
+
+def test_irregular_nested_rows_stay_columnar(tmp_path) -> None:
+    args = _snapshot_args()
+    features = args["features"]
+    features["CCCUSDT"] = {"1d": {"close": 3.0}, "meta": {"symbol": "CCCUSDT", "last_update": 1769385600000}}
+    del features["BBBUSDT"]["1d"]  # one symbol without '1d'
+    json_mgr = SnapshotManager({"snapshots": {"runtime_dir": str(tmp_path / "json")}})
+    parquet_mgr = SnapshotManager({"snapshots": {"runtime_dir": str(tmp_path / "pq"), "format": "parquet"}})
+    json_mgr.create_snapshot("2026-01-02", **args)
+    parquet_mgr.create_snapshot("2026-01-02", **args)
+
+    assert parquet_mgr.load_snapshot("2026-01-02")["data"] == json_mgr.load_snapshot("2026-01-02")["data"]
+
+    for mgr in (json_mgr, parquet_mgr):
+        closes = mgr.load_section("2026-01-02", "features", ["symbol", "1d__close", "1d__r_7"])
+        assert closes["symbol"].tolist() == ["AAAUSDT", "BBBUSDT", "CCCUSDT"]
+        assert closes["1d__close"].tolist()[::2] == [1.5, 3.0] and closes["1d__close"].isna().tolist()[1]
+        assert closes["1d__r_7"].isna().tolist() == [False, True, True]
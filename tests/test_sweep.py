@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from scanner.pipeline.scoring.breakout import BreakoutScorer, score_breakouts
+from scanner.pipeline.snapshot import SnapshotManager
+from scanner.pipeline.sweep import ParameterSweep
+from tests.test_scoring_table import _random_features
+
+
+def test_sweep_picks_match_pipeline_ranking(tmp_path) -> None:
+    config = {
+        "snapshots": {"runtime_dir": str(tmp_path / "runtime"), "format": "parquet"},
+        "backtest": {"raw_dir": str(tmp_path / "raw")},
+        "sweep": {"top_n": 5},
+    }
+    rng = np.random.default_rng(11)
+    snapshots = SnapshotManager(config)
+    expected = []
+    for run_date in ("2026-01-05", "2026-01-06"):
+        features, volumes = _random_features(rng, 40)
+        shortlist = [{"symbol": s, "quote_volume_24h": v} for s, v in volumes.items()]
+        snapshots.create_snapshot(
+            run_date, universe=[], filtered=[], shortlist=shortlist, features=features,
+            reversal_scores=[], breakout_scores=[], pullback_scores=[],
+        )
+        expected += [r["symbol"] for r in score_breakouts(features, volumes, config, with_reasons=False, top_n=5)]
+
+    sweep = ParameterSweep(config)
+    results = sweep.run({"breakout.component_weights.volume": [0.3, 0.5]})
+
+    scored = BreakoutScorer(config).score_table(sweep.table)
+    assert [sweep.table.symbols[i] for i in sweep.picks(scored.score, scored.valid)] == expected
+    assert results["setup"].tolist() == ["breakout", "breakout"]
+    assert results["signals"].tolist() == [10, 10]
+
+
+def test_component_weight_overrides() -> None:
+    scorer = BreakoutScorer({"scoring": {"breakout": {"component_weights": {"volume": 0.5}}}})
+    assert scorer.weights == {"breakout": 0.35, "volume": 0.5, "trend": 0.20, "momentum": 0.15}
+    with pytest.raises(ValueError):
+        BreakoutScorer({"scoring": {"breakout": {"component_weights": {"volumes": 0.5}}}})
@@ -0,0 +1,41 @@
+from scanner.clients.mapping import MappingResult
+from scanner.pipeline.universe import build_universe_table, enrich_features
+
+
+def _mapping(symbol: str, name: str | None, market_cap: float | None = None) -> MappingResult:
+    cmc_data = None if name is None else {"name": name, "quote": {"USD": {"market_cap": market_cap}}}
+    return MappingResult(symbol, cmc_data=cmc_data)
+
+
+def test_universe_table_joins_tickers_mapping_and_shortlist() -> None:
+    universe = ["AAAUSDT", "BBBUSDT", "CCCUSDT"]
+    tickers = [
+        {"symbol": "AAAUSDT", "lastPrice": "1.5", "quoteVolume": "2000000"},
+        {"symbol": "CCCUSDT", "lastPrice": "0.1", "quoteVolume": "900"},
+    ]
+    mapping_results = {
+        "AAAUSDT": _mapping("AAAUSDT", "Triple A", 5e8),
+        "BBBUSDT": _mapping("BBBUSDT", "Bee", 2e8),
+        "CCCUSDT": _mapping("CCCUSDT", None),
+    }
+
+    table = build_universe_table(universe, tickers, mapping_results)
+
+    assert table.filter_input() == [
+        {"symbol": "AAAUSDT", "base": "AAA", "quote_volume_24h": 2_000_000.0, "market_cap": 5e8},
+        {"symbol": "BBBUSDT", "base": "BBB", "quote_volume_24h": 0.0, "market_cap": 2e8},
+    ]
+
+    table.set_shortlist(table.filter_input()[:1])
+    assert table.volume_map() == {"AAAUSDT": 2_000_000.0}
+
+    features = enrich_features({"AAAUSDT": {"1d": {}}, "BBBUSDT": {"1d": {}}}, table)
+    assert features["AAAUSDT"] == {
+        "1d": {}, "price_usdt": 1.5, "coin_name": "Triple A",
+        "market_cap": 5e8, "quote_volume_24h": 2_000_000.0,
+    }
+    # Not shortlisted / no ticker
+    assert features["BBBUSDT"] == {
+        "1d": {}, "price_usdt": None, "coin_name": "Bee",
+        "market_cap": None, "quote_volume_24h": None,
+    }